@@ -0,0 +1,67 @@
+"""
+Benchmark filtered vs unfiltered numpy index search.
+
+Assigns a synthetic genre to a given share of the catalog, then times
+top-k search with that genre filter using prefiltering (score allowed rows
+only), postfiltering (full scan, disallowed rows excluded) and the
+automatic choice, next to the unfiltered baseline.
+
+Usage:
+    python -m benchmarks.bench_filtered_search --movies 100000 --shares 0.01 0.1 0.25 0.5 0.9
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ml.embeddings import filters as search_filters
+from ml.embeddings.filters import SearchFilters
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+
+
+def time_queries(store: NumpyEmbeddingStore, queries: np.ndarray, k: int, filters) -> float:
+    store.top_k(queries[0], k, filters)  # warm-up
+    started = time.perf_counter()
+    for query in queries:
+        store.top_k(query, k, filters)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--shares", type=float, nargs="+", default=[0.01, 0.1, 0.25, 0.5, 0.9])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.movies, args.dim)).astype(np.float32)
+    draws = rng.random(args.movies)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+
+    threshold = search_filters.PREFILTER_MAX_SELECTIVITY
+    print(f"{args.movies} movies x {args.dim} dims, prefilter below {threshold:.0%} selectivity")
+    print(f"{'share':>6} {'unfiltered':>11} {'prefilter':>10} {'postfilter':>11} {'auto':>8}  (ms/query)")
+    for share in args.shares:
+        store = NumpyEmbeddingStore()
+        store.upsert_movies(
+            [str(i) for i in range(args.movies)], vectors, [""] * args.movies,
+            [{"genres": "Horror" if d < share else "Comedy", "year": "2000"} for d in draws],
+        )
+        horror = SearchFilters(genres=["horror"])
+        unfiltered = time_queries(store, queries, args.top_k, None)
+        try:
+            search_filters.PREFILTER_MAX_SELECTIVITY = 1.0
+            prefilter = time_queries(store, queries, args.top_k, horror)
+            search_filters.PREFILTER_MAX_SELECTIVITY = -1.0
+            postfilter = time_queries(store, queries, args.top_k, horror)
+        finally:
+            search_filters.PREFILTER_MAX_SELECTIVITY = threshold
+        auto = time_queries(store, queries, args.top_k, horror)
+        print(f"{share:>6.2f} {unfiltered:>11.2f} {prefilter:>10.2f} {postfilter:>11.2f} {auto:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
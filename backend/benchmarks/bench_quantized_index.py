@@ -0,0 +1,91 @@
+"""
+Benchmark compressed (int8 / PCA + int8) catalog vectors against float32.
+
+Generates unit-norm embeddings with a decaying spectrum (sentence
+embeddings concentrate their variance in a few hundred directions), then
+for each configuration reports the bytes scanned per query, single-query
+and batched latency, and recall@k against exact float32 search.
+
+Usage:
+    python -m benchmarks.bench_quantized_index --sizes 10000 100000 --pca 128
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+
+
+def spectral_embeddings(n: int, dim: int, seed: int) -> np.ndarray:
+    """Random embeddings whose i-th principal direction has variance ~ 1 / (i + 1)."""
+    rng = np.random.default_rng(seed)
+    basis, _ = np.linalg.qr(rng.normal(size=(dim, dim)))
+    latent = rng.normal(size=(n, dim)) / np.sqrt(np.arange(1, dim + 1))
+    vectors = latent @ basis.T + rng.normal(size=dim) * 0.2
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build_store(vectors: np.ndarray) -> NumpyEmbeddingStore:
+    store = NumpyEmbeddingStore()
+    store.upsert_movies(
+        [str(i) for i in range(len(vectors))], vectors, [""] * len(vectors), [{}] * len(vectors)
+    )
+    return store
+
+
+def measure(store: NumpyEmbeddingStore, queries: np.ndarray, k: int, batch: int) -> tuple[float, float, np.ndarray]:
+    store.top_k(queries[:1], k)  # warm-up
+    started = time.perf_counter()
+    top = np.concatenate([store.top_k(q, k)[0] for q in queries])
+    single_ms = (time.perf_counter() - started) / len(queries) * 1000
+    started = time.perf_counter()
+    for start in range(0, len(queries), batch):
+        store.top_k(queries[start:start + batch], k)
+    batch_ms = (time.perf_counter() - started) / len(queries) * 1000
+    return single_ms, batch_ms, top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--pca", type=int, default=128, help="PCA dimensions for the PCA configs")
+    parser.add_argument("--rerank", type=int, default=4, help="Re-rank factor for the re-rank configs")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    configs = [
+        ("float32", None, 0),
+        ("int8", 0, 0),
+        ("int8+rerank", 0, args.rerank),
+        (f"pca{args.pca}+int8", args.pca, 0),
+        (f"pca{args.pca}+int8+rerank", args.pca, args.rerank),
+    ]
+    for n in args.sizes:
+        vectors = spectral_embeddings(n, args.dim, seed=0)
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.integers(n, size=args.queries)] + rng.normal(
+            scale=0.05, size=(args.queries, args.dim)
+        ).astype(np.float32)
+
+        print(f"\n{n} movies x {args.dim} dims")
+        print(f"  {'config':<22} {'scan MB':>8} {'ms/query':>9} {'batched ms/q':>13} {'recall@k':>9}")
+        exact = None
+        for name, pca_dim, rerank in configs:
+            store = build_store(vectors)
+            if pca_dim is not None:
+                store.compress(pca_dim)
+            store.rerank_factor = rerank
+            scanned = store.codes if store.codes is not None else store.vectors
+            single_ms, batch_ms, top = measure(store, queries, args.top_k, args.batch)
+            if exact is None:
+                exact = top
+            recall = np.mean([len(set(a) & set(b)) / args.top_k for a, b in zip(top, exact)])
+            print(f"  {name:<22} {scanned.nbytes / 1e6:>8.1f} {single_ms:>9.2f} {batch_ms:>13.3f} {recall:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark the PyTorch and int8 ONNX query encoders.
+
+Each backend runs in a fresh subprocess so import time and peak RSS are
+measured in isolation. Reports import seconds, model load seconds, median
+single-query latency and peak RSS. Backends whose packages or exported
+model are missing are reported as unavailable.
+
+Usage:
+    python -m ml.export_onnx_encoder  # once, to produce the ONNX model
+    python -m benchmarks.bench_query_encoder --queries 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+PROBE = r"""
+import json, resource, statistics, sys, time
+started = time.perf_counter()
+if sys.argv[1] == "onnx":
+    from services.onnx_encoder import OnnxQueryEncoder
+    imported = time.perf_counter()
+    model = OnnxQueryEncoder.load()
+else:
+    from sentence_transformers import SentenceTransformer
+    imported = time.perf_counter()
+    model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+loaded = time.perf_counter()
+latencies = []
+for i in range(int(sys.argv[2])):
+    query = f"dark psychological thriller number {i}"
+    t = time.perf_counter()
+    model.encode(query, convert_to_numpy=True)
+    latencies.append((time.perf_counter() - t) * 1000)
+print(json.dumps({
+    "import_s": imported - started,
+    "load_s": loaded - imported,
+    "p50_ms": statistics.median(latencies),
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def run_backend(backend: str, queries: int) -> dict | None:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, backend, str(queries)], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"  {backend}: unavailable ({result.stderr.strip().splitlines()[-1]})")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'import s':>9} {'load s':>7} {'p50 ms':>7} {'peak RSS MB':>12}")
+    for backend in ("pytorch", "onnx"):
+        stats = run_backend(backend, args.queries)
+        if stats is not None:
+            print(f"{backend:>8} {stats['import_s']:>9.2f} {stats['load_s']:>7.2f} "
+                  f"{stats['p50_ms']:>7.2f} {stats['rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark single-process vs catalog-sharded hybrid scoring.
+
+Builds a synthetic catalog shaped like the TF-IDF model (sparse,
+L2-normalized rows) with random SVD item factors, then times top-k
+scoring for one user at several shard counts. Speedup is bounded by the
+number of cores; on small catalogs the per-request IPC costs more than
+it saves.
+
+Usage:
+    python -m benchmarks.bench_sharded_scoring --movies 200000 --shards 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from services.sharded_scoring import ShardedScorer
+
+
+def synthetic_catalog(n_movies: int, n_features: int, nnz_per_row: int, factors: int, seed: int):
+    """Random sparse TF-IDF-like matrix plus SVD item factors/biases."""
+    rng = np.random.default_rng(seed)
+    tfidf = sp.random(
+        n_movies, n_features, density=nnz_per_row / n_features,
+        format="csr", dtype=np.float32, random_state=seed,
+    )
+    tfidf = normalize(tfidf, norm="l2")
+    item_factors = rng.normal(0, 0.1, (n_movies, factors)).astype(np.float32)
+    item_bias = rng.normal(0, 0.3, n_movies).astype(np.float32)
+    known = rng.random(n_movies) < 0.5
+    item_factors[~known] = 0
+    item_bias[~known] = 0
+    return tfidf, item_factors, item_bias, known
+
+
+def single_process_top_k(tfidf, item_factors, item_bias, profile, cf, alpha, exclude, k):
+    """Reference: score the whole catalog in this process."""
+    content = tfidf @ (profile / np.linalg.norm(profile))
+    estimates = cf["global_mean"] + cf["user_bias"] + item_bias + item_factors @ cf["user_factors"]
+    estimates = np.clip(estimates, cf["low"], cf["high"])
+    keep = np.ones(len(content), dtype=bool)
+    keep[exclude] = False
+    low, high = estimates[keep].min(), estimates[keep].max()
+    scores = (1 - alpha) * content + alpha * (estimates - low) / (high - low)
+    scores[exclude] = -np.inf
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def time_it(fn, repeats: int) -> float:
+    fn()  # warm-up (worker attach, page faults)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--movies", type=int, default=200_000)
+    parser.add_argument("--features", type=int, default=5000)
+    parser.add_argument("--nnz", type=int, default=40, help="Non-zero TF-IDF terms per movie")
+    parser.add_argument("--factors", type=int, default=100)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    tfidf, item_factors, item_bias, known = synthetic_catalog(
+        args.movies, args.features, args.nnz, args.factors, seed=0
+    )
+    rng = np.random.default_rng(1)
+    rated = rng.choice(args.movies, 50, replace=False)
+    profile = np.asarray(tfidf[rated].mean(axis=0)).ravel()
+    cf = {
+        "global_mean": 3.5,
+        "user_bias": 0.1,
+        "user_factors": rng.normal(0, 0.1, args.factors).astype(np.float32),
+        "biased": True,
+        "low": 0.5,
+        "high": 5.0,
+    }
+    alpha = 0.7
+
+    print(f"Catalog: {args.movies} movies x {args.features} features "
+          f"({tfidf.nnz} nnz), {os.cpu_count()} CPUs")
+    baseline = time_it(
+        lambda: single_process_top_k(
+            tfidf, item_factors, item_bias, profile, cf, alpha, rated, args.top_k
+        ),
+        args.repeats,
+    )
+    print(f"  single process: {baseline:8.2f} ms")
+
+    for n_shards in args.shards:
+        scorer = ShardedScorer(n_shards)
+        scorer.build(tfidf, item_factors, item_bias, known)
+        try:
+            elapsed = time_it(
+                lambda: scorer.top_k(profile, args.top_k, rated, cf=cf, alpha=alpha), args.repeats
+            )
+        finally:
+            scorer.close()
+        print(f"  {n_shards} shard(s):     {elapsed:8.2f} ms  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark the numpy embedding index against ChromaDB's HNSW index.
+
+Builds synthetic unit-norm embeddings (384-d, like all-MiniLM-L6-v2)
+with some cluster structure, loads them into both backends, then reports
+per-query latency, batched-query latency for the numpy index, and
+recall@k of ChromaDB against exact search. The numpy index is exact, so
+its recall is 1.0 by construction.
+
+Usage:
+    python -m benchmarks.bench_vector_index --sizes 1000 10000 100000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+from ml.embeddings.store import EmbeddingStore
+
+CHROMA_BATCH = 5000
+
+
+def synthetic_embeddings(n: int, dim: int, seed: int) -> np.ndarray:
+    """Clustered random embeddings, L2-normalized."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(n // 100, 1), dim))
+    vectors = centers[rng.integers(len(centers), size=n)] + rng.normal(scale=0.8, size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def fill(store, vectors: np.ndarray) -> None:
+    for start in range(0, len(vectors), CHROMA_BATCH):
+        end = min(start + CHROMA_BATCH, len(vectors))
+        store.upsert_movies(
+            ids=[str(i) for i in range(start, end)],
+            embeddings=vectors[start:end].tolist(),
+            documents=[""] * (end - start),
+            metadatas=[{"title": str(i), "genres": "", "year": ""} for i in range(start, end)],
+        )
+
+
+def time_queries(query_fn, queries: np.ndarray) -> tuple[float, list]:
+    query_fn(queries[0])  # warm-up
+    started = time.perf_counter()
+    results = [query_fn(q) for q in queries]
+    return (time.perf_counter() - started) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'movies':>8} {'chroma ms':>10} {'numpy ms':>9} {'numpy batch ms/q':>17} {'chroma recall':>14}")
+    for n in args.sizes:
+        vectors = synthetic_embeddings(n, args.dim, seed=0)
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.integers(n, size=args.queries)] + rng.normal(
+            scale=0.05, size=(args.queries, args.dim)
+        ).astype(np.float32)
+
+        numpy_store = NumpyEmbeddingStore()
+        numpy_store.upsert_movies(
+            ids=[str(i) for i in range(n)], embeddings=vectors, documents=[""] * n,
+            metadatas=[{"title": str(i)} for i in range(n)],
+        )
+        numpy_ms, numpy_results = time_queries(
+            lambda q: numpy_store.query_similar(q, args.top_k), queries
+        )
+        started = time.perf_counter()
+        numpy_store.query_similar_batch(queries, args.top_k)
+        batch_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+        with tempfile.TemporaryDirectory() as tmp:
+            chroma_store = EmbeddingStore(persist_dir=tmp)
+            fill(chroma_store, vectors)
+            chroma_ms, chroma_results = time_queries(
+                lambda q: chroma_store.query_similar(q.tolist(), args.top_k), queries
+            )
+
+        recall = np.mean([
+            len({r["id"] for r in exact} & {r["id"] for r in approx}) / args.top_k
+            for exact, approx in zip(numpy_results, chroma_results)
+        ])
+        print(f"{n:>8} {chroma_ms:>10.2f} {numpy_ms:>9.2f} {batch_ms:>17.3f} {recall:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
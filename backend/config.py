@@ -15,7 +15,116 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:3000"
     supabase_url: str = ""
     supabase_service_role_key: str = ""
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
+    supabase_max_connections: int = 20
+    supabase_page_size: int = 1000
+    supabase_timeout_seconds: float = 10.0
     anthropic_api_key: str = ""
 
+    # TMDB response cache and shared outbound rate budget
+    tmdb_cache_max_entries: int = 4096
+    tmdb_list_cache_ttl_seconds: int = 600
+    tmdb_detail_cache_ttl_seconds: int = 86400
+    tmdb_rate_limit_per_second: float = 10.0
+    tmdb_rate_limit_burst: int = 40
+
+    # Optional shared cache tier (Redis protocol); empty = per-worker caches only
+    redis_url: str = ""
+    redis_key_prefix: str = "netflix"
+
+    # Pre-serialized browse endpoint responses
+    response_cache_max_entries: int = 2048
+
+    # Executors for CPU-bound scoring/encoding (0 process workers = threads only)
+    cpu_thread_workers: int = 4
+    cpu_process_workers: int = 0
+    executor_max_queue: int = 32
+    # Separate small pool for the content-only degradation step, so it never
+    # queues behind the hybrid jobs whose timeouts triggered it
+    cpu_fallback_workers: int = 1
+
+    # Vector index behind semantic search: "chroma" or "numpy" (falls back to
+    # chroma when ml/embeddings/numpy_index has not been built)
+    embedding_backend: str = "numpy"
+    # Numpy index compression, applied when the index is exported:
+    # "int8" scans per-dimension int8 codes (optionally PCA-reduced to
+    # embedding_pca_dim), then re-scores rerank_factor * top_n candidates exactly
+    embedding_quantization: str = "none"
+    embedding_pca_dim: int = 0
+    embedding_rerank_factor: int = 4
+
+    # Semantic search caches: query embeddings (LRU by bytes) and ranked results
+    search_embedding_cache_max_bytes: int = 8 * 1024 * 1024
+    search_result_cache_max_entries: int = 2048
+    search_result_cache_ttl_seconds: int = 600
+    # Hybrid search: fuse BM25 (ml/build_lexical_index.py) and vector rankings
+    # with reciprocal rank fusion over the top search_fusion_candidates of each
+    search_hybrid_enabled: bool = True
+    search_rrf_k: int = 60
+    search_fusion_candidates: int = 50
+
+    # Query encoder: "onnx" uses the int8 export from ml/export_onnx_encoder.py
+    # when present (else PyTorch); "pytorch" always loads SentenceTransformer
+    search_encoder_backend: str = "onnx"
+    search_encoder_threads: int = 0
+
+    # Micro-batched query encoding: wait up to the window (or max size) to batch concurrent queries
+    search_batching_enabled: bool = True
+    search_batch_max_size: int = 32
+    search_batch_window_ms: float = 5.0
+
+    # Weight of sentence-embedding similarity in hybrid ranking (0 = off)
+    embedding_fusion_weight: float = 0.2
+
+    # Catalog-sharded scoring in shared memory (0 shards = off; 0 workers = one per shard)
+    scoring_shards: int = 0
+    scoring_shard_workers: int = 0
+
+    # Verified access token cache
+    auth_token_cache_ttl_seconds: int = 300
+    auth_token_cache_max_entries: int = 10000
+
+    # Background cache warmer for homepage/browse rows
+    cache_warmer_enabled: bool = True
+    cache_warmer_interval_seconds: int = 60
+    cache_warmer_refresh_margin_seconds: int = 120
+
+    # Speculative detail-page prefetch for served recommendations
+    prefetch_enabled: bool = True
+    prefetch_top_k: int = 5
+    prefetch_queue_size: int = 100
+
+    # Ranked-list snapshots behind cursor-paginated recommendations
+    recommendation_snapshot_size: int = 500
+    recommendation_snapshot_ttl_seconds: int = 1800
+    recommendation_snapshot_max_entries: int = 1000
+
+    # Nightly precomputed recommendations (ml/precompute_recommendations.py)
+    precompute_top_n: int = 100  # cursor pagination over a precomputed list ends here
+    precompute_page_size: int = 10
+    precompute_chunk_size: int = 256
+    precompute_workers: int = 4
+    precompute_active_days: int = 90
+    precomputed_reload_interval_seconds: int = 300
+
+    # Per-request latency budget for /api/recommendations/ and its stages
+    recommendation_deadline_seconds: float = 2.0
+    recommendation_hybrid_timeout_seconds: float = 1.0
+    recommendation_hydration_reserve_seconds: float = 0.5
+
+    # Admission control for expensive endpoints (per worker)
+    admission_enabled: bool = True
+    admission_queue_timeout_seconds: float = 1.0
+    recommendations_max_concurrency: int = 8
+    recommendations_max_queue: int = 16
+    search_max_concurrency: int = 4
+    search_max_queue: int = 8
+    explain_max_concurrency: int = 2
+    explain_max_queue: int = 4
+    # Per-client token bucket on the same endpoints (0 = disabled)
+    client_rate_limit_per_second: float = 0.0
+    client_rate_limit_burst: int = 10
+
 
 settings = Settings()
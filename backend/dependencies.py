@@ -3,19 +3,70 @@ Shared service instances for dependency injection.
 
 Avoids circular imports by providing a central location for service instances.
 """
+from config import settings
 from services.recommender import RecommenderService
 from services.semantic_search import SemanticSearchService
 from services.explanations import ExplanationService
+from services.auth import TokenVerifier
+from services.shared_cache import SharedCache, shared_tier
+from services.database import SupabaseDataAccess
+from services.cold_start import ColdStartClusters
+from services.executors import ExecutorPool
+from services.lexical_search import LexicalIndex
+from services.neighbors import NeighborIndex
+from services.precomputed import PrecomputedRecommendations
+from services.prefetch import DetailPrefetcher
+from services.tmdb import TMDBService
+from ml.embeddings import open_embedding_store
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
 from ml.embeddings.store import EmbeddingStore
 
+# App-scoped async Supabase data access (connected in lifespan)
+data_access = SupabaseDataAccess()
+
+# Thread/process pools for CPU-bound work awaited by the routers
+executor_pool = ExecutorPool()
+
 # Create recommender service instance
 recommender_service = RecommenderService()
 
 # Create embedding store and semantic search service instances
 # These are initialized at import time but models loaded in lifespan
-embedding_store = EmbeddingStore()
-semantic_search_service = SemanticSearchService(embedding_store)
-explanation_service = ExplanationService()
+embedding_store: EmbeddingStore | NumpyEmbeddingStore = open_embedding_store(
+    settings.embedding_backend, settings.embedding_rerank_factor
+)
+# BM25 index fused into semantic search (loaded in lifespan)
+lexical_index = LexicalIndex()
+semantic_search_service = SemanticSearchService(embedding_store, lexical_index)
+
+# Precomputed "more like this" tables (loaded in lifespan)
+neighbor_index = NeighborIndex()
+
+explanation_service = ExplanationService(
+    data_access, neighbor_index, embedding_store, executor_pool.run_cpu
+)
+
+# Local JWT verification with a verified-token cache
+token_verifier = TokenVerifier()
+
+# Ranked recommendation snapshots served page by page via opaque cursors
+recommendation_cache = SharedCache(
+    "recommendations",
+    max_entries=settings.recommendation_snapshot_max_entries,
+    default_ttl=settings.recommendation_snapshot_ttl_seconds,
+    remote=shared_tier,
+)
+
+# Nightly precomputed ranked lists (loaded in lifespan, reloaded when rewritten)
+precomputed_recommendations = PrecomputedRecommendations(
+    reload_interval=settings.precomputed_reload_interval_seconds
+)
+
+# Cluster-centroid lists for users with 1-4 ratings (loaded in lifespan)
+cold_start_clusters = ColdStartClusters()
+
+# Background prefetcher for recommendation detail pages (worker started in lifespan)
+detail_prefetcher = DetailPrefetcher(TMDBService())
 
 
 def get_recommender_service() -> RecommenderService:
@@ -28,7 +79,7 @@ def get_semantic_search_service() -> SemanticSearchService:
     return semantic_search_service
 
 
-def get_embedding_store() -> EmbeddingStore:
+def get_embedding_store() -> EmbeddingStore | NumpyEmbeddingStore:
     """Get the global embedding store instance."""
     return embedding_store
 
@@ -36,3 +87,43 @@ def get_embedding_store() -> EmbeddingStore:
 def get_explanation_service() -> ExplanationService:
     """Get the global explanation service instance."""
     return explanation_service
+
+
+def get_detail_prefetcher() -> DetailPrefetcher:
+    """Get the global detail prefetcher instance."""
+    return detail_prefetcher
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get the global access token verifier instance."""
+    return token_verifier
+
+
+def get_data_access() -> SupabaseDataAccess:
+    """Get the global Supabase data access instance."""
+    return data_access
+
+
+def get_executor_pool() -> ExecutorPool:
+    """Get the global executor pool instance."""
+    return executor_pool
+
+
+def get_precomputed_recommendations() -> PrecomputedRecommendations:
+    """Get the global precomputed recommendation store."""
+    return precomputed_recommendations
+
+
+def get_cold_start_clusters() -> ColdStartClusters:
+    """Get the global cold-start cluster lists."""
+    return cold_start_clusters
+
+
+def get_neighbor_index() -> NeighborIndex:
+    """Get the global item-to-item neighbor index."""
+    return neighbor_index
+
+
+def get_recommendation_cache() -> SharedCache:
+    """Get the global ranked recommendation snapshot cache."""
+    return recommendation_cache
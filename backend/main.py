@@ -7,17 +7,50 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
-from dependencies import recommender_service
+from dependencies import (
+    recommender_service,
+    detail_prefetcher,
+    data_access,
+    explanation_service,
+    executor_pool,
+    recommendation_cache,
+    precomputed_recommendations,
+    neighbor_index,
+    cold_start_clusters,
+    embedding_store,
+    lexical_index,
+    token_verifier,
+)
+from services.admission import AdmissionController, AdmissionMiddleware, ClientRateLimiter
+from services.cache_warmer import CacheWarmer
+from services.metrics import metrics
+from services.shared_cache import shared_tier
+from services.tmdb import TMDBService, tmdb_cache
 
 _MODEL_DIR = str(Path(__file__).parent / "ml" / "models")
 
+cache_warmer: CacheWarmer | None = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager for startup/shutdown."""
-    # Startup: Load recommender models
+    # Startup: open the pooled Supabase connection
+    await data_access.connect()
+    if shared_tier is not None:
+        shared_tier.start()
+    await explanation_service.create_table_if_not_exists()
+
+    # Load recommender models
     recommender_service.load_model(_MODEL_DIR)
     recommender_service.load_collaborative_model(_MODEL_DIR)
+    recommender_service.load_embeddings_from_store(embedding_store, settings.embedding_fusion_weight)
+    executor_pool.start_process_pool(_MODEL_DIR)
+    executor_pool.start_sharded_scorer(recommender_service)
+    precomputed_recommendations.load(_MODEL_DIR)
+    neighbor_index.load(_MODEL_DIR)
+    cold_start_clusters.load(_MODEL_DIR)
+    lexical_index.load(_MODEL_DIR)
 
     # Log model status
     import logging
@@ -26,16 +59,94 @@ async def lifespan(app: FastAPI):
     logger.info(f"Collaborative filtering model loaded: {recommender_service.is_collaborative_loaded()}")
 
     # Semantic search service is initialized in dependencies.py
-    # SentenceTransformer model loads on first import (cached for subsequent requests)
-    from dependencies import semantic_search_service, embedding_store
+    # Query encoder (int8 ONNX or SentenceTransformer) loads on first import
+    from dependencies import semantic_search_service
     logger.info(f"Semantic search initialized with {embedding_store.count()} movie embeddings")
+    semantic_search_service.refresh_index_version()
+    metrics.register_collector("semantic_search_cache", semantic_search_service.cache.stats)
+    if semantic_search_service.encoder is not None:
+        metrics.register_collector("query_encoder", semantic_search_service.encoder.stats)
+
+    # Keep homepage/browse TMDB responses warm ahead of their TTL
+    global cache_warmer
+    if settings.cache_warmer_enabled:
+        from routers.movies import BROWSE_GENRE_IDS, FEATURED_MOVIE_IDS, MOOD_GENRE_MAP
+        cache_warmer = CacheWarmer(
+            TMDBService(),
+            featured_movie_ids=FEATURED_MOVIE_IDS,
+            mood_genre_map=MOOD_GENRE_MAP,
+            genre_ids=BROWSE_GENRE_IDS,
+        )
+        cache_warmer.start()
+
+    if settings.prefetch_enabled:
+        detail_prefetcher.start()
+
+    metrics.register_collector("tmdb_cache", tmdb_cache.stats)
+    metrics.register_collector("detail_prefetch", detail_prefetcher.status)
+    metrics.register_collector("recommendation_snapshots", recommendation_cache.stats)
+    metrics.register_collector("precomputed_recommendations", precomputed_recommendations.status)
+    metrics.register_collector("neighbors", neighbor_index.status)
+    metrics.register_collector("cold_start_clusters", cold_start_clusters.status)
+    metrics.register_collector("lexical_index", lexical_index.status)
+    metrics.register_collector(
+        "admission", lambda: {c.name: c.status() for c in admission_controllers}
+    )
+    if cache_warmer is not None:
+        metrics.register_collector("cache_warm_coverage", cache_warmer.coverage)
 
     yield
-    # Shutdown: cleanup handled by garbage collection
+
+    # Shutdown: stop background tasks; remaining cleanup handled by garbage collection
+    if cache_warmer is not None:
+        await cache_warmer.stop()
+    await detail_prefetcher.stop()
+    await data_access.close()
+    if shared_tier is not None:
+        await shared_tier.stop()
+    semantic_search_service.close()
+    executor_pool.shutdown()
 
 
 app = FastAPI(title="Netflix Recommendations API", lifespan=lifespan, redirect_slashes=False)
 
+# Admission control: bounded concurrency + short queues for expensive endpoints.
+# Added before CORS so shed responses still get CORS headers.
+admission_controllers = [
+    AdmissionController(
+        "recommendations",
+        settings.recommendations_max_concurrency,
+        settings.recommendations_max_queue,
+        settings.admission_queue_timeout_seconds,
+    ),
+    AdmissionController(
+        "search",
+        settings.search_max_concurrency,
+        settings.search_max_queue,
+        settings.admission_queue_timeout_seconds,
+    ),
+    AdmissionController(
+        "explain",
+        settings.explain_max_concurrency,
+        settings.explain_max_queue,
+        settings.admission_queue_timeout_seconds,
+    ),
+]
+if settings.admission_enabled:
+    recommendations_admission, search_admission, explain_admission = admission_controllers
+    app.add_middleware(
+        AdmissionMiddleware,
+        policies=[
+            (r"/api/recommendations/(stream|rows)?", recommendations_admission),
+            (r"/api/recommendations/\d+/explain", explain_admission),
+            (r"/api/search/semantic", search_admission),
+        ],
+        rate_limiter=ClientRateLimiter(
+            settings.client_rate_limit_per_second, settings.client_rate_limit_burst
+        ) if settings.client_rate_limit_per_second > 0 else None,
+        token_verifier=token_verifier,
+    )
+
 # Configure CORS
 allowed_origins = [settings.frontend_url]
 if settings.frontend_url and not settings.frontend_url.startswith("http://localhost"):
@@ -72,4 +183,17 @@ async def health_check():
         "status": "ok",
         "content_model_loaded": recommender_service.is_loaded(),
         "collaborative_model_loaded": recommender_service.is_collaborative_loaded(),
+        "cache_warm_coverage": cache_warmer.coverage() if cache_warmer else None,
+        "detail_prefetch": detail_prefetcher.status(),
     }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    In-process metrics snapshot for this worker.
+
+    Counters, gauges and timing summaries (e.g. executor wait time) plus
+    component state such as cache hit rates and prefetch queue depth.
+    """
+    return metrics.snapshot()
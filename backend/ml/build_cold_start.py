@@ -0,0 +1,174 @@
+"""
+Cold-start cluster builder.
+
+Builds a TF-IDF taste profile for every user in the CF trainset (MovieLens
+seed users plus real users), clusters the L2-normalized profiles with
+k-means and, for each cluster, ranks the catalog by a mix of similarity
+to the centroid and how often the cluster's members rated a movie 4+.
+Listed movies are hydrated from TMDB at build time, so serving a cluster
+list needs no TMDB calls. Output: ml/models/cold_start_clusters.npz.
+
+TF-IDF profiles (rather than SVD user factors) are clustered because a
+user with 1-4 ratings has no SVD factors yet but does have a TF-IDF
+profile in the same space as the centroids.
+
+Usage:
+    python -m ml.build_cold_start
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import normalize
+
+from services.cold_start import CLUSTERS_FILENAME, save_clusters
+from services.recommender import RecommenderService
+from services.tmdb import TMDBService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent / "models"
+
+N_CLUSTERS = 16
+TOP_N = 100
+
+# Weight of the members' 4+ rating share vs. centroid similarity in a cluster's list
+LIKES_WEIGHT = 0.5
+
+SUMMARY_FIELDS = ("id", "title", "poster_path", "overview", "vote_average", "release_date")
+
+
+def trainset_user_ratings(trainset) -> dict[str, list[dict]]:
+    """Group the CF trainset's ratings by raw user ID."""
+    ratings_by_user: dict[str, list[dict]] = defaultdict(list)
+    for inner_uid, inner_iid, rating in trainset.all_ratings():
+        ratings_by_user[trainset.to_raw_uid(inner_uid)].append(
+            {"movie_id": trainset.to_raw_iid(inner_iid), "rating": rating}
+        )
+    return ratings_by_user
+
+
+def cluster_profiles(
+    recommender: RecommenderService,
+    ratings_by_user: dict[str, list[dict]],
+    n_clusters: int = N_CLUSTERS,
+) -> tuple[np.ndarray, np.ndarray, list[list[dict]]]:
+    """
+    Cluster users by their TF-IDF taste profiles.
+
+    Returns:
+        (unit-length centroids, cluster label per profiled user, ratings of
+        each profiled user)
+    """
+    profiles, user_ratings = [], []
+    for ratings in ratings_by_user.values():
+        profile = recommender.build_user_profile(ratings)
+        if profile is not None:
+            profiles.append(np.asarray(profile).ravel())
+            user_ratings.append(ratings)
+    if not profiles:
+        raise RuntimeError("No user has a taste profile; nothing to cluster")
+
+    matrix = normalize(sp.csr_matrix(np.vstack(profiles)))
+    kmeans = KMeans(n_clusters=min(n_clusters, matrix.shape[0]), n_init=10, random_state=42)
+    labels = kmeans.fit_predict(matrix)
+    return normalize(kmeans.cluster_centers_), labels, user_ratings
+
+
+def rank_cluster_lists(
+    recommender: RecommenderService,
+    centroids: np.ndarray,
+    labels: np.ndarray,
+    user_ratings: list[list[dict]],
+    top_n: int = TOP_N,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rank the catalog for each cluster.
+
+    Returns:
+        (movie IDs, scores), both (n_clusters, top_n)
+    """
+    n_movies = len(recommender.movie_ids)
+    top_n = min(top_n, n_movies)
+    similarity = np.asarray(recommender.tfidf_matrix @ centroids.T).T  # (n_clusters, n_movies)
+
+    movie_ids = np.zeros((len(centroids), top_n), dtype=np.int64)
+    scores = np.zeros((len(centroids), top_n), dtype=np.float32)
+    for cluster in range(len(centroids)):
+        members = [user_ratings[i] for i in np.flatnonzero(labels == cluster)]
+        likes = np.zeros(n_movies)
+        for ratings in members:
+            for r in ratings:
+                idx = recommender.movie_id_to_index.get(r["movie_id"])
+                if idx is not None and r["rating"] >= 4.0:
+                    likes[idx] += 1
+        like_share = likes / max(1, len(members))
+        cluster_scores = (1 - LIKES_WEIGHT) * similarity[cluster] + LIKES_WEIGHT * like_share
+        top = np.argsort(-cluster_scores)[:top_n]
+        movie_ids[cluster] = [recommender.movie_ids[i] for i in top]
+        scores[cluster] = cluster_scores[top]
+    return movie_ids, scores
+
+
+async def fetch_summaries(movie_ids: list[int]) -> dict[int, dict]:
+    """Fetch TMDB summaries for the listed movies (failures are skipped)."""
+    tmdb = TMDBService()
+    results = await asyncio.gather(
+        *(tmdb.get_movie_summary(movie_id) for movie_id in movie_ids), return_exceptions=True
+    )
+    summaries = {}
+    for movie_id, result in zip(movie_ids, results):
+        if isinstance(result, Exception):
+            logger.warning(f"  could not hydrate movie {movie_id}: {result}")
+            continue
+        summaries[movie_id] = {field: result.get(field) for field in SUMMARY_FIELDS}
+    return summaries
+
+
+def main():
+    """Entry point for building the cold-start clusters."""
+    print("\n" + "=" * 60)
+    print("Cold-Start Cluster Builder")
+    print("=" * 60)
+
+    logger.info("\nStep 1: Loading models...")
+    recommender = RecommenderService()
+    recommender.load_model(str(MODEL_DIR))
+    recommender.load_collaborative_model(str(MODEL_DIR))
+    if not recommender.is_loaded() or not recommender.is_collaborative_loaded():
+        logger.error("Models not found; run build_model.py and build_collaborative.py first")
+        return
+
+    logger.info("\nStep 2: Clustering user taste profiles...")
+    ratings_by_user = trainset_user_ratings(recommender.cf_trainset)
+    centroids, labels, user_ratings = cluster_profiles(recommender, ratings_by_user)
+    sizes = np.bincount(labels, minlength=len(centroids))
+    logger.info(f"  {len(user_ratings)} profiled users in {len(centroids)} clusters (sizes {sizes.tolist()})")
+
+    logger.info("\nStep 3: Ranking cluster lists...")
+    movie_ids, scores = rank_cluster_lists(recommender, centroids, labels, user_ratings)
+
+    logger.info("\nStep 4: Hydrating listed movies from TMDB...")
+    movies = asyncio.run(fetch_summaries(sorted({int(m) for m in movie_ids.ravel()})))
+    logger.info(f"  hydrated {len(movies)} movies")
+
+    path = MODEL_DIR / CLUSTERS_FILENAME
+    save_clusters(
+        path, centroids, movie_ids, scores, movies,
+        model_version=recommender.content_model_version, generated_at=time.time(),
+    )
+
+    print("\n" + "=" * 60)
+    print("BUILD COMPLETE")
+    print("=" * 60)
+    print(f"\n✓ Cold-start clusters saved to: {path} ({path.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
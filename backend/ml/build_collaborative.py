@@ -4,6 +4,7 @@ SVD collaborative filtering model builder.
 Trains an SVD model on combined MovieLens seed data + real user ratings from Supabase.
 Produces persisted model artifacts for the hybrid recommendation system.
 """
+import asyncio
 import pandas as pd
 import joblib
 from pathlib import Path
@@ -18,8 +19,8 @@ from ml.download_movielens import (
 
 # Optional Supabase import - gracefully handle if not configured
 try:
-    from supabase import create_client, Client
     from config import settings
+    from services.database import SupabaseDataAccess
     SUPABASE_AVAILABLE = True
 except Exception:
     SUPABASE_AVAILABLE = False
@@ -28,6 +29,19 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def _fetch_all_ratings() -> list[dict]:
+    """Fetch every row of the ratings table page by page."""
+    data_access = SupabaseDataAccess()
+    await data_access.connect()
+    try:
+        rows = []
+        async for page in data_access.iter_all_ratings():
+            rows.extend(page)
+        return rows
+    finally:
+        await data_access.close()
+
+
 def get_real_user_ratings() -> pd.DataFrame:
     """
     Fetch real user ratings from Supabase.
@@ -47,22 +61,16 @@ def get_real_user_ratings() -> pd.DataFrame:
             logger.info("Supabase not configured - skipping real user ratings")
             return pd.DataFrame(columns=['user_id', 'movie_id', 'rating'])
 
-        # Create Supabase client
-        supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_service_role_key
-        )
-
-        # Fetch all ratings
+        # Fetch all ratings (keyset-paginated past PostgREST's max-rows limit)
         logger.info("Fetching real user ratings from Supabase...")
-        response = supabase.table("ratings").select("user_id, movie_id, rating").execute()
+        rows = asyncio.run(_fetch_all_ratings())
 
-        if not response.data:
+        if not rows:
             logger.info("No real user ratings found in Supabase")
             return pd.DataFrame(columns=['user_id', 'movie_id', 'rating'])
 
         # Convert to DataFrame
-        df = pd.DataFrame(response.data)
+        df = pd.DataFrame(rows)[['user_id', 'movie_id', 'rating']]
         logger.info(f"Fetched {len(df)} real user ratings from Supabase")
 
         return df
@@ -0,0 +1,61 @@
+"""
+BM25 lexical index builder.
+
+Reads the text representations stored with the movie embeddings (the
+output of build_text_representation, so lexical and semantic search see
+the same text) and writes ml/models/lexical_index.npz for
+services/lexical_search.py.
+
+Usage:
+    python -m ml.build_lexical_index
+"""
+import logging
+import time
+from pathlib import Path
+
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+from services.lexical_search import LEXICAL_INDEX_FILENAME, LexicalIndex, save_lexical_index
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent / "models"
+
+
+def load_documents():
+    """Documents from the numpy index if built, else from ChromaDB."""
+    if NumpyEmbeddingStore.exists():
+        return NumpyEmbeddingStore.load().get_all_documents()
+    from ml.embeddings.store import EmbeddingStore
+    return EmbeddingStore().get_all_documents()
+
+
+def main():
+    """Entry point for building the lexical index."""
+    print("\n" + "=" * 60)
+    print("BM25 Lexical Index Builder")
+    print("=" * 60)
+
+    logger.info("\nStep 1: Loading text representations...")
+    movie_ids, documents, metadatas = load_documents()
+    if not movie_ids:
+        logger.error("Embedding store is empty; run 'python -m ml.embeddings.builder' first")
+        return
+    logger.info(f"  {len(movie_ids)} documents")
+
+    logger.info("\nStep 2: Building BM25 postings...")
+    path = MODEL_DIR / LEXICAL_INDEX_FILENAME
+    save_lexical_index(path, movie_ids, documents, metadatas, generated_at=time.time())
+
+    index = LexicalIndex()
+    index.load(str(MODEL_DIR))
+
+    print("\n" + "=" * 60)
+    print("BUILD COMPLETE")
+    print("=" * 60)
+    print(f"\n✓ Lexical index saved to: {path} ({path.stat().st_size / 1024:.1f} KB)")
+    print(f"  - {index.status()['terms']} terms over {index.status()['movies']} movies")
+
+
+if __name__ == "__main__":
+    main()
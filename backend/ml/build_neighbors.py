@@ -0,0 +1,220 @@
+"""
+Item-to-item neighbor table builder.
+
+For every catalog movie, finds its top-K most similar movies by:
+- tfidf: cosine similarity of TF-IDF content vectors
+- embedding: cosine similarity of sentence embeddings (from ChromaDB)
+- svd: cosine similarity of SVD item factors (movies in the CF trainset)
+- blended: weighted mix of whichever of the above both movies have
+
+Similarities are computed in row blocks so memory stays at
+BLOCK_SIZE x n_movies, and the result is written to
+ml/models/neighbors.npz for services/neighbors.py. Sources whose
+artifacts are missing are skipped.
+
+Usage:
+    python -m ml.build_neighbors
+"""
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from services.neighbors import NEIGHBORS_FILENAME, save_neighbors
+from services.recommender import RecommenderService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent / "models"
+
+TOP_K = 20
+BLOCK_SIZE = 256
+
+# Relative weight of each source in the blended table (renormalized per pair)
+BLEND_WEIGHTS = {"tfidf": 0.4, "embedding": 0.4, "svd": 0.2}
+
+
+def load_embedding_vectors(movie_ids: list[int]) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Load sentence embeddings from ChromaDB aligned with the catalog.
+
+    Returns:
+        (embeddings, has_embedding mask), or None if the store is empty or
+        unavailable
+    """
+    try:
+        from ml.embeddings.store import EmbeddingStore
+        ids, embeddings = EmbeddingStore().get_all_embeddings()
+    except Exception as e:
+        logger.warning(f"Skipping embedding neighbors: {e}")
+        return None
+    if not ids:
+        logger.warning("Skipping embedding neighbors: embedding store is empty")
+        return None
+
+    by_id = dict(zip(ids, embeddings))
+    dim = embeddings.shape[1]
+    vectors = np.zeros((len(movie_ids), dim), dtype=np.float32)
+    present = np.zeros(len(movie_ids), dtype=bool)
+    for idx, movie_id in enumerate(movie_ids):
+        vector = by_id.get(movie_id)
+        if vector is not None:
+            vectors[idx] = vector
+            present[idx] = True
+    return vectors, present
+
+
+def load_svd_vectors(recommender: RecommenderService) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Gather SVD item factors aligned with the catalog.
+
+    Returns:
+        (item factors, in-trainset mask), or None if the CF model is missing
+    """
+    if not recommender.is_collaborative_loaded():
+        logger.warning("Skipping SVD neighbors: collaborative model not loaded")
+        return None
+    recommender._index_cf_items()
+    inner_ids = recommender.cf_item_inner_ids
+    present = inner_ids >= 0
+    vectors = np.zeros((len(inner_ids), recommender.svd_model.qi.shape[1]), dtype=np.float32)
+    vectors[present] = recommender.svd_model.qi[inner_ids[present]]
+    return vectors, present
+
+
+def top_k_rows(
+    similarity: np.ndarray,
+    row_offset: int,
+    valid_rows: np.ndarray,
+    valid_cols: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top-k columns per row of a similarity block, skipping self-matches.
+
+    Args:
+        similarity: (block, n_movies) similarities
+        row_offset: Catalog index of the block's first row
+        valid_rows: Whether each block row has this source
+        valid_cols: Whether each catalog movie has this source
+        k: Neighbors per row
+
+    Returns:
+        (catalog indices, scores), both (block, k); missing entries are -1 / 0
+    """
+    block, n_movies = similarity.shape
+    similarity = np.where(valid_cols, similarity, -np.inf)
+    similarity[np.arange(block), row_offset + np.arange(block)] = -np.inf
+
+    k = min(k, n_movies - 1)
+    top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    missing = ~np.isfinite(top_scores) | ~valid_rows[:, None]
+    top[missing] = -1
+    top_scores[missing] = 0.0
+    return top, top_scores
+
+
+def build_neighbor_tables(
+    sources: dict[str, tuple[np.ndarray | sp.spmatrix, np.ndarray]],
+    k: int = TOP_K,
+    block_size: int = BLOCK_SIZE,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """
+    Compute per-source and blended top-k neighbor tables.
+
+    Args:
+        sources: name -> (row vectors, has-vector mask), rows aligned with the catalog
+        k: Neighbors per movie
+        block_size: Rows scored per block
+
+    Returns:
+        name -> (neighbor catalog indices, scores), both (n_movies, k)
+    """
+    normalized = {name: (normalize(vectors), present) for name, (vectors, present) in sources.items()}
+    n_movies = next(iter(normalized.values()))[0].shape[0]
+    k = min(k, n_movies - 1)
+    tables = {
+        name: (np.full((n_movies, k), -1, dtype=np.int64), np.zeros((n_movies, k), dtype=np.float32))
+        for name in [*normalized, "blended"]
+    }
+
+    for start in range(0, n_movies, block_size):
+        end = min(start + block_size, n_movies)
+        weighted = np.zeros((end - start, n_movies))
+        total_weight = np.zeros((end - start, n_movies))
+        for name, (vectors, present) in normalized.items():
+            similarity = vectors[start:end] @ vectors.T
+            similarity = similarity.toarray() if sp.issparse(similarity) else np.asarray(similarity)
+            ids, scores = top_k_rows(similarity, start, present[start:end], present, k)
+            tables[name][0][start:end], tables[name][1][start:end] = ids, scores
+
+            pair_weight = BLEND_WEIGHTS.get(name, 0.0) * np.outer(present[start:end], present)
+            weighted += pair_weight * similarity
+            total_weight += pair_weight
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blended = weighted / total_weight
+        has_any = total_weight > 0
+        ids, scores = top_k_rows(
+            np.where(has_any, blended, -np.inf), start, has_any.any(axis=1), np.ones(n_movies, dtype=bool), k
+        )
+        tables["blended"][0][start:end], tables["blended"][1][start:end] = ids, scores
+
+    return tables
+
+
+def main():
+    """Entry point for building the neighbor tables."""
+    print("\n" + "=" * 60)
+    print("Item-to-Item Neighbor Table Builder")
+    print("=" * 60)
+
+    logger.info("\nStep 1: Loading models...")
+    recommender = RecommenderService()
+    recommender.load_model(str(MODEL_DIR))
+    recommender.load_collaborative_model(str(MODEL_DIR))
+    if not recommender.is_loaded():
+        logger.error("Content model not found; run build_model.py first")
+        return
+    movie_ids = list(recommender.movie_ids)
+    n_movies = len(movie_ids)
+
+    sources = {"tfidf": (recommender.tfidf_matrix, np.ones(n_movies, dtype=bool))}
+    embedding = load_embedding_vectors(movie_ids)
+    if embedding is not None:
+        sources["embedding"] = embedding
+    svd = load_svd_vectors(recommender)
+    if svd is not None:
+        sources["svd"] = svd
+    for name, (_, present) in sources.items():
+        logger.info(f"  {name}: {present.sum()}/{n_movies} movies")
+
+    logger.info(f"\nStep 2: Computing top-{TOP_K} neighbors...")
+    started = time.perf_counter()
+    tables = build_neighbor_tables(sources)
+    catalog = np.array(movie_ids + [-1], dtype=np.int64)  # index -1 maps to the -1 padding ID
+    id_tables = {name: (catalog[ids], scores) for name, (ids, scores) in tables.items()}
+    logger.info(f"  done in {time.perf_counter() - started:.1f}s")
+
+    logger.info("\nStep 3: Saving...")
+    path = MODEL_DIR / NEIGHBORS_FILENAME
+    save_neighbors(path, np.array(movie_ids), id_tables, generated_at=time.time())
+
+    print("\n" + "=" * 60)
+    print("BUILD COMPLETE")
+    print("=" * 60)
+    print(f"\n✓ Neighbor tables saved to: {path} ({path.stat().st_size / 1024:.1f} KB)")
+    print(f"  - sources: {', '.join(id_tables)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,30 @@
 """Movie embeddings module for semantic search and RAG."""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def open_embedding_store(backend: str = "numpy", rerank_factor: int = 4):
+    """
+    Open the configured embedding store.
+
+    The API, the scoring process pool and the precompute job all load
+    embeddings through this, so they score with identical vectors and agree
+    on the recommender's embedding model version.
+
+    Args:
+        backend: "numpy" or "chroma" (settings.embedding_backend); "numpy"
+            falls back to ChromaDB when the numpy index has not been built
+        rerank_factor: Exact re-rank factor for a compressed numpy index
+
+    Returns:
+        NumpyEmbeddingStore or EmbeddingStore
+    """
+    from ml.embeddings.numpy_store import NumpyEmbeddingStore
+    from ml.embeddings.store import EmbeddingStore
+
+    if backend == "numpy":
+        if NumpyEmbeddingStore.exists():
+            return NumpyEmbeddingStore.load(rerank_factor=rerank_factor)
+        logger.warning("Numpy embedding index not built; using ChromaDB")
+    return EmbeddingStore()
@@ -2,16 +2,19 @@
 Embedding builder for movie semantic search and RAG.
 
 Fetches movie details from TMDB for the TF-IDF catalog, generates embeddings
-using sentence-transformers (all-MiniLM-L6-v2), and stores them in ChromaDB.
+using sentence-transformers (all-MiniLM-L6-v2), and stores them in ChromaDB
+plus an in-memory numpy index (see numpy_store.py).
 """
 import asyncio
 import httpx
 import joblib
 import logging
 from pathlib import Path
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from config import settings
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
 from ml.embeddings.store import EmbeddingStore
 
 # Configure logging
@@ -128,6 +131,7 @@ async def build_embeddings():
     3. Build text representations
     4. Generate embeddings with sentence-transformers
     5. Store in ChromaDB via EmbeddingStore
+    6. Export the collection to a numpy index for embedding_backend="numpy"
     """
     # Step 1: Load TF-IDF catalog movie IDs
     models_dir = Path(__file__).parent.parent / "models"
@@ -199,12 +203,10 @@ async def build_embeddings():
 
     store = EmbeddingStore()
 
-    # Convert numpy arrays to lists for ChromaDB
-    embeddings_list = embeddings.tolist()
-
+    # ChromaDB accepts float32 arrays directly (no float64 list copy)
     store.upsert_movies(
         ids=valid_movie_ids,
-        embeddings=embeddings_list,
+        embeddings=embeddings.astype(np.float32),
         documents=texts,
         metadatas=metadatas
     )
@@ -214,6 +216,13 @@ async def build_embeddings():
     logger.info(f"Total embeddings in ChromaDB: {final_count}")
     logger.info(f"Embeddings saved to: {store.persist_dir}")
 
+    # Step 6: Export numpy index
+    numpy_store = NumpyEmbeddingStore.from_store(store)
+    if settings.embedding_quantization == "int8":
+        numpy_store.compress(settings.embedding_pca_dim)
+    numpy_path = numpy_store.save()
+    logger.info(f"Numpy index saved to: {numpy_path}")
+
 
 def main():
     """Entry point for building movie embeddings."""
@@ -0,0 +1,112 @@
+"""
+Metadata filters for semantic search.
+
+MetadataFilterIndex is built from the catalog-aligned metadata columns that
+extract_metadata produces ("Crime, Drama" genre strings and "YYYY" year
+strings). It holds one packed bitset per genre and an int16 year column, so
+turning a filter into a row mask costs a few byte-wide ORs and one integer
+compare, far less than the vector scan it restricts.
+
+Stores use the mask's selectivity to choose a strategy: score only the
+allowed rows (prefilter) when few rows pass, or scan everything and drop
+disallowed rows before top-k selection (postfilter) when most do.
+"""
+import numpy as np
+
+# Prefilter when at most this fraction of the catalog passes the filter:
+# gathering allowed rows costs about as much per row as scoring them, so
+# the break-even sits a little under half (see benchmarks/bench_filtered_search.py)
+PREFILTER_MAX_SELECTIVITY = 0.4
+
+
+class SearchFilters:
+    """Year range and genre constraints for a search (all optional)."""
+
+    def __init__(
+        self,
+        year_min: int | None = None,
+        year_max: int | None = None,
+        genres: list[str] | None = None,
+    ):
+        """
+        Args:
+            year_min: Earliest release year, inclusive
+            year_max: Latest release year, inclusive
+            genres: Genre names; a movie matches if it has any of them
+        """
+        self.year_min = year_min
+        self.year_max = year_max
+        self.genres = sorted({g.strip().casefold() for g in genres or [] if g.strip()})
+
+    def is_empty(self) -> bool:
+        """True when no constraint is set."""
+        return self.year_min is None and self.year_max is None and not self.genres
+
+    def cache_key(self) -> str:
+        """Stable string identifying the constraints."""
+        return f"{self.year_min}-{self.year_max}:{','.join(self.genres)}"
+
+
+def _parse_year(year: str) -> int:
+    try:
+        return int(str(year)[:4])
+    except ValueError:
+        return 0
+
+
+class MetadataFilterIndex:
+    """Genre bitsets and a year column aligned with a store's rows."""
+
+    def __init__(self, genres: list[str] | np.ndarray, years: list[str] | np.ndarray):
+        """
+        Args:
+            genres: Comma-separated genre string per row
+            years: Release year string per row ("" when unknown)
+        """
+        self.size = len(genres)
+        rows_by_genre: dict[str, list[int]] = {}
+        for row, genre_str in enumerate(genres):
+            for genre in str(genre_str).split(","):
+                genre = genre.strip().casefold()
+                if genre:
+                    rows_by_genre.setdefault(genre, []).append(row)
+
+        self.genre_names = sorted(rows_by_genre)
+        self._genre_row = {genre: i for i, genre in enumerate(self.genre_names)}
+        bits = np.zeros((len(self.genre_names), self.size), dtype=bool)
+        for genre, rows in rows_by_genre.items():
+            bits[self._genre_row[genre], rows] = True
+        self.genre_bitsets = np.packbits(bits, axis=1)
+        # 0 = unknown year, excluded by any year constraint
+        self.years = np.array([_parse_year(year) for year in years], dtype=np.int16)
+
+    def mask(self, filters: SearchFilters | None) -> np.ndarray | None:
+        """
+        Rows passing the filters.
+
+        Args:
+            filters: Constraints, or None
+
+        Returns:
+            (size,) bool mask, or None when there is nothing to filter
+        """
+        if filters is None or filters.is_empty():
+            return None
+        mask = np.ones(self.size, dtype=bool)
+        if filters.genres:
+            packed = np.zeros(self.genre_bitsets.shape[1], dtype=np.uint8)
+            for genre in filters.genres:
+                row = self._genre_row.get(genre)
+                if row is not None:
+                    packed |= self.genre_bitsets[row]
+            mask &= np.unpackbits(packed, count=self.size).astype(bool)
+        if filters.year_min is not None:
+            mask &= self.years >= filters.year_min
+        if filters.year_max is not None:
+            mask &= (self.years <= filters.year_max) & (self.years > 0)
+        return mask
+
+
+def use_prefilter(mask: np.ndarray) -> bool:
+    """Whether a mask is selective enough to score only its rows."""
+    return np.count_nonzero(mask) <= PREFILTER_MAX_SELECTIVITY * len(mask)
@@ -0,0 +1,421 @@
+"""
+In-memory numpy vector index for movie embeddings.
+
+An alternative EmbeddingStore backend for catalogs that fit in RAM: all
+embeddings live in one contiguous, L2-normalized float32 matrix with an
+aligned movie ID array and metadata columns. A query is a single
+matrix-vector product plus argpartition, with no client/server hop or
+per-query conversion to Python lists, and several queries can be scored in
+one matrix product.
+
+Persisted as a directory holding vectors.npy (memory-mapped on load, so
+worker processes share the pages) and columns.npz (IDs, metadata,
+documents). Distances follow ChromaDB's cosine space (1 - cosine
+similarity), so results are interchangeable with EmbeddingStore's.
+
+compress() adds an int8 (optionally PCA-reduced) copy of the matrix (see
+quantization.py), saved as codes.npy. Scans then read the codes and the
+best rerank_factor * k candidates are re-scored exactly against the
+float32 rows, which stay memory-mapped and are only paged in for those
+candidates.
+
+Usage (export an existing ChromaDB collection):
+    python -m ml.embeddings.numpy_store
+"""
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ml.embeddings.filters import MetadataFilterIndex, SearchFilters, use_prefilter
+from ml.embeddings.quantization import ScalarQuantizer
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILENAME = "vectors.npy"
+COLUMNS_FILENAME = "columns.npz"
+CODES_FILENAME = "codes.npy"
+QUANTIZER_FILENAME = "quantizer.npz"
+METADATA_FIELDS = ("title", "genres", "year")
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+
+def _select_top_k(similarity: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Column positions and scores of each row's k best, sorted best first."""
+    if k < similarity.shape[1]:
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    else:
+        top = np.tile(np.arange(similarity.shape[1]), (len(similarity), 1))
+    top_scores = np.take_along_axis(similarity, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class NumpyEmbeddingStore:
+    """
+    Exact cosine search over a normalized float32 matrix.
+
+    Exposes the same methods as EmbeddingStore (upsert_movies,
+    query_similar, get_by_ids, get_all_embeddings, count) plus
+    query_similar_batch and top_k for batched and array-level queries.
+    """
+
+    def __init__(self, persist_dir: str | None = None, rerank_factor: int = 4):
+        """
+        Initialize an empty store.
+
+        Args:
+            persist_dir: Directory for save()/load(). Defaults to
+                        backend/ml/embeddings/numpy_index
+            rerank_factor: With compressed codes, re-score this many
+                          candidates per result exactly (0 = codes only)
+        """
+        if persist_dir is None:
+            persist_dir = str(Path(__file__).parent / "numpy_index")
+        self.persist_dir = persist_dir
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.columns: dict[str, np.ndarray] = {
+            name: np.zeros(0, dtype=str) for name in (*METADATA_FIELDS, "document")
+        }
+        self._positions: dict[int, int] = {}
+        self.filter_index = MetadataFilterIndex([], [])
+        self.quantizer: ScalarQuantizer | None = None
+        self.codes: np.ndarray | None = None
+        self.rerank_factor = rerank_factor
+
+    @classmethod
+    def exists(cls, persist_dir: str | None = None) -> bool:
+        """Check whether a saved index is present."""
+        store = cls(persist_dir)
+        return (Path(store.persist_dir) / VECTORS_FILENAME).exists()
+
+    @classmethod
+    def load(
+        cls, persist_dir: str | None = None, mmap: bool = True, rerank_factor: int = 4
+    ) -> "NumpyEmbeddingStore":
+        """
+        Load a saved index (and its compressed codes, if saved).
+
+        Args:
+            persist_dir: Directory written by save()
+            mmap: Memory-map the vector matrix read-only instead of reading it
+            rerank_factor: See __init__
+
+        Returns:
+            Loaded store
+
+        Raises:
+            FileNotFoundError: If no index has been saved there
+        """
+        store = cls(persist_dir, rerank_factor)
+        path = Path(store.persist_dir)
+        store.vectors = np.load(path / VECTORS_FILENAME, mmap_mode="r" if mmap else None)
+        with np.load(path / COLUMNS_FILENAME) as data:
+            store.ids = data["ids"]
+            store.columns = {name: data[name] for name in (*METADATA_FIELDS, "document")}
+        if (path / CODES_FILENAME).exists():
+            # Codes are what every scan reads, so they are loaded fully
+            store.codes = np.load(path / CODES_FILENAME)
+            with np.load(path / QUANTIZER_FILENAME) as data:
+                store.quantizer = ScalarQuantizer.from_arrays(data)
+        store._index_positions()
+        logger.info(f"Loaded numpy embedding index with {store.count()} embeddings from {path}")
+        return store
+
+    @classmethod
+    def from_store(cls, source, persist_dir: str | None = None) -> "NumpyEmbeddingStore":
+        """
+        Copy every embedding, document and metadata row out of another store.
+
+        Args:
+            source: An EmbeddingStore (ChromaDB) instance
+            persist_dir: Directory the copy will save() to
+
+        Returns:
+            Populated store (not yet saved)
+        """
+        results = source.collection.get(include=["embeddings", "documents", "metadatas"])
+        store = cls(persist_dir)
+        if results["ids"]:
+            store.upsert_movies(
+                ids=results["ids"],
+                embeddings=results["embeddings"],
+                documents=results["documents"],
+                metadatas=results["metadatas"],
+            )
+        return store
+
+    def save(self) -> Path:
+        """
+        Write the index to persist_dir.
+
+        Returns:
+            Index directory
+        """
+        path = Path(self.persist_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / VECTORS_FILENAME, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        np.savez(path / COLUMNS_FILENAME, ids=self.ids, **self.columns)
+        if self.quantizer is not None:
+            np.save(path / CODES_FILENAME, self.codes)
+            np.savez(path / QUANTIZER_FILENAME, **self.quantizer.to_arrays())
+        else:
+            (path / CODES_FILENAME).unlink(missing_ok=True)
+        logger.info(f"Saved numpy embedding index ({self.count()} embeddings) to {path}")
+        return path
+
+    def compress(self, pca_dim: int = 0) -> None:
+        """
+        Build int8 codes (optionally PCA-reduced) that scans use instead of float32.
+
+        Args:
+            pca_dim: Principal components to keep (0 = all dimensions)
+        """
+        self.quantizer = ScalarQuantizer.fit(self.vectors, pca_dim)
+        self.codes = self.quantizer.encode(self.vectors)
+        logger.info(
+            f"Compressed {self.count()} embeddings to {self.quantizer.dim}-d int8 "
+            f"({self.codes.nbytes / max(self.vectors.nbytes, 1):.0%} of float32)"
+        )
+
+    def _index_positions(self) -> None:
+        self._positions = {int(movie_id): pos for pos, movie_id in enumerate(self.ids)}
+        self.filter_index = MetadataFilterIndex(self.columns["genres"], self.columns["year"])
+
+    def upsert_movies(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]] | np.ndarray,
+        documents: list[str],
+        metadatas: list[dict[str, Any]]
+    ) -> None:
+        """
+        Insert or replace movie embeddings (in memory; call save() to persist).
+
+        Args:
+            ids: List of movie IDs (as strings)
+            embeddings: Embedding vectors, list or (n, dim) array
+            documents: Text representations used to generate embeddings
+            metadatas: Metadata dicts (title, genres, year)
+        """
+        vectors = _normalize_rows(embeddings)
+        new_ids = np.array([int(movie_id) for movie_id in ids], dtype=np.int64)
+        new_columns = {
+            name: np.array([str(m.get(name, "")) for m in metadatas]) for name in METADATA_FIELDS
+        }
+        new_columns["document"] = np.array(documents)
+
+        if self.count() == 0:
+            keep = np.zeros(0, dtype=np.int64)
+        else:
+            if vectors.shape[1] != self.vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} != index dimension {self.vectors.shape[1]}"
+                )
+            keep = np.flatnonzero(~np.isin(self.ids, new_ids))
+
+        # Rebuild rather than write in place: the loaded matrix may be a read-only mmap
+        self.vectors = np.concatenate([self.vectors[keep], vectors]) if len(keep) else vectors
+        if self.quantizer is not None:
+            # New rows reuse the fitted ranges; call compress() again to refit
+            self.codes = np.concatenate([self.codes[keep], self.quantizer.encode(vectors)])
+        self.ids = np.concatenate([self.ids[keep], new_ids])
+        self.columns = {
+            name: np.concatenate([self.columns[name][keep], values])
+            for name, values in new_columns.items()
+        }
+        self._index_positions()
+        logger.info(f"Upserted {len(ids)} embeddings")
+
+    def top_k(
+        self, query_embeddings: np.ndarray, k: int, filters: SearchFilters | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k by cosine similarity for a batch of queries.
+
+        Exact over float32 rows; with compressed codes, approximate over the
+        codes and then re-ranked exactly over rerank_factor * k candidates.
+        With filters, selective masks score only the allowed rows
+        (prefilter); broad ones scan everything and exclude the rest before
+        selection (postfilter). Either way the top-k are all allowed rows.
+
+        Args:
+            query_embeddings: (dim,) or (n_queries, dim) query vectors
+            k: Results per query
+            filters: Optional metadata constraints
+
+        Returns:
+            (row positions, cosine similarities), both (n_queries, k') with
+            k' = min(k, allowed rows), sorted best first
+        """
+        queries = _normalize_rows(np.atleast_2d(query_embeddings))
+        mask = self.filter_index.mask(filters)
+        allowed = self.count() if mask is None else int(np.count_nonzero(mask))
+        k = min(k, allowed)
+        if k == 0:
+            empty = np.zeros((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+
+        if mask is not None and use_prefilter(mask):
+            rows = np.flatnonzero(mask)
+            top, top_scores = self._scan(queries, k, rows=rows)
+            return rows[top], top_scores
+        return self._scan(queries, k, mask=mask)
+
+    def _scan(
+        self,
+        queries: np.ndarray,
+        k: int,
+        rows: np.ndarray | None = None,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score `rows` (default all) and select the top k, skipping rows outside `mask`."""
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        codes = self.codes if rows is None or self.codes is None else self.codes[rows]
+        if codes is None:
+            # (n, dim) @ (dim, q) streams the catalog matrix once for the whole batch
+            similarity = (vectors @ queries.T).T
+        else:
+            similarity = self.quantizer.scores(codes, queries)
+        if mask is not None:
+            similarity[:, ~mask] = -np.inf
+        if codes is None or not self.rerank_factor:
+            return _select_top_k(similarity, k)
+
+        allowed = len(vectors) if mask is None else int(np.count_nonzero(mask))
+        candidates, _ = _select_top_k(similarity, min(k * self.rerank_factor, allowed))
+        exact = np.einsum("qcd,qd->qc", vectors[candidates], queries)
+        top, top_scores = _select_top_k(exact, k)
+        return np.take_along_axis(candidates, top, axis=1), top_scores
+
+    def _row(self, pos: int, similarity: float) -> dict[str, Any]:
+        return {
+            "id": str(self.ids[pos]),
+            "document": str(self.columns["document"][pos]),
+            "metadata": {name: str(self.columns[name][pos]) for name in METADATA_FIELDS},
+            "distance": float(1.0 - similarity),
+        }
+
+    def query_similar_batch(
+        self,
+        query_embeddings: list[list[float]] | np.ndarray,
+        n_results: int = 10,
+        filters: SearchFilters | None = None
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Query several embeddings in one matrix product.
+
+        Args:
+            query_embeddings: Query embedding vectors
+            n_results: Number of results per query
+            filters: Optional metadata constraints applied to every query
+
+        Returns:
+            One result list per query, formatted like query_similar()
+        """
+        top, scores = self.top_k(np.asarray(query_embeddings, dtype=np.float32), n_results, filters)
+        return [
+            [self._row(pos, score) for pos, score in zip(row, row_scores)]
+            for row, row_scores in zip(top, scores)
+        ]
+
+    def query_similar(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filters: SearchFilters | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Query for similar movies using cosine similarity.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            filters: Optional metadata constraints
+
+        Returns:
+            List of dicts with keys: id, document, metadata, distance
+        """
+        return self.query_similar_batch([query_embedding], n_results, filters)[0]
+
+    def get_by_ids(self, ids: list[str]) -> dict[str, Any]:
+        """
+        Get movies by their IDs (missing IDs are skipped, as in ChromaDB).
+
+        Args:
+            ids: List of movie IDs to retrieve
+
+        Returns:
+            Dict with keys: ids, documents, metadatas, embeddings
+        """
+        positions = [self._positions[int(i)] for i in ids if int(i) in self._positions]
+        return {
+            "ids": [str(self.ids[pos]) for pos in positions],
+            "documents": [str(self.columns["document"][pos]) for pos in positions],
+            "metadatas": [
+                {name: str(self.columns[name][pos]) for name in METADATA_FIELDS} for pos in positions
+            ],
+            "embeddings": np.asarray(self.vectors[positions]),
+        }
+
+    def get_all_embeddings(self) -> tuple[list[int], np.ndarray]:
+        """
+        Get every stored embedding (for in-memory scoring).
+
+        Returns:
+            Tuple of (movie IDs, (n, dim) float32 embedding matrix)
+        """
+        return [int(movie_id) for movie_id in self.ids], np.asarray(self.vectors)
+
+    def get_all_documents(self) -> tuple[list[int], list[str], list[dict[str, Any]]]:
+        """
+        Get every stored text representation with its metadata.
+
+        Returns:
+            Tuple of (movie IDs, documents, metadata dicts)
+        """
+        return (
+            [int(movie_id) for movie_id in self.ids],
+            [str(doc) for doc in self.columns["document"]],
+            [
+                {name: str(self.columns[name][pos]) for name in METADATA_FIELDS}
+                for pos in range(self.count())
+            ],
+        )
+
+    def count(self) -> int:
+        """
+        Get the number of embeddings stored.
+
+        Returns:
+            Number of embeddings
+        """
+        return len(self.ids)
+
+
+def main():
+    """Entry point for exporting the ChromaDB collection to a numpy index."""
+    from ml.embeddings.store import EmbeddingStore
+
+    logging.basicConfig(level=logging.INFO)
+    from config import settings
+
+    store = NumpyEmbeddingStore.from_store(EmbeddingStore())
+    if store.count() == 0:
+        logger.error("ChromaDB collection is empty; run 'python -m ml.embeddings.builder' first")
+        return
+    if settings.embedding_quantization == "int8":
+        store.compress(settings.embedding_pca_dim)
+    store.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,12 @@ import logging
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
+from ml.embeddings.filters import MetadataFilterIndex, SearchFilters, use_prefilter
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +38,9 @@ class EmbeddingStore:
             persist_dir = str(Path(__file__).parent / "chroma_db")
 
         self.persist_dir = persist_dir
+        # Built lazily from stored metadata on the first filtered query
+        self._filter_index: MetadataFilterIndex | None = None
+        self._filter_ids = np.zeros(0, dtype=str)
 
         # Create PersistentClient (recommended for development)
         try:
@@ -64,7 +70,7 @@ class EmbeddingStore:
     def upsert_movies(
         self,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: list[list[float]] | np.ndarray,
         documents: list[str],
         metadatas: list[dict[str, Any]]
     ) -> None:
@@ -75,7 +81,7 @@ class EmbeddingStore:
 
         Args:
             ids: List of movie IDs (as strings)
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors, list or (n, dim) float32 array
             documents: List of text representations used to generate embeddings
             metadatas: List of metadata dicts (title, genres, year)
         """
@@ -87,6 +93,7 @@ class EmbeddingStore:
                 metadatas=metadatas
             )
             logger.info(f"Upserted {len(ids)} embeddings")
+            self._filter_index = None
         except Exception as e:
             logger.error(f"Failed to upsert embeddings: {e}")
             raise
@@ -94,33 +101,43 @@ class EmbeddingStore:
     def query_similar(
         self,
         query_embedding: list[float],
-        n_results: int = 10
+        n_results: int = 10,
+        filters: SearchFilters | None = None
     ) -> list[dict[str, Any]]:
         """
         Query for similar movies using cosine similarity.
 
+        Filters restrict the search to allowed IDs inside ChromaDB when they
+        are selective (prefilter); broad filters over-fetch and drop
+        disallowed hits instead (postfilter), avoiding huge ID lists.
+
         Args:
             query_embedding: Query embedding vector
             n_results: Number of results to return
+            filters: Optional metadata constraints
 
         Returns:
             List of dicts with keys: id, document, metadata, distance
         """
         try:
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results
-            )
-
-            # Flatten results into list of dicts
-            movies = []
-            for i in range(len(results["ids"][0])):
-                movies.append({
-                    "id": results["ids"][0][i],
-                    "document": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i]
-                })
+            mask = self._filter_mask(filters)
+            if mask is None:
+                movies = self._query(query_embedding, n_results)
+            elif not mask.any():
+                movies = []
+            elif use_prefilter(mask):
+                allowed = self._filter_ids[mask].tolist()
+                movies = self._query(query_embedding, min(n_results, len(allowed)), ids=allowed)
+            else:
+                allowed = set(self._filter_ids[mask].tolist())
+                total = len(mask)
+                fetch = min(total, int(n_results * 2 * total / len(allowed)) + 1)
+                while True:
+                    movies = [m for m in self._query(query_embedding, fetch) if m["id"] in allowed]
+                    if len(movies) >= n_results or fetch >= total:
+                        break
+                    fetch = min(total, fetch * 2)
+                movies = movies[:n_results]
 
             logger.info(f"Found {len(movies)} similar movies")
             return movies
@@ -129,6 +146,37 @@ class EmbeddingStore:
             logger.error(f"Failed to query embeddings: {e}")
             raise
 
+    def _query(self, query_embedding: list[float], n_results: int, ids: list[str] | None = None) -> list[dict[str, Any]]:
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            ids=ids
+        )
+
+        # Flatten results into list of dicts
+        movies = []
+        for i in range(len(results["ids"][0])):
+            movies.append({
+                "id": results["ids"][0][i],
+                "document": results["documents"][0][i],
+                "metadata": results["metadatas"][0][i],
+                "distance": results["distances"][0][i]
+            })
+        return movies
+
+    def _filter_mask(self, filters: SearchFilters | None) -> np.ndarray | None:
+        """Allowed-row mask over self._filter_ids, building the filter index on first use."""
+        if filters is None or filters.is_empty():
+            return None
+        if self._filter_index is None:
+            results = self.collection.get(include=["metadatas"])
+            self._filter_ids = np.array(results["ids"])
+            metadatas = results["metadatas"]
+            self._filter_index = MetadataFilterIndex(
+                [m.get("genres", "") for m in metadatas], [m.get("year", "") for m in metadatas]
+            )
+        return self._filter_index.mask(filters)
+
     def get_by_ids(self, ids: list[str]) -> dict[str, Any]:
         """
         Get movies by their IDs.
@@ -147,6 +195,43 @@ class EmbeddingStore:
             logger.error(f"Failed to get movies by ID: {e}")
             raise
 
+    def get_all_embeddings(self) -> tuple[list[int], np.ndarray]:
+        """
+        Get every stored embedding (for in-memory scoring).
+
+        Returns:
+            Tuple of (movie IDs, (n, dim) float32 embedding matrix)
+        """
+        try:
+            results = self.collection.get(include=["embeddings"])
+        except Exception as e:
+            logger.error(f"Failed to get all embeddings: {e}")
+            raise
+        if not results["ids"]:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return (
+            [int(movie_id) for movie_id in results["ids"]],
+            np.asarray(results["embeddings"], dtype=np.float32),
+        )
+
+    def get_all_documents(self) -> tuple[list[int], list[str], list[dict[str, Any]]]:
+        """
+        Get every stored text representation with its metadata.
+
+        Returns:
+            Tuple of (movie IDs, documents, metadata dicts)
+        """
+        try:
+            results = self.collection.get(include=["documents", "metadatas"])
+        except Exception as e:
+            logger.error(f"Failed to get all documents: {e}")
+            raise
+        return (
+            [int(movie_id) for movie_id in results["ids"]],
+            list(results["documents"]),
+            list(results["metadatas"]),
+        )
+
     def count(self) -> int:
         """
         Get the number of embeddings stored in the collection.
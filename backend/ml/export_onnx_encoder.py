@@ -0,0 +1,166 @@
+"""
+Export the semantic search query encoder to int8-quantized ONNX.
+
+Traces all-MiniLM-L6-v2's transformer to ONNX (token embeddings output,
+dynamic batch and sequence axes), applies dynamic int8 weight
+quantization, and saves the fast tokenizer next to it. Pooling and
+normalization stay in services/onnx_encoder.py. Finally checks cosine
+parity against the PyTorch model on sample queries and fails the export
+(removing the int8 model, so serving keeps using PyTorch) when any query
+falls below PARITY_MIN_COSINE.
+
+Requires the export-only packages torch, sentence-transformers and onnx;
+serving only needs onnxruntime and tokenizers.
+
+Usage:
+    python -m ml.export_onnx_encoder
+"""
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+
+from services.onnx_encoder import (
+    CONFIG_FILENAME,
+    ENCODER_DIR,
+    MODEL_FILENAME,
+    OnnxQueryEncoder,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+OPSET = 17
+
+# Lowest acceptable cosine between int8 ONNX and PyTorch query embeddings
+PARITY_MIN_COSINE = 0.98
+
+PARITY_QUERIES = [
+    "dark psychological thriller with a twist ending",
+    "feel-good animated movie about friendship",
+    "space opera with epic battles",
+    "Christopher Nolan",
+    "romantic comedy set in New York",
+    "heist",
+]
+
+
+def export_fp32(model, path: Path) -> None:
+    """Trace the SentenceTransformer's transformer to an fp32 ONNX graph."""
+    import torch
+
+    transformer = model[0].auto_model.eval()
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.auto_model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    dummy = model.tokenizer(["a sample query"], return_tensors="pt")
+    dynamic = {0: "batch", 1: "tokens"}
+    torch.onnx.export(
+        TokenEmbeddings(transformer),
+        (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+        str(path),
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["token_embeddings"],
+        dynamic_axes={
+            "input_ids": dynamic,
+            "attention_mask": dynamic,
+            "token_type_ids": dynamic,
+            "token_embeddings": dynamic,
+        },
+        opset_version=OPSET,
+    )
+
+
+def parity(reference, encoder: OnnxQueryEncoder, queries: list[str]) -> np.ndarray:
+    """Cosine similarity between reference and ONNX embeddings per query."""
+    expected = reference.encode(queries, convert_to_numpy=True, normalize_embeddings=True)
+    actual = encoder.encode(queries)
+    return np.sum(expected * actual, axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    )
+
+
+def check_parity(cosines: np.ndarray, model_path: Path, threshold: float = PARITY_MIN_COSINE) -> None:
+    """
+    Reject an export whose embeddings drift too far from the float model.
+
+    Args:
+        cosines: Per-query cosine from parity()
+        model_path: Exported int8 model, deleted on failure
+        threshold: Minimum cosine every query must reach
+
+    Raises:
+        RuntimeError: If any query is below the threshold
+    """
+    worst = float(cosines.min())
+    if worst < threshold:
+        model_path.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"int8 encoder parity {worst:.4f} is below {threshold}; export discarded"
+        )
+
+
+def main(output_dir: Path = ENCODER_DIR):
+    """Entry point for exporting the ONNX query encoder."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    print("\n" + "=" * 60)
+    print("ONNX Query Encoder Export")
+    print("=" * 60)
+
+    logger.info(f"\nStep 1: Loading {MODEL_NAME}...")
+    model = SentenceTransformer(MODEL_NAME)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info("\nStep 2: Exporting fp32 ONNX graph...")
+    fp32_path = output_dir / "model_fp32.onnx"
+    export_fp32(model, fp32_path)
+
+    logger.info("\nStep 3: Quantizing weights to int8...")
+    int8_path = output_dir / MODEL_FILENAME
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    fp32_path.unlink()
+
+    logger.info("\nStep 4: Saving tokenizer...")
+    model.tokenizer.save_pretrained(str(output_dir))
+    (output_dir / CONFIG_FILENAME).write_text(json.dumps({
+        "model_name": MODEL_NAME,
+        "max_seq_length": model.max_seq_length,
+        "normalize": True,
+    }))
+
+    logger.info("\nStep 5: Checking parity...")
+    encoder = OnnxQueryEncoder.load(output_dir)
+    cosines = parity(model, encoder, PARITY_QUERIES)
+    check_parity(cosines, int8_path)
+    started = time.perf_counter()
+    for query in PARITY_QUERIES:
+        encoder.encode(query)
+    onnx_ms = (time.perf_counter() - started) / len(PARITY_QUERIES) * 1000
+    started = time.perf_counter()
+    for query in PARITY_QUERIES:
+        model.encode(query, convert_to_numpy=True)
+    torch_ms = (time.perf_counter() - started) / len(PARITY_QUERIES) * 1000
+
+    print("\n" + "=" * 60)
+    print("EXPORT COMPLETE")
+    print("=" * 60)
+    print(f"\n✓ Encoder saved to: {output_dir} ({int8_path.stat().st_size / 1024 / 1024:.1f} MB)")
+    print(f"  - cosine vs PyTorch: min {cosines.min():.4f}, mean {cosines.mean():.4f}")
+    print(f"  - query latency: {onnx_ms:.1f} ms (PyTorch {torch_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Nightly recommendation precompute job.
+
+Enumerates active users from the ratings table, scores them in chunks
+across a process pool with RecommenderService (each worker loads the
+models once), and writes every user's ranked top-N with scores, ratings
+fingerprint and model version into ml/models/precomputed_recommendations.npz.
+The API serves from that store while a user's ratings are unchanged and
+falls back to online scoring otherwise.
+
+Usage:
+    python -m ml.precompute_recommendations
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from config import settings
+from ml.embeddings import open_embedding_store
+from services.database import SupabaseDataAccess
+from services.precomputed import STORE_FILENAME, save_store
+from services.recommender import RecommenderService, diversity_seed_for
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent / "models"
+
+# Below this many ratings users get the popularity fallback, which is free to serve
+MIN_RATINGS = 5
+
+_worker_recommender: RecommenderService | None = None
+
+
+def _init_worker(model_dir: str) -> None:
+    """Process pool initializer: load models once per worker process."""
+    global _worker_recommender
+    _worker_recommender = RecommenderService()
+    _worker_recommender.load_model(model_dir)
+    _worker_recommender.load_collaborative_model(model_dir)
+    if settings.embedding_fusion_weight > 0:
+        _worker_recommender.load_embeddings_from_store(
+            open_embedding_store(settings.embedding_backend, settings.embedding_rerank_factor),
+            settings.embedding_fusion_weight,
+        )
+
+
+def _score_chunk(users: list[dict], top_n: int, page_size: int) -> list[dict]:
+    """
+    Score a chunk of users in a worker process.
+
+    Args:
+        users: Dicts with user_id, fingerprint and ratings
+        top_n: Ranked list length per user
+        page_size: First page size (exploration picks are placed within it)
+
+    Returns:
+        Store entries (user_id, fingerprint, total_ratings, strategy, items)
+    """
+    entries = []
+    for user in users:
+        items, strategy = _worker_recommender.hybrid_recommendations(
+            user_id=user["user_id"],
+            ratings=user["ratings"],
+            top_n=top_n,
+            diversity_seed=diversity_seed_for(user["user_id"], user["fingerprint"]),
+            page_size=page_size,
+        )
+        if items:
+            entries.append({
+                "user_id": user["user_id"],
+                "fingerprint": user["fingerprint"],
+                "total_ratings": len(user["ratings"]),
+                "strategy": strategy,
+                "items": [{"movie_id": i["movie_id"], "score": i["score"]} for i in items],
+            })
+    return entries
+
+
+async def fetch_active_users(active_days: int) -> list[dict]:
+    """
+    Group all ratings by user and keep active users.
+
+    A user is active with at least MIN_RATINGS ratings and one rating
+    updated within `active_days`. Each user's fingerprint is built the same
+    way as SupabaseDataAccess.get_ratings_fingerprint ("count:latest
+    updated_at") so the API can tell whether the stored list is fresh.
+
+    Returns:
+        List of {user_id, fingerprint, ratings} dicts
+    """
+    data_access = SupabaseDataAccess()
+    await data_access.connect()
+    ratings_by_user: dict[str, list[dict]] = defaultdict(list)
+    latest_by_user: dict[str, tuple[datetime, str]] = {}
+    try:
+        async for page in data_access.iter_all_ratings(
+            columns="id, user_id, movie_id, rating, updated_at"
+        ):
+            for row in page:
+                user_id = row["user_id"]
+                ratings_by_user[user_id].append(
+                    {"movie_id": row["movie_id"], "rating": row["rating"]}
+                )
+                updated_at = row.get("updated_at") or ""
+                parsed = datetime.fromisoformat(updated_at) if updated_at else datetime.min.replace(tzinfo=timezone.utc)
+                if user_id not in latest_by_user or parsed > latest_by_user[user_id][0]:
+                    latest_by_user[user_id] = (parsed, updated_at)
+    finally:
+        await data_access.close()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=active_days)
+    users = []
+    for user_id, ratings in ratings_by_user.items():
+        latest, latest_raw = latest_by_user[user_id]
+        if len(ratings) >= MIN_RATINGS and latest >= cutoff:
+            users.append({
+                "user_id": user_id,
+                "fingerprint": f"{len(ratings)}:{latest_raw}",
+                "ratings": ratings,
+            })
+    return users
+
+
+def precompute(
+    users: list[dict],
+    model_dir: Path = MODEL_DIR,
+    top_n: int = settings.precompute_top_n,
+    page_size: int = settings.precompute_page_size,
+    chunk_size: int = settings.precompute_chunk_size,
+    workers: int = settings.precompute_workers,
+) -> Path:
+    """
+    Score users in chunks across a process pool and write the store.
+
+    Args:
+        users: Output of fetch_active_users()
+        model_dir: Directory with the model artifacts (the store is written here)
+        top_n: Ranked list length per user
+        page_size: First page size (matches the API's default top_n)
+        chunk_size: Users per process pool task
+        workers: Process pool size
+
+    Returns:
+        Path of the written store
+    """
+    reference = RecommenderService()
+    reference.load_model(str(model_dir))
+    reference.load_collaborative_model(str(model_dir))
+    if settings.embedding_fusion_weight > 0:
+        # Same models as the API, so the stored model_version matches at lookup time
+        reference.load_embeddings_from_store(
+            open_embedding_store(settings.embedding_backend, settings.embedding_rerank_factor),
+            settings.embedding_fusion_weight,
+        )
+    if not reference.is_loaded():
+        raise RuntimeError(f"Content model not found in {model_dir}; run build_model.py first")
+
+    chunks = [users[i:i + chunk_size] for i in range(0, len(users), chunk_size)]
+    entries = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(str(model_dir),)
+    ) as pool:
+        futures = [pool.submit(_score_chunk, chunk, top_n, page_size) for chunk in chunks]
+        for done, future in enumerate(futures, start=1):
+            entries.extend(future.result())
+            logger.info(f"  chunk {done}/{len(chunks)} scored")
+
+    path = model_dir / STORE_FILENAME
+    save_store(path, entries, model_version=reference.model_version, generated_at=time.time())
+    logger.info(
+        f"Precomputed {len(entries)} users in {time.perf_counter() - started:.1f}s "
+        f"-> {path} ({path.stat().st_size / 1024:.1f} KB)"
+    )
+    return path
+
+
+def main():
+    """Entry point for the nightly precompute job."""
+    print("\n" + "=" * 60)
+    print("Precomputed Recommendations Builder")
+    print("=" * 60)
+
+    logger.info("\nStep 1: Loading active users from Supabase...")
+    users = asyncio.run(fetch_active_users(settings.precompute_active_days))
+    logger.info(f"  {len(users)} active users")
+
+    logger.info("\nStep 2: Scoring users...")
+    path = precompute(users)
+
+    print(f"\n✓ Store written to: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,30 @@
+import asyncio
 import random
 from typing import Any, Dict, List
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
+from dependencies import neighbor_index
 from schemas.movie import (
     MovieDetailResponse,
     PaginatedMovieResponse,
+    SimilarMovieResponse,
+    SimilarMoviesResponse,
 )
+from services.metrics import metrics
+from services.neighbors import NEIGHBOR_SOURCES
+from services.response_cache import ResponseCache
 from services.tmdb import TMDBService
 
 router = APIRouter(prefix="/api/movies", tags=["movies"])
 
 tmdb_service = TMDBService()
 
+# Validated + encoded response bytes with ETags for hot browse endpoints
+response_cache = ResponseCache()
+metrics.register_collector("response_cache", response_cache.stats)
+
 FEATURED_MOVIE_IDS = [
     27205,   # Inception
     157336,  # Interstellar
@@ -23,6 +34,13 @@ FEATURED_MOVIE_IDS = [
     872585,  # Oppenheimer
 ]
 
+# Genre rows shown on the browse page (kept warm by the cache warmer)
+BROWSE_GENRE_IDS = [
+    28,   # Action
+    878,  # Science Fiction
+    53,   # Thriller
+]
+
 # Mood to TMDB genre ID mapping (pipe-separated for OR logic)
 MOOD_GENRE_MAP: Dict[str, str] = {
     "adventurous": "28|12",         # Action, Adventure
@@ -48,22 +66,22 @@ MOOD_LABELS: Dict[str, Dict[str, str]] = {
 
 
 @router.get("/featured", response_model=MovieDetailResponse)
-async def get_featured_movie():
+async def get_featured_movie(request: Request):
     """Get a curated featured movie for the homepage hero section."""
     movie_id = random.choice(FEATURED_MOVIE_IDS)
     try:
         data = await tmdb_service.get_movie_details(movie_id=movie_id)
-        return data
+        return response_cache.respond(request, f"movie:{movie_id}", data, MovieDetailResponse)
     except httpx.HTTPStatusError:
         raise HTTPException(status_code=502, detail="Failed to fetch featured movie from TMDB")
 
 
 @router.get("", response_model=PaginatedMovieResponse)
-async def get_popular_movies(page: int = Query(1, ge=1, le=500)):
+async def get_popular_movies(request: Request, page: int = Query(1, ge=1, le=500)):
     """Get popular movies from TMDB with pagination."""
     try:
         data = await tmdb_service.get_popular(page=page)
-        return data
+        return response_cache.respond(request, f"popular:{page}", data, PaginatedMovieResponse)
     except httpx.HTTPStatusError:
         raise HTTPException(status_code=502, detail="Failed to fetch movies from TMDB")
 
@@ -83,13 +101,16 @@ async def search_movies(
 
 @router.get("/genre/{genre_id}", response_model=PaginatedMovieResponse)
 async def get_movies_by_genre(
+    request: Request,
     genre_id: int,
     page: int = Query(1, ge=1, le=500),
 ):
     """Get movies by genre from TMDB discover endpoint."""
     try:
         data = await tmdb_service.discover_by_genre(genre_id=genre_id, page=page)
-        return data
+        return response_cache.respond(
+            request, f"genre:{genre_id}:{page}", data, PaginatedMovieResponse
+        )
     except httpx.HTTPStatusError:
         raise HTTPException(status_code=502, detail="Failed to fetch movies by genre from TMDB")
 
@@ -105,6 +126,7 @@ async def get_available_moods():
 
 @router.get("/mood/{mood}", response_model=PaginatedMovieResponse)
 async def get_movies_by_mood(
+    request: Request,
     mood: str,
     page: int = Query(1, ge=1, le=500),
 ):
@@ -117,17 +139,55 @@ async def get_movies_by_mood(
     genre_ids = MOOD_GENRE_MAP[mood]
     try:
         data = await tmdb_service.discover_by_genres(genre_ids=genre_ids, page=page)
-        return data
+        return response_cache.respond(request, f"mood:{mood}:{page}", data, PaginatedMovieResponse)
     except httpx.HTTPStatusError:
         raise HTTPException(status_code=502, detail="Failed to fetch mood movies from TMDB")
 
 
+@router.get("/{movie_id}/similar", response_model=SimilarMoviesResponse)
+async def get_similar_movies(
+    movie_id: int,
+    source: str = Query("blended"),
+    limit: int = Query(10, ge=1, le=20),
+):
+    """Get "more like this" movies from the precomputed neighbor tables."""
+    if source not in NEIGHBOR_SOURCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown source '{source}'. Available sources: {list(NEIGHBOR_SOURCES)}"
+        )
+    if not neighbor_index.is_loaded():
+        raise HTTPException(status_code=503, detail="Similar movies are not available")
+    neighbors = neighbor_index.similar(movie_id, source=source, k=limit)
+    if neighbors is None:
+        raise HTTPException(status_code=404, detail="No similar movies for this movie")
+
+    summaries = await asyncio.gather(
+        *(tmdb_service.get_movie_summary(n["movie_id"]) for n in neighbors),
+        return_exceptions=True,
+    )
+    results = []
+    for neighbor, movie_data in zip(neighbors, summaries):
+        if isinstance(movie_data, Exception):
+            print(f"Error fetching movie {neighbor['movie_id']}: {movie_data}")
+            continue
+        results.append(SimilarMovieResponse(
+            id=movie_data["id"],
+            title=movie_data.get("title", ""),
+            poster_path=movie_data.get("poster_path"),
+            release_date=movie_data.get("release_date", ""),
+            vote_average=movie_data.get("vote_average", 0.0),
+            score=neighbor["score"],
+        ))
+    return SimilarMoviesResponse(movie_id=movie_id, source=source, results=results)
+
+
 @router.get("/{movie_id}", response_model=MovieDetailResponse)
-async def get_movie_detail(movie_id: int):
+async def get_movie_detail(request: Request, movie_id: int):
     """Get detailed information about a specific movie."""
     try:
         data = await tmdb_service.get_movie_details(movie_id=movie_id)
-        return data
+        return response_cache.respond(request, f"movie:{movie_id}", data, MovieDetailResponse)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Movie not found")
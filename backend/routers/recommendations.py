@@ -5,16 +5,55 @@ Provides personalized movie recommendations based on user ratings using
 content-based filtering (TF-IDF + cosine similarity).
 """
 import asyncio
-from fastapi import APIRouter, HTTPException, Header, Query
-from supabase import create_client
+import base64
+import binascii
+import hashlib
+import json
+import secrets
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from config import settings
 from services.tmdb import TMDBService
-from schemas.recommendation import RecommendationResponse, RecommendationListResponse, ExplanationResponse
-from dependencies import recommender_service, explanation_service
+from schemas.recommendation import (
+    RecommendationResponse,
+    RecommendationListResponse,
+    RecommendationRow,
+    RecommendationRowsResponse,
+    ExplanationResponse,
+)
+from dependencies import (
+    recommender_service,
+    explanation_service,
+    detail_prefetcher,
+    token_verifier,
+    data_access,
+    executor_pool,
+    recommendation_cache,
+    precomputed_recommendations,
+    cold_start_clusters,
+)
+from services.auth import TokenVerificationError
+from services.deadline import Deadline, DeadlineExceeded
+from services.executors import ExecutorSaturatedError
+from services.metrics import metrics
+from services.recommender import TMDB_GENRE_TERMS, diversity_seed_for
+from services.response_cache import etag_matches
+from routers.movies import BROWSE_GENRE_IDS, MOOD_GENRE_MAP, MOOD_LABELS
 
 router = APIRouter(prefix="/api/recommendations", tags=["recommendations"])
 
 
+def prefetch_top_details(movie_ids: list[int]) -> None:
+    """
+    Queue background detail-page prefetches for the top recommendations.
+
+    Users usually click one of the first few items; warming their full
+    details payload makes the click-through a cache hit.
+    """
+    if settings.prefetch_enabled:
+        detail_prefetcher.enqueue(movie_ids[:settings.prefetch_top_k])
+
+
 async def get_current_user_id(authorization: str = Header(None)) -> str:
     """
     Extract and validate user ID from JWT token.
@@ -38,48 +77,135 @@ async def get_current_user_id(authorization: str = Header(None)) -> str:
 
     token = parts[1]
 
-    # Validate token using Supabase admin client
+    # Verify locally (JWT secret / JWKS) with a short-lived cache; Supabase Auth
+    # API is only called when no local key material is available
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
-        user_response = supabase.auth.get_user(token)
+        return await token_verifier.verify(token)
+    except TokenVerificationError as e:
+        raise HTTPException(status_code=401, detail=f"Token validation failed: {str(e)}")
 
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-        return user_response.user.id
+def recommendations_etag(
+    user_id: str,
+    ratings_fingerprint: str,
+    top_n: int,
+    diversity_seed: int,
+    source: str = "online",
+) -> str:
+    """
+    Strong ETag over everything that determines the recommendation list.
 
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Token validation failed: {str(e)}")
+    source distinguishes online scoring from a precomputed store version,
+    whose lists may place exploration picks for a different page size.
+    """
+    key = (
+        f"{user_id}:{ratings_fingerprint}:{top_n}:"
+        f"{recommender_service.model_version}:{diversity_seed}:{source}"
+    )
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
 
 
-@router.get("/", response_model=RecommendationListResponse)
-async def get_recommendations(
-    authorization: str = Header(None),
-    top_n: int = Query(10, ge=1, le=50, description="Number of recommendations to return")
-):
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    """Encode an opaque page cursor into a ranked-list snapshot."""
+    return base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
     """
-    Get personalized movie recommendations.
+    Decode a page cursor.
 
-    Users with 5+ ratings receive content-based recommendations.
-    Users with < 5 ratings receive popularity fallback.
+    Returns:
+        Tuple of (snapshot_id, offset)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        snapshot_id, offset = raw.rsplit(":", 1)
+        return snapshot_id, int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def fallback_ranking(user_id: str, top_n: int, total_ratings: int) -> tuple[list[dict], str, int, str]:
+    """
+    Last two degradation steps: the user's last good ranked list (or, failing
+    that, their stale nightly precomputed list), else the precomputed popular
+    list (no network or scoring needed).
+
+    Returns:
+        Tuple of (ranked items, strategy, total_ratings, degradation)
+    """
+    snapshot = await recommendation_cache.get(f"last:{user_id}")
+    if snapshot is not None:
+        return (
+            snapshot["items"][:top_n],
+            snapshot["strategy"],
+            snapshot["total_ratings"],
+            "cached",
+        )
+    precomputed = precomputed_recommendations.lookup_stale(user_id)
+    if precomputed is not None:
+        return (
+            precomputed["items"][:top_n],
+            precomputed["strategy"],
+            precomputed["total_ratings"],
+            "cached",
+        )
+    items = [
+        {"movie_id": movie_id, "score": 0.0, "reason": "popular"}
+        for movie_id in recommender_service.get_popular_fallback(top_n)
+    ]
+    return items, "popularity_fallback", total_ratings, "popular"
+
+
+async def rank_for_user(
+    user_id: str,
+    top_n: int,
+    diversity_seed: int | None = None,
+    page_size: int | None = None,
+    deadline: Deadline | None = None,
+) -> tuple[list[dict], str, int, str]:
+    """
+    Rank recommendations for a user without hydrating them.
+
+    Users with 5+ ratings receive hybrid (or content-based) recommendations.
+    Users with 1-4 ratings receive their nearest taste cluster's list when
+    cold-start clusters are loaded; otherwise (and with no ratings) they
+    receive popularity fallback.
+
+    With a deadline, each stage runs within the remaining budget (keeping
+    settings.recommendation_hydration_reserve_seconds for hydration) and
+    steps down hybrid -> content-only -> cached list -> popular when a
+    stage runs out of time or its data source fails.
 
     Args:
-        authorization: Bearer token
-        top_n: Number of recommendations (1-50)
+        user_id: Authenticated user ID
+        top_n: Number of recommendations
+        diversity_seed: Seed for hybrid exploration picks (None = random)
+        page_size: First page size when ranking a long list for pagination
+            (exploration picks stay on the first page; default top_n)
+        deadline: Request deadline (None = unbounded)
 
     Returns:
-        RecommendationListResponse with recommendations, strategy, and rating count
+        Tuple of (ranked items, strategy, total_ratings, degradation). Each
+        item has movie_id, score and reason; popular items from TMDB also
+        carry the already-fetched "movie" payload. degradation is one of
+        DEGRADATION_STEPS.
+
+    Raises:
+        HTTPException: 503 if even the fallback scoring pool is saturated
     """
-    # Authenticate user
-    user_id = await get_current_user_id(authorization)
+    deadline = deadline or Deadline(None)
+    reserve = settings.recommendation_hydration_reserve_seconds
 
     # Graceful degradation (ML-02, ML-04): if the recommender model is not loaded,
     # return TMDB popular movies instead of 503. User has no recs context at this
     # point (we have not queried Supabase yet), so total_ratings = 0.
     if not recommender_service.is_loaded():
-        tmdb_service = TMDBService()
         try:
-            popular_payload = await tmdb_service.get_popular(page=1)
+            popular_payload = await deadline.run(TMDBService().get_popular(page=1), reserve)
             popular_results = popular_payload.get("results", [])[:top_n]
         except Exception as e:
             # Even TMDB failed — return empty list rather than 500 so the frontend
@@ -87,122 +213,468 @@ async def get_recommendations(
             print(f"TMDB popular fetch failed during fallback: {e}")
             popular_results = []
 
-        recommendations_list = [
-            RecommendationResponse(
-                movie_id=m["id"],
-                title=m.get("title", ""),
-                poster_path=m.get("poster_path"),
-                overview=m.get("overview", ""),
-                vote_average=m.get("vote_average", 0.0),
-                release_date=m.get("release_date", ""),
-                score=0.0,
-                reason="popular",
-            )
+        items = [
+            {"movie_id": m["id"], "score": 0.0, "reason": "popular", "movie": m}
             for m in popular_results
             if "id" in m
         ]
-
-        return RecommendationListResponse(
-            recommendations=recommendations_list,
-            strategy="popularity_fallback",
-            total_ratings=0,
-        )
+        return items, "popularity_fallback", 0, "none"
 
     # Get user's ratings from Supabase
     try:
-        supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
-        response = supabase.table("ratings").select("movie_id, rating").eq("user_id", user_id).execute()
-        ratings = response.data if response.data else []
+        ratings = await deadline.run(data_access.get_ratings(user_id), reserve)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch user ratings: {str(e)}")
+        print(f"Ratings fetch failed, degrading: {e!r}")
+        return await fallback_ranking(user_id, top_n, 0)
 
     total_ratings = len(ratings)
-    tmdb_service = TMDBService()
 
-    # Strategy 1: Cold-start fallback (< 5 ratings)
+    # Strategy 1: Cold start (< 5 ratings): nearest taste cluster, else popular
     if total_ratings < 5:
-        # Get popular movies as fallback
-        popular_movie_ids = recommender_service.get_popular_fallback(top_n)
-
-        # Fetch movie details from TMDB concurrently
-        async def fetch_movie_for_popular(movie_id: int) -> RecommendationResponse | None:
-            try:
-                movie_data = await tmdb_service.get_movie_details(movie_id)
-                return RecommendationResponse(
-                    movie_id=movie_data["id"],
-                    title=movie_data.get("title", ""),
-                    poster_path=movie_data.get("poster_path"),
-                    overview=movie_data.get("overview", ""),
-                    vote_average=movie_data.get("vote_average", 0.0),
-                    release_date=movie_data.get("release_date", ""),
-                    score=0.0,  # No similarity score for popular fallback
-                    reason="popular"
-                )
-            except Exception as e:
-                print(f"Error fetching movie {movie_id}: {e}")
-                return None
-
-        # Fetch in batches to respect rate limits
-        recommendations_list = []
-        for movie_id in popular_movie_ids:
-            rec = await fetch_movie_for_popular(movie_id)
-            if rec:
-                recommendations_list.append(rec)
-            await asyncio.sleep(0.03)  # Small delay between requests
-
-        return RecommendationListResponse(
-            recommendations=recommendations_list,
-            strategy="popularity_fallback",
-            total_ratings=total_ratings
-        )
+        items = cold_start_clusters.recommend(recommender_service, ratings, top_n) if ratings else None
+        if items:
+            return items, "cold_start_cluster", total_ratings, "none"
+        # No similarity score for popular fallback
+        items = [
+            {"movie_id": movie_id, "score": 0.0, "reason": "popular"}
+            for movie_id in recommender_service.get_popular_fallback(top_n)
+        ]
+        return items, "popularity_fallback", total_ratings, "none"
 
     # Strategy 2: Hybrid recommendations (5+ ratings)
-    # Get recommendations from hybrid recommender service
-    recommended_items, strategy = recommender_service.hybrid_recommendations(
-        user_id=user_id,
-        ratings=ratings,
-        top_n=top_n
-    )
-
-    # Fallback to content-based if hybrid returns empty
+    # Scoring runs off the event loop (thread or process pool)
+    degradation = "none"
+    try:
+        recommended_items, strategy = await deadline.run(
+            executor_pool.hybrid_recommendations(
+                recommender_service,
+                user_id=user_id,
+                ratings=ratings,
+                top_n=top_n,
+                diversity_seed=diversity_seed,
+                page_size=page_size,
+            ),
+            reserve,
+            limit=settings.recommendation_hybrid_timeout_seconds,
+        )
+    except (DeadlineExceeded, ExecutorSaturatedError) as e:
+        # Out of time, or the scoring pool is full: step down instead of
+        # queueing more hybrid work behind the jobs that are already late
+        print(f"Hybrid scoring skipped, degrading to content-only: {e!r}")
+        recommended_items, strategy = [], "content_based"
+        degradation = "content_only"
+
+    # Fallback to content-based if hybrid returns empty or was skipped. It runs
+    # on the reserved fallback pool, independent of the saturated scoring pool
     if not recommended_items:
-        recommended_items = recommender_service.get_recommendations(ratings, top_n)
+        try:
+            recommended_items = await deadline.run(
+                executor_pool.run_fallback(recommender_service.get_recommendations, ratings, top_n),
+                reserve,
+            )
+        except ExecutorSaturatedError:
+            raise HTTPException(
+                status_code=503,
+                detail="Recommendation scoring is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        except DeadlineExceeded:
+            return await fallback_ranking(user_id, top_n, total_ratings)
         strategy = "content_based"
 
-    # Fetch movie details from TMDB concurrently
-    async def fetch_movie_for_recommendation(item: dict) -> RecommendationResponse | None:
+    items = [{**item, "reason": strategy} for item in recommended_items]
+    return items, strategy, total_ratings, degradation
+
+
+async def hydrate_item(item: dict) -> RecommendationResponse | None:
+    """
+    Build a RecommendationResponse for a ranked item.
+
+    Uses the item's "movie" payload when present, otherwise fetches the
+    movie summary from TMDB (cached and paced by the shared rate budget).
+
+    Returns:
+        RecommendationResponse, or None if TMDB lookup failed
+    """
+    try:
+        movie_data = item.get("movie") or await TMDBService().get_movie_summary(item["movie_id"])
+        return RecommendationResponse(
+            movie_id=movie_data["id"],
+            title=movie_data.get("title", ""),
+            poster_path=movie_data.get("poster_path"),
+            overview=movie_data.get("overview", ""),
+            vote_average=movie_data.get("vote_average", 0.0),
+            release_date=movie_data.get("release_date", ""),
+            score=item["score"],
+            reason=item["reason"]
+        )
+    except Exception as e:
+        print(f"Error fetching movie {item['movie_id']}: {e}")
+        return None
+
+
+async def hydrate_within(items: list[dict], deadline: Deadline) -> list[RecommendationResponse]:
+    """
+    Hydrate items concurrently, dropping those not ready by the deadline.
+
+    Returns:
+        Hydrated recommendations in ranked order
+    """
+    if not items:
+        return []
+    tasks = [asyncio.create_task(hydrate_item(item)) for item in items]
+    done, pending = await asyncio.wait(tasks, timeout=deadline.timeout())
+    for task in pending:
+        task.cancel()
+    if pending:
+        metrics.inc("recommendation_hydration_dropped_total", len(pending))
+    return [task.result() for task in tasks if task in done and task.result()]
+
+
+@router.get("/", response_model=RecommendationListResponse)
+async def get_recommendations(
+    request: Request,
+    response: Response,
+    authorization: str = Header(None),
+    top_n: int = Query(10, ge=1, le=50, description="Number of recommendations to return"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Get personalized movie recommendations.
+
+    Users with 5+ ratings receive content-based recommendations.
+    Users with < 5 ratings receive their taste cluster's list or popularity fallback.
+
+    Pagination: the first page ranks a long list once
+    (settings.recommendation_snapshot_size) and stores the ordered items
+    in the recommendation cache; next_cursor points into that snapshot,
+    so later pages are sliced from it and only the page is hydrated.
+
+    Supports conditional GET on the first page: the ETag is derived from
+    the user's ratings fingerprint, top_n, the model version and the
+    diversity seed, and a matching If-None-Match is answered with 304
+    before scoring or hydration.
+
+    Runs under a settings.recommendation_deadline_seconds budget; the
+    response's degradation field (and recommendation_degradations_total)
+    records which fallback was taken when a stage ran out of time.
+    Degraded responses carry no ETag and are not snapshotted.
+
+    Args:
+        authorization: Bearer token
+        top_n: Number of recommendations per page (1-50)
+        cursor: Opaque cursor from a previous response (omit for page one)
+
+    Returns:
+        RecommendationListResponse with recommendations, strategy, rating
+        count, degradation and next_cursor
+
+    Raises:
+        HTTPException: 400 for a malformed cursor, 410 if its snapshot expired
+    """
+    deadline = Deadline(settings.recommendation_deadline_seconds)
+
+    # Authenticate user
+    user_id = await get_current_user_id(authorization)
+
+    if cursor is not None:
+        snapshot_id, offset = decode_cursor(cursor)
+        snapshot = await recommendation_cache.get(snapshot_id)
+        if snapshot is None or snapshot["user_id"] != user_id:
+            raise HTTPException(
+                status_code=410, detail="Cursor expired, request the first page again"
+            )
+        return await build_page(snapshot_id, snapshot, offset, top_n, deadline)
+
+    # Cheap one-row fingerprint lookup decides whether anything could have changed
+    etag = None
+    diversity_seed = None
+    precomputed = None
+    if recommender_service.is_loaded():
         try:
-            movie_id = item["movie_id"]
-            score = item["score"]
-
-            movie_data = await tmdb_service.get_movie_details(movie_id)
-            return RecommendationResponse(
-                movie_id=movie_data["id"],
-                title=movie_data.get("title", ""),
-                poster_path=movie_data.get("poster_path"),
-                overview=movie_data.get("overview", ""),
-                vote_average=movie_data.get("vote_average", 0.0),
-                release_date=movie_data.get("release_date", ""),
-                score=score,
-                reason=strategy
+            fingerprint = await deadline.run(
+                data_access.get_ratings_fingerprint(user_id),
+                settings.recommendation_hydration_reserve_seconds,
+            )
+            diversity_seed = diversity_seed_for(user_id, fingerprint)
+            # Fresh nightly list (same ratings, same models) replaces online scoring
+            precomputed = precomputed_recommendations.lookup(
+                user_id, fingerprint, recommender_service.model_version
+            )
+            source = (
+                f"precomputed:{precomputed_recommendations.generated_at}"
+                if precomputed is not None else "online"
             )
+            etag = recommendations_etag(user_id, fingerprint, top_n, diversity_seed, source)
         except Exception as e:
-            print(f"Error fetching movie {item['movie_id']}: {e}")
-            return None
+            print(f"Ratings fingerprint lookup failed, serving without ETag: {e!r}")
+
+    if etag is not None and etag_matches(request, etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+        )
+
+    # Snapshot IDs follow the ETag, so a still-cached snapshot for unchanged
+    # ratings is reused instead of re-scored
+    snapshot_id = etag.strip('"') if etag is not None else secrets.token_urlsafe(16)
+    snapshot = await recommendation_cache.get(snapshot_id) if etag is not None else None
+    if snapshot is None and precomputed is not None:
+        snapshot = {"user_id": user_id, **precomputed, "degradation": "none"}
+        await recommendation_cache.set(f"last:{user_id}", snapshot)
+        if len(snapshot["items"]) > top_n:
+            await recommendation_cache.set(snapshot_id, snapshot)
+    elif snapshot is None:
+        items, strategy, total_ratings, degradation = await rank_for_user(
+            user_id,
+            settings.recommendation_snapshot_size,
+            diversity_seed,
+            page_size=top_n,
+            deadline=deadline,
+        )
+        snapshot = {
+            "user_id": user_id,
+            "items": items,
+            "strategy": strategy,
+            "total_ratings": total_ratings,
+            "degradation": degradation,
+        }
+        if degradation == "none" and items:
+            await recommendation_cache.set(f"last:{user_id}", snapshot)
+            if len(items) > top_n:
+                await recommendation_cache.set(snapshot_id, snapshot)
+        else:
+            metrics.inc("recommendation_degradations_total", step=degradation)
+
+    if etag is not None and snapshot["degradation"] == "none":
+        response.headers.update({"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    prefetch_top_details([item["movie_id"] for item in snapshot["items"][:top_n]])
+    page = await build_page(snapshot_id, snapshot, 0, top_n, deadline)
+    metrics.observe("recommendation_request_seconds", deadline.elapsed())
+    return page
+
+
+async def build_page(
+    snapshot_id: str,
+    snapshot: dict,
+    offset: int,
+    top_n: int,
+    deadline: Deadline,
+) -> RecommendationListResponse:
+    """Hydrate one page of a ranked snapshot and link the next page."""
+    page_items = snapshot["items"][offset:offset + top_n]
+    next_offset = offset + top_n
+    # Two-tier lookup: with several workers the snapshot may live only in the
+    # shared tier (a later cursor page can land on any worker)
+    next_cursor = (
+        encode_cursor(snapshot_id, next_offset)
+        if next_offset < len(snapshot["items"])
+        and await recommendation_cache.get(snapshot_id) is not None
+        else None
+    )
 
-    # Fetch movie details with rate limiting
-    recommendations_list = []
-    for item in recommended_items:
-        rec = await fetch_movie_for_recommendation(item)
-        if rec:
-            recommendations_list.append(rec)
-        await asyncio.sleep(0.03)  # Small delay between requests
+    # Fetch movie details from TMDB concurrently (paced by the TMDB rate budget),
+    # dropping any that miss the request deadline
+    recommendations_list = await hydrate_within(page_items, deadline)
 
     return RecommendationListResponse(
         recommendations=recommendations_list,
-        strategy=strategy,
-        total_ratings=total_ratings
+        strategy=snapshot["strategy"],
+        total_ratings=snapshot["total_ratings"],
+        degradation=snapshot["degradation"],
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_frame(frame: dict, stream_format: str) -> str:
+    payload = json.dumps(frame)
+    if stream_format == "sse":
+        return f"event: {frame['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+@router.get("/stream")
+async def stream_recommendations(
+    authorization: str = Header(None),
+    top_n: int = Query(10, ge=1, le=50, description="Number of recommendations to return"),
+    stream_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson or sse framing"
+    ),
+):
+    """
+    Stream personalized recommendations with progressive hydration.
+
+    Frames (one JSON object per NDJSON line or SSE event):
+    1. {"type": "ranked", "strategy", "items": [{movie_id, score}]} as soon
+       as scoring finishes
+    2. {"type": "item", "rank", "recommendation": RecommendationResponse}
+       for each movie as its TMDB hydration completes (in completion order)
+    3. {"type": "meta", "strategy", "total_ratings", "count"} once all
+       items have been sent
+
+    Args:
+        authorization: Bearer token
+        top_n: Number of recommendations (1-50)
+        format: "ndjson" (application/x-ndjson) or "sse" (text/event-stream)
+    """
+    # Auth and scoring errors surface as normal HTTP errors before streaming starts
+    user_id = await get_current_user_id(authorization)
+    items, strategy, total_ratings, _ = await rank_for_user(user_id, top_n)
+    prefetch_top_details([item["movie_id"] for item in items])
+
+    async def hydrate_ranked(rank: int, item: dict) -> tuple[int, RecommendationResponse | None]:
+        return rank, await hydrate_item(item)
+
+    async def frames():
+        yield _encode_frame({
+            "type": "ranked",
+            "strategy": strategy,
+            "items": [{"movie_id": i["movie_id"], "score": i["score"]} for i in items],
+        }, stream_format)
+
+        tasks = [asyncio.create_task(hydrate_ranked(rank, item)) for rank, item in enumerate(items)]
+        sent = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                rank, rec = await next_done
+                if rec:
+                    sent += 1
+                    yield _encode_frame({
+                        "type": "item",
+                        "rank": rank,
+                        "recommendation": rec.model_dump(),
+                    }, stream_format)
+        finally:
+            # Client disconnected mid-stream: stop outstanding TMDB lookups
+            for task in tasks:
+                task.cancel()
+
+        yield _encode_frame({
+            "type": "meta",
+            "strategy": strategy,
+            "total_ratings": total_ratings,
+            "count": sent,
+        }, stream_format)
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(frames(), media_type=media_type)
+
+
+@router.get("/rows", response_model=RecommendationRowsResponse)
+async def get_recommendation_rows(
+    authorization: str = Header(None),
+    per_row: int = Query(10, ge=1, le=20, description="Movies per row"),
+    seeds: int = Query(2, ge=0, le=5, description="Max 'Because you liked' rows"),
+):
+    """
+    Get every personalized home-page row in one call.
+
+    Authenticates and fetches ratings once, scores "Recommended for you",
+    "Because you liked X", mood and genre rows in a single vectorized pass
+    (see RecommenderService.compute_rows), then hydrates the deduplicated
+    union of movies once.
+
+    Args:
+        authorization: Bearer token
+        per_row: Movies per row (1-20)
+        seeds: Max number of "Because you liked" rows (0-5)
+
+    Returns:
+        RecommendationRowsResponse with rows in display order
+    """
+    user_id = await get_current_user_id(authorization)
+
+    if not recommender_service.is_loaded():
+        items, strategy, total_ratings, _ = await rank_for_user(user_id, per_row)
+        hydrated = await asyncio.gather(*(hydrate_item(item) for item in items))
+        rows = [RecommendationRow(
+            id="for_you",
+            kind="for_you",
+            title="Recommended for you",
+            recommendations=[rec for rec in hydrated if rec],
+        )]
+        return RecommendationRowsResponse(rows=rows, strategy=strategy, total_ratings=total_ratings)
+
+    try:
+        ratings = await data_access.get_ratings(user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch user ratings: {str(e)}")
+
+    masked_rows = [
+        {"id": f"mood:{mood}", "kind": "mood", "genre_ids": [int(g) for g in genres.split("|")]}
+        for mood, genres in MOOD_GENRE_MAP.items()
+    ] + [
+        {"id": f"genre:{genre_id}", "kind": "genre", "genre_ids": [genre_id]}
+        for genre_id in BROWSE_GENRE_IDS
+    ]
+
+    try:
+        scored_rows, strategy = await executor_pool.run_cpu(
+            recommender_service.compute_rows,
+            user_id=user_id,
+            ratings=ratings,
+            masked_rows=masked_rows,
+            per_row=per_row,
+            num_seeds=seeds,
+        )
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Recommendation scoring is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    row_reasons = {"for_you": strategy, "because_you_liked": "content_based"}
+    items = [
+        {**item, "reason": row_reasons.get(row["kind"], strategy)}
+        for row in scored_rows for item in row["items"]
+    ]
+    if scored_rows:
+        prefetch_top_details([item["movie_id"] for item in scored_rows[0]["items"]])
+
+    async def seed_title(movie_id: int) -> str:
+        try:
+            return (await TMDBService().get_movie_summary(movie_id)).get("title", "")
+        except Exception:
+            return ""
+
+    # Hydrate the deduplicated union once, alongside the seed movies' titles
+    seed_ids = [row["seed_movie_id"] for row in scored_rows if row["seed_movie_id"] is not None]
+    results = await asyncio.gather(
+        *(hydrate_item(item) for item in items),
+        *(seed_title(movie_id) for movie_id in seed_ids),
     )
+    hydrated = {
+        rec.movie_id: rec for rec in results[:len(items)] if rec
+    }
+    seed_titles = dict(zip(seed_ids, results[len(items):]))
+
+    def row_title(row: dict) -> str:
+        kind, _, key = row["id"].partition(":")
+        if kind == "because":
+            title = seed_titles.get(row["seed_movie_id"])
+            return f"Because you liked {title}" if title else "Because you liked this"
+        if kind == "mood":
+            return MOOD_LABELS[key]["label"]
+        if kind == "genre":
+            return TMDB_GENRE_TERMS[int(key)].title()
+        return "Recommended for you"
+
+    rows = []
+    for row in scored_rows:
+        recommendations = [
+            hydrated[item["movie_id"]] for item in row["items"] if item["movie_id"] in hydrated
+        ]
+        if recommendations:
+            rows.append(RecommendationRow(
+                id=row["id"],
+                kind=row["kind"],
+                title=row_title(row),
+                seed_movie_id=row["seed_movie_id"],
+                recommendations=recommendations,
+            ))
+
+    return RecommendationRowsResponse(rows=rows, strategy=strategy, total_ratings=len(ratings))
 
 
 @router.get("/{movie_id}/explain", response_model=ExplanationResponse)
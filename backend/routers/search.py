@@ -1,11 +1,14 @@
 """
 Search API endpoints for natural language movie search.
 
-Provides semantic search endpoint using ChromaDB vector search.
+Provides semantic search endpoint using vector search fused with BM25
+lexical matches.
 """
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel, Field
-from dependencies import get_semantic_search_service
+from dependencies import get_semantic_search_service, get_executor_pool
+from ml.embeddings.filters import SearchFilters
+from services.executors import ExecutorSaturatedError
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
@@ -17,6 +20,7 @@ class SemanticSearchResult(BaseModel):
     year: str
     genres: str
     score: float = Field(..., description="Similarity score (0-1, higher is better)")
+    match: str = Field("semantic", description="Which ranking found it: semantic, lexical or both")
 
 
 class SemanticSearchResponse(BaseModel):
@@ -28,7 +32,10 @@ class SemanticSearchResponse(BaseModel):
 @router.get("/semantic", response_model=SemanticSearchResponse)
 async def search_semantic(
     q: str = Query(..., min_length=2, description="Natural language search query"),
-    top_n: int = Query(10, ge=1, le=30, description="Number of results to return")
+    top_n: int = Query(10, ge=1, le=30, description="Number of results to return"),
+    year_min: int | None = Query(None, ge=1870, le=2100, description="Earliest release year (inclusive)"),
+    year_max: int | None = Query(None, ge=1870, le=2100, description="Latest release year (inclusive)"),
+    genres: str | None = Query(None, description="Comma-separated genres; matches any of them"),
 ):
     """
     Search for movies using natural language queries.
@@ -39,26 +46,46 @@ async def search_semantic(
     - "dark thriller like Zodiac"
     - "romantic comedy set in new york"
     - "sci-fi adventure with space travel"
+    - "heist" with genres=Crime,Thriller&year_min=1990
 
-    Returns movies ranked by semantic similarity to the query.
+    Filters apply inside the search, so all top_n results satisfy them.
+
+    Returns movies ranked by semantic similarity to the query, fused with
+    keyword (title, cast, director) matches when the lexical index is built.
     """
+    if year_min is not None and year_max is not None and year_min > year_max:
+        raise HTTPException(status_code=400, detail="year_min must be <= year_max")
+    filters = SearchFilters(
+        year_min=year_min,
+        year_max=year_max,
+        genres=genres.split(",") if genres else None,
+    )
+
     try:
         # Get semantic search service
         search_service = get_semantic_search_service()
 
-        # Perform semantic search
-        results = search_service.search(query=q, top_n=top_n)
+        # Perform semantic search (micro-batched query encoding + vector query off the event loop)
+        results = await search_service.search_async(
+            q, top_n, run_cpu=get_executor_pool().run_cpu, filters=filters
+        )
 
         # Convert distance to similarity score (1 - distance)
         # ChromaDB cosine distance is in [0, 2] range
         # Score of 1.0 = perfect match, 0.0 = opposite
+        # Lexical-only hits have no distance; use their normalized BM25 score
         search_results = [
             SemanticSearchResult(
                 movie_id=r["movie_id"],
                 title=r["title"],
                 year=r["year"],
                 genres=r["genres"],
-                score=max(0.0, 1.0 - r["distance"])  # Convert distance to similarity
+                score=(
+                    max(0.0, 1.0 - r["distance"])  # Convert distance to similarity
+                    if r.get("distance") is not None
+                    else r["lexical_score"]
+                ),
+                match=r.get("match", "semantic"),
             )
             for r in results
         ]
@@ -68,5 +95,11 @@ async def search_semantic(
             query=q
         )
 
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Search is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -58,3 +58,18 @@ class PaginatedMovieResponse(BaseModel):
     results: list[MovieResponse]
     total_pages: int
     total_results: int
+
+
+class SimilarMovieResponse(BaseModel):
+    id: int
+    title: str
+    poster_path: str | None
+    release_date: str
+    vote_average: float
+    score: float
+
+
+class SimilarMoviesResponse(BaseModel):
+    movie_id: int
+    source: str
+    results: list[SimilarMovieResponse]
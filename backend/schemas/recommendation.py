@@ -19,8 +19,10 @@ class RecommendationListResponse(BaseModel):
     """List of recommendations with strategy metadata."""
 
     recommendations: list[RecommendationResponse]
-    strategy: str  # "content_based", "popularity_fallback", "hybrid_content_heavy", or "hybrid_collaborative_heavy"
+    strategy: str  # "content_based", "popularity_fallback", "cold_start_cluster", "hybrid_content_heavy", or "hybrid_collaborative_heavy"
     total_ratings: int  # how many ratings user has
+    degradation: str = "none"  # "none", "content_only", "cached", or "popular" (deadline fallbacks)
+    next_cursor: str | None = None  # pass as ?cursor= for the next page; None on the last page
 
 
 class ExplanationResponse(BaseModel):
@@ -30,3 +32,21 @@ class ExplanationResponse(BaseModel):
     explanation: str
     factors: list[str]  # e.g., ["content_similarity", "collaborative_filtering"]
     cached: bool  # whether this was served from cache
+
+
+class RecommendationRow(BaseModel):
+    """One home-page row of recommendations."""
+
+    id: str  # e.g. "for_you", "because:550", "mood:cozy", "genre:28"
+    kind: str  # "for_you", "because_you_liked", "mood", or "genre"
+    title: str
+    seed_movie_id: int | None = None  # set for "because_you_liked" rows
+    recommendations: list[RecommendationResponse]
+
+
+class RecommendationRowsResponse(BaseModel):
+    """All personalized home-page rows (each movie appears in at most one row)."""
+
+    rows: list[RecommendationRow]
+    strategy: str  # strategy used for the "for_you" and genre/mood rows
+    total_ratings: int
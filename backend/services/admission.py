@@ -0,0 +1,230 @@
+"""
+Admission control for expensive endpoints.
+
+Each expensive endpoint class (recommendations, semantic search, AI
+explanations) gets a concurrency limit with a short bounded wait queue.
+Requests beyond that are shed immediately with 503 + Retry-After, and an
+optional per-client token bucket answers abusive clients with 429, so a
+burst degrades predictably instead of queueing without limit and slowing
+cheap endpoints like /health on the same worker.
+"""
+import asyncio
+import math
+import re
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from services.auth import TokenVerifier
+from services.cache import TTLCache
+from services.metrics import metrics
+from services.rate_limit import TokenBucket
+
+
+class AdmissionController:
+    """
+    Concurrency limit plus a bounded, time-limited wait queue.
+
+    At most `max_concurrent` requests run at once and at most `max_queue`
+    more wait up to `queue_timeout` seconds for a slot.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        """
+        Args:
+            name: Endpoint label used in metrics
+            max_concurrent: Requests allowed to run at once
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Max seconds a request waits before being shed
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self._running = 0
+
+    async def acquire(self) -> str | None:
+        """
+        Wait for a slot.
+
+        Returns:
+            None if admitted (call release() when done), otherwise the shed
+            reason: "queue_full" or "queue_timeout"
+        """
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            return self._shed("queue_full")
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return self._shed("queue_timeout")
+        finally:
+            self._waiting -= 1
+            self._update_gauges()
+
+        metrics.observe("admission_wait_seconds", time.perf_counter() - queued_at, endpoint=self.name)
+        self._running += 1
+        self._update_gauges()
+        return None
+
+    def release(self) -> None:
+        """Free the slot taken by a successful acquire()."""
+        self._running -= 1
+        self._slots.release()
+        self._update_gauges()
+
+    def _shed(self, reason: str) -> str:
+        metrics.inc("admission_shed_total", endpoint=self.name, reason=reason)
+        return reason
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("admission_queue_depth", self._waiting, endpoint=self.name)
+        metrics.set_gauge("admission_in_flight", self._running, endpoint=self.name)
+
+    def status(self) -> dict:
+        """Get current load for /metrics."""
+        return {
+            "in_flight": self._running,
+            "queued": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+        }
+
+
+class ClientRateLimiter:
+    """Per-client token buckets (LRU-bounded so idle clients are forgotten)."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        """
+        Args:
+            rate: Requests per second each client may sustain
+            burst: Bucket capacity per client
+            max_clients: Max number of tracked clients
+        """
+        self.rate = rate
+        self.burst = burst
+        idle_ttl = burst / rate if rate > 0 else 3600.0
+        self._buckets = TTLCache(max_entries=max_clients, default_ttl=idle_ttl)
+
+    def check(self, client_key: str) -> float:
+        """
+        Take one request token for a client.
+
+        Returns:
+            0.0 if allowed, otherwise seconds until the client may retry
+        """
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+        # Refresh the TTL on every request; a full bucket is the same as a new one
+        self._buckets.set(client_key, bucket)
+        if bucket.try_acquire():
+            return 0.0
+        return bucket.retry_after()
+
+
+def client_key(scope: Scope, token_verifier: TokenVerifier | None = None) -> str:
+    """
+    Identify the caller for rate limiting.
+
+    A bearer token counts only once it has been verified (it is in the
+    verifier's cache); until then the caller is keyed by client address, so
+    sending a fresh made-up token per request does not buy a fresh bucket.
+
+    Args:
+        scope: ASGI connection scope
+        token_verifier: Verifier whose cache maps tokens to user IDs
+
+    Returns:
+        "user:<id>" for a verified token, else "addr:<client address>"
+    """
+    if token_verifier is not None:
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                user_id = token_verifier.cached_user_id(token) if scheme.lower() == "bearer" else None
+                if user_id is not None:
+                    return f"user:{user_id}"
+                break
+    client = scope.get("client")
+    return f"addr:{client[0]}" if client else "addr:unknown"
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying admission control to matching paths.
+
+    The slot is held until the response (including a streamed body) has
+    been sent. Pure ASGI rather than BaseHTTPMiddleware so streaming
+    responses are not buffered.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: list[tuple[str, AdmissionController]],
+        rate_limiter: ClientRateLimiter | None = None,
+        token_verifier: TokenVerifier | None = None,
+        retry_after_seconds: int = 1,
+    ):
+        """
+        Args:
+            app: Wrapped ASGI app
+            policies: (path regex, controller) pairs; first match wins
+            rate_limiter: Optional per-client limiter for the matched paths
+            token_verifier: Verifier whose cache identifies signed-in clients
+                (None = key every client by address)
+            retry_after_seconds: Retry-After sent with 503 responses
+        """
+        self.app = app
+        self.policies = [(re.compile(pattern), controller) for pattern, controller in policies]
+        self.rate_limiter = rate_limiter
+        self.token_verifier = token_verifier
+        self.retry_after_seconds = retry_after_seconds
+
+    def _match(self, path: str) -> AdmissionController | None:
+        for pattern, controller in self.policies:
+            if pattern.fullmatch(path):
+                return controller
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        controller = None
+        if scope["type"] == "http" and scope["method"] != "OPTIONS":
+            controller = self._match(scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            retry_after = self.rate_limiter.check(client_key(scope, self.token_verifier))
+            if retry_after > 0:
+                metrics.inc("admission_shed_total", endpoint=controller.name, reason="rate_limited")
+                response = JSONResponse(
+                    {"detail": "Too many requests, please slow down"},
+                    status_code=429,
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+                await response(scope, receive, send)
+                return
+
+        shed_reason = await controller.acquire()
+        if shed_reason is not None:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
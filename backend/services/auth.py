@@ -0,0 +1,161 @@
+"""
+Supabase access token verification.
+
+Verifies JWT signature, expiry and audience locally -- HS256 tokens with the
+project's JWT secret, asymmetric tokens with keys from the project's JWKS
+endpoint -- and caches recently verified tokens. The Supabase Auth API
+round trip is only used when no local key material is available.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+
+import jwt
+from jwt import PyJWKClient
+from supabase import create_client
+
+from config import settings
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+
+class TokenVerificationError(Exception):
+    """Raised when an access token is invalid, expired or cannot be verified."""
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens and caches the resulting user IDs.
+
+    Cache entries live until the shorter of the configured TTL and the
+    token's own expiry, so an expired token is never served from cache.
+    """
+
+    def __init__(
+        self,
+        jwt_secret: str = settings.supabase_jwt_secret,
+        supabase_url: str = settings.supabase_url,
+        audience: str = settings.supabase_jwt_audience,
+        cache_ttl: float = settings.auth_token_cache_ttl_seconds,
+        cache_max_entries: int = settings.auth_token_cache_max_entries,
+    ):
+        """
+        Initialize the verifier.
+
+        Args:
+            jwt_secret: Project JWT secret for HS256 tokens (empty to disable)
+            supabase_url: Project URL, used for JWKS and the network fallback
+            audience: Expected "aud" claim
+            cache_ttl: Max seconds a verified token stays cached
+            cache_max_entries: Max number of cached tokens
+        """
+        self.jwt_secret = jwt_secret
+        self.supabase_url = supabase_url
+        self.audience = audience
+        self.cache_ttl = cache_ttl
+        self.cache = TTLCache(max_entries=cache_max_entries, default_ttl=cache_ttl)
+        self._jwks_client = PyJWKClient(
+            f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            cache_keys=True,
+            lifespan=3600,
+        ) if supabase_url else None
+        self._supabase = None
+
+    async def verify(self, token: str) -> str:
+        """
+        Verify an access token and return its user ID.
+
+        Args:
+            token: Raw JWT (without "Bearer ")
+
+        Returns:
+            User ID ("sub" claim)
+
+        Raises:
+            TokenVerificationError: If the token is invalid or expired
+        """
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        user_id = self.cache.get(cache_key)
+        if user_id is not None:
+            return user_id
+
+        try:
+            algorithm = jwt.get_unverified_header(token).get("alg")
+        except jwt.InvalidTokenError as e:
+            raise TokenVerificationError(f"Malformed token: {e}")
+
+        key = await self._get_signing_key(token, algorithm)
+        if key is None:
+            # Signature already checked by Supabase; claims only bound the cache TTL
+            user_id = await self._verify_remote(token)
+            claims = jwt.decode(token, options={"verify_signature": False})
+        else:
+            try:
+                claims = jwt.decode(
+                    token,
+                    key,
+                    algorithms=[algorithm],
+                    audience=self.audience,
+                    options={"require": ["exp", "sub"]},
+                )
+            except jwt.InvalidTokenError as e:
+                raise TokenVerificationError(str(e))
+            user_id = claims["sub"]
+
+        ttl = min(self.cache_ttl, claims.get("exp", 0) - time.time())
+        if ttl > 0:
+            self.cache.set(cache_key, user_id, ttl=ttl)
+        return user_id
+
+    def cached_user_id(self, token: str) -> str | None:
+        """
+        Get the user ID for a token verified earlier, without verifying it.
+
+        Args:
+            token: Raw JWT (without "Bearer ")
+
+        Returns:
+            User ID if the token is in the verified-token cache, else None
+        """
+        return self.cache.get(hashlib.sha256(token.encode()).hexdigest())
+
+    async def _get_signing_key(self, token: str, algorithm: str | None):
+        """
+        Get the local verification key for a token.
+
+        Returns:
+            Key for jwt.decode, or None if the token can't be verified locally
+        """
+        if algorithm == "HS256" and self.jwt_secret:
+            return self.jwt_secret
+
+        if algorithm in ASYMMETRIC_ALGORITHMS and self._jwks_client is not None:
+            try:
+                # PyJWKClient fetches synchronously on a JWKS cache miss
+                signing_key = await asyncio.to_thread(
+                    self._jwks_client.get_signing_key_from_jwt, token
+                )
+                return signing_key.key
+            except jwt.PyJWKClientError as e:
+                logger.warning(f"JWKS lookup failed, using Supabase Auth fallback: {e}")
+
+        return None
+
+    async def _verify_remote(self, token: str) -> str:
+        """Validate a token with the Supabase Auth API (network round trip)."""
+        try:
+            if self._supabase is None:
+                self._supabase = create_client(
+                    settings.supabase_url, settings.supabase_service_role_key
+                )
+            user_response = await asyncio.to_thread(self._supabase.auth.get_user, token)
+        except Exception as e:
+            raise TokenVerificationError(str(e))
+
+        if not user_response or not user_response.user:
+            raise TokenVerificationError("Invalid or expired token")
+        return user_response.user.id
@@ -0,0 +1,151 @@
+"""
+Dynamic micro-batching for query encoding.
+
+Concurrent semantic searches each need one short query encoded. A
+transformer encodes a batch of queries in little more time than one, so
+a dedicated worker thread collects queries for up to `max_wait_ms` (or
+until `max_batch_size` are waiting), encodes them in one call and
+resolves each caller's future. Callers await the future from the event
+loop (encode_async) or block on it from a worker thread (encode).
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+import numpy as np
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatchEncoder:
+    """Single worker thread batching encode requests within a short window."""
+
+    def __init__(
+        self,
+        encode_batch: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "query_encoder",
+    ):
+        """
+        Args:
+            encode_batch: Encodes a list of texts into a (len, dim) array
+            max_batch_size: Max texts per encode_batch call
+            max_wait_ms: Max time the first queued text waits for company
+            name: Thread name and metrics label
+        """
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.encoded = 0
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent; called lazily on first submit)."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker after it finishes the queued texts."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(self, text: str) -> Future:
+        """Queue a text; the future resolves to its (dim,) embedding."""
+        self.start()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """Encode a text, blocking until its batch has run (for worker threads)."""
+        return self.submit(text).result()
+
+    async def encode_async(self, text: str) -> np.ndarray:
+        """Encode a text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self, first: Any) -> tuple[list[tuple[str, Future]], bool]:
+        """Gather queued requests until the batch is full or the window closes."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            try:
+                self._encode(batch)
+            except Exception as e:
+                # Never let one batch kill the worker: later submits would hang
+                logger.error(f"Encoder worker error: {e}")
+
+    def _encode(self, batch: list[tuple[str, Future]]) -> None:
+        # Callers that cancelled while queued (e.g. a timed-out encode_async) are dropped
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        # Identical texts in one window are encoded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        started = time.perf_counter()
+        try:
+            embeddings = self.encode_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch encode of {len(texts)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, embeddings))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+        self.batches += 1
+        self.encoded += len(batch)
+        metrics.observe("encoder_batch_size", len(batch), encoder=self.name)
+        metrics.observe("encoder_batch_seconds", time.perf_counter() - started, encoder=self.name)
+
+    def stats(self) -> dict[str, Any]:
+        """Batch counters for /metrics."""
+        return {
+            "batches": self.batches,
+            "encoded": self.encoded,
+            "mean_batch_size": self.encoded / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
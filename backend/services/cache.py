@@ -0,0 +1,113 @@
+"""
+In-process TTL cache shared by backend services.
+
+Entries expire after a per-key TTL and the least recently used entry is
+evicted once the cache is full. Expiry times are exposed so background
+jobs (e.g. the cache warmer) can refresh keys before they go stale.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry expiry.
+
+    Not thread-safe: intended to be used from the asyncio event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            default_ttl: TTL in seconds used when set() is called without one
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value if present and not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on miss
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: TTL in seconds (defaults to default_ttl)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def ttl_remaining(self, key: Hashable) -> float | None:
+        """
+        Get seconds until a key expires.
+
+        Does not count as a hit or miss and does not change LRU order.
+
+        Returns:
+            Remaining TTL in seconds, or None if missing/expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def stats(self) -> dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.ttl_remaining(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
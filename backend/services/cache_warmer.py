@@ -0,0 +1,174 @@
+"""
+Background cache warmer for homepage and browse rows.
+
+Periodically refreshes the TMDB cache entries behind /api/movies/featured,
+/api/movies, every /api/movies/mood/{mood} and the browse genre rows before
+their TTL runs out, so user-facing browse requests always hit a warm cache.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from config import settings
+from services.tmdb import (
+    TMDBService,
+    details_cache_key,
+    discover_cache_key,
+    popular_cache_key,
+    tmdb_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """
+    Keeps a fixed set of TMDB cache keys warm.
+
+    Refreshes run with low priority against the shared TMDB rate budget, so
+    warming never takes the tokens user-facing requests are relying on.
+    """
+
+    def __init__(
+        self,
+        tmdb_service: TMDBService,
+        featured_movie_ids: list[int],
+        mood_genre_map: dict[str, str],
+        genre_ids: list[int],
+        interval_seconds: float = settings.cache_warmer_interval_seconds,
+        refresh_margin_seconds: float = settings.cache_warmer_refresh_margin_seconds,
+    ):
+        """
+        Initialize the warmer.
+
+        Args:
+            tmdb_service: TMDB service used for refreshes
+            featured_movie_ids: Hero section movie IDs (details are prefetched)
+            mood_genre_map: Mood -> pipe-separated genre IDs
+            genre_ids: Genre IDs of the browse page rows
+            interval_seconds: Seconds between warming passes
+            refresh_margin_seconds: Refresh keys expiring within this window
+        """
+        self.tmdb_service = tmdb_service
+        self.interval_seconds = interval_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.targets = self._build_targets(featured_movie_ids, mood_genre_map, genre_ids)
+        self.last_run_at: float | None = None
+        self.last_refreshed = 0
+        self.last_errors = 0
+        self._task: asyncio.Task | None = None
+
+    def _build_targets(
+        self,
+        featured_movie_ids: list[int],
+        mood_genre_map: dict[str, str],
+        genre_ids: list[int],
+    ) -> list[tuple[str, Callable[[], Awaitable[Any]]]]:
+        """Build (cache_key, refresh_coroutine_factory) pairs."""
+        tmdb = self.tmdb_service
+        targets = [
+            (
+                popular_cache_key(1),
+                lambda: tmdb.get_popular(page=1, force_refresh=True, low_priority=True),
+            )
+        ]
+
+        for genre_ids_str in dict.fromkeys(mood_genre_map.values()):
+            targets.append((
+                discover_cache_key(genre_ids_str, 1),
+                lambda g=genre_ids_str: tmdb.discover_by_genres(
+                    g, page=1, force_refresh=True, low_priority=True
+                ),
+            ))
+
+        for genre_id in genre_ids:
+            targets.append((
+                discover_cache_key(str(genre_id), 1),
+                lambda g=genre_id: tmdb.discover_by_genre(
+                    g, page=1, force_refresh=True, low_priority=True
+                ),
+            ))
+
+        for movie_id in featured_movie_ids:
+            targets.append((
+                details_cache_key(movie_id),
+                lambda m=movie_id: tmdb.get_movie_details(
+                    m, force_refresh=True, low_priority=True
+                ),
+            ))
+
+        return targets
+
+    async def warm_once(self) -> int:
+        """
+        Refresh every target that is missing or expires within the margin.
+
+        Returns:
+            Number of keys refreshed
+        """
+        refreshed = 0
+        errors = 0
+
+        for key, refresh in self.targets:
+            remaining = tmdb_cache.ttl_remaining(key)
+            if remaining is not None and remaining > self.refresh_margin_seconds:
+                continue
+            try:
+                await refresh()
+                refreshed += 1
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Cache warmer failed to refresh {key}: {e}")
+
+        self.last_run_at = time.time()
+        self.last_refreshed = refreshed
+        self.last_errors = errors
+        return refreshed
+
+    def coverage(self) -> dict[str, Any]:
+        """
+        Report how many target keys are currently warm.
+
+        Returns:
+            Dict with warm/total counts, ratio, and last pass stats
+        """
+        warm = sum(1 for key, _ in self.targets if key in tmdb_cache)
+        total = len(self.targets)
+        return {
+            "warm": warm,
+            "total": total,
+            "ratio": warm / total if total else 1.0,
+            "last_run_at": self.last_run_at,
+            "last_refreshed": self.last_refreshed,
+            "last_errors": self.last_errors,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.warm_once()
+                if refreshed:
+                    coverage = self.coverage()
+                    logger.info(
+                        f"Cache warmer refreshed {refreshed} keys "
+                        f"({coverage['warm']}/{coverage['total']} warm)"
+                    )
+            except Exception as e:
+                logger.error(f"Cache warmer pass failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the warming loop as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the warming loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
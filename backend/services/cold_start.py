@@ -0,0 +1,158 @@
+"""
+Cluster-centroid recommendations for cold-start users.
+
+ml/build_cold_start.py clusters existing users' TF-IDF taste profiles
+with k-means and stores each cluster's centroid plus its precomputed,
+TMDB-hydrated top list in ml/models/cold_start_clusters.npz. A user with
+1-4 ratings is assigned to the nearest centroid (one small dense
+mat-vec) and served that cluster's list instead of the global popular
+list, at the same cost as a popularity lookup.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CLUSTERS_FILENAME = "cold_start_clusters.npz"
+
+
+def save_clusters(
+    path: Path,
+    centroids: np.ndarray,
+    movie_ids: np.ndarray,
+    scores: np.ndarray,
+    movies: dict[int, dict[str, Any]],
+    model_version: str,
+    generated_at: float,
+) -> None:
+    """
+    Write cluster centroids and top lists atomically as a compressed .npz file.
+
+    Args:
+        path: Destination file
+        centroids: (n_clusters, n_features) L2-normalized TF-IDF centroids
+        movie_ids: (n_clusters, top_n) ranked movie IDs per cluster
+        scores: (n_clusters, top_n) scores aligned with movie_ids
+        movies: TMDB summary payload per listed movie ID (may be partial)
+        model_version: RecommenderService.content_model_version the centroids live in
+        generated_at: Unix timestamp of the build
+    """
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            centroids=centroids.astype(np.float32),
+            movie_ids=movie_ids.astype(np.int32),
+            scores=scores.astype(np.float32),
+            movies=np.array(json.dumps({str(k): v for k, v in movies.items()})),
+            model_version=np.array(model_version),
+            generated_at=np.array(generated_at),
+        )
+    tmp_path.replace(path)
+
+
+class ColdStartClusters:
+    """Read side of the cold-start clusters, fully loaded in memory."""
+
+    def __init__(self):
+        self.model_version: str | None = None
+        self.generated_at: float | None = None
+        self.centroids: np.ndarray | None = None
+        self._movie_ids: np.ndarray | None = None
+        self._scores: np.ndarray | None = None
+        self._movies: dict[int, dict[str, Any]] = {}
+
+    def load(self, model_dir: str) -> None:
+        """
+        Load cold_start_clusters.npz from model_dir if present (missing = popular fallback).
+
+        Args:
+            model_dir: Directory containing cold_start_clusters.npz
+        """
+        path = Path(model_dir) / CLUSTERS_FILENAME
+        if not path.exists():
+            logger.info("No cold-start clusters found; new users get the popular list")
+            return
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.error(f"Error loading cold-start clusters: {e}")
+            return
+
+        self.centroids = arrays["centroids"]
+        self._movie_ids = arrays["movie_ids"]
+        self._scores = arrays["scores"]
+        self._movies = {int(k): v for k, v in json.loads(str(arrays["movies"])).items()}
+        self.model_version = str(arrays["model_version"])
+        self.generated_at = float(arrays["generated_at"])
+        logger.info(f"Loaded {len(self.centroids)} cold-start clusters")
+
+    def is_loaded(self) -> bool:
+        """Check if clusters are loaded."""
+        return self.centroids is not None
+
+    def assign(self, profile: np.ndarray) -> int:
+        """
+        Find the nearest centroid to a taste profile.
+
+        Args:
+            profile: TF-IDF profile from RecommenderService.build_user_profile
+
+        Returns:
+            Cluster index
+        """
+        # Centroids are unit-length, so the largest dot product is the smallest cosine distance
+        return int(np.argmax(self.centroids @ np.asarray(profile, dtype=np.float32).ravel()))
+
+    def recommend(self, recommender, ratings: list[dict], top_n: int) -> list[dict] | None:
+        """
+        Serve the nearest cluster's top list for a user with a few ratings.
+
+        Args:
+            recommender: Loaded RecommenderService (builds the profile)
+            ratings: The user's {movie_id, rating} dicts
+            top_n: Max items to return
+
+        Returns:
+            Ranked items ({movie_id, score, reason, movie?}) without the
+            user's rated movies, or None if no clusters are loaded, they
+            were built for another content model, or the ratings give no
+            taste profile
+        """
+        if self.centroids is None or self.model_version != recommender.content_model_version:
+            return None
+        profile = recommender.build_user_profile(ratings)
+        if profile is None:
+            metrics.inc("cold_start_assignments_total", result="no_profile")
+            return None
+
+        cluster = self.assign(profile)
+        metrics.inc("cold_start_assignments_total", result="assigned")
+        rated = {r.get("movie_id") for r in ratings}
+        items = []
+        for movie_id, score in zip(self._movie_ids[cluster], self._scores[cluster]):
+            movie_id = int(movie_id)
+            if movie_id in rated:
+                continue
+            item = {"movie_id": movie_id, "score": float(score), "reason": "cold_start_cluster"}
+            if movie_id in self._movies:
+                item["movie"] = self._movies[movie_id]
+            items.append(item)
+            if len(items) >= top_n:
+                break
+        return items
+
+    def status(self) -> dict[str, Any]:
+        """Cluster summary for /metrics."""
+        return {
+            "clusters": 0 if self.centroids is None else len(self.centroids),
+            "model_version": self.model_version,
+            "generated_at": self.generated_at,
+        }
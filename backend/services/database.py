@@ -0,0 +1,274 @@
+"""
+Async data access for Supabase tables.
+
+One app-scoped PostgREST client over a pooled httpx.AsyncClient replaces
+per-request create_client() calls and synchronous queries inside async
+handlers. Reads select only the columns callers need, and multi-row reads
+use keyset pagination so heavy users are not silently truncated by
+PostgREST's max-rows limit.
+"""
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseDataAccess:
+    """
+    Async, connection-pooled access to ratings, watchlist, viewing_history
+    and ai_explanations.
+
+    connect() must be awaited (in the FastAPI lifespan) before queries run.
+    """
+
+    def __init__(
+        self,
+        supabase_url: str = settings.supabase_url,
+        service_role_key: str = settings.supabase_service_role_key,
+        max_connections: int = settings.supabase_max_connections,
+        page_size: int = settings.supabase_page_size,
+        timeout: float = settings.supabase_timeout_seconds,
+    ):
+        """
+        Initialize the data access layer (no connections are opened yet).
+
+        Args:
+            supabase_url: Supabase project URL
+            service_role_key: Service role key (bypasses RLS)
+            max_connections: Size of the HTTP connection pool
+            page_size: Rows per keyset page (<= PostgREST max-rows)
+            timeout: Per-request timeout in seconds
+        """
+        self.supabase_url = supabase_url
+        self.service_role_key = service_role_key
+        self.max_connections = max_connections
+        self.page_size = page_size
+        self.timeout = timeout
+        self._http: httpx.AsyncClient | None = None
+        self._client: AsyncPostgrestClient | None = None
+
+    async def connect(self) -> None:
+        """Open the pooled HTTP client."""
+        if self._client is not None:
+            return
+        headers = {
+            "apikey": self.service_role_key,
+            "Authorization": f"Bearer {self.service_role_key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        base_url = f"{self.supabase_url.rstrip('/')}/rest/v1"
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        self._client = AsyncPostgrestClient(base_url, headers=headers, http_client=self._http)
+        logger.info(f"Supabase data access connected (pool size {self.max_connections})")
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._client = None
+
+    def _table(self, name: str):
+        if self._client is None:
+            raise RuntimeError("SupabaseDataAccess.connect() has not been awaited")
+        return self._client.from_(name)
+
+    async def _keyset_pages(
+        self,
+        table: str,
+        columns: str,
+        key_column: str,
+        filters: dict[str, Any],
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield pages ordered by a unique key column.
+
+        Args:
+            table: Table name
+            columns: Comma-separated projection (must include key_column)
+            key_column: Column that is unique within the filtered rows
+            filters: Equality filters applied to every page
+        """
+        last_key = None
+        while True:
+            query = self._table(table).select(columns)
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            if last_key is not None:
+                query = query.gt(key_column, last_key)
+            response = await query.order(key_column).limit(self.page_size).execute()
+
+            rows = response.data or []
+            if rows:
+                yield rows
+            if len(rows) < self.page_size:
+                return
+            last_key = rows[-1][key_column]
+
+    # ---- ratings ----
+
+    async def get_ratings(
+        self,
+        user_id: str,
+        columns: str = "movie_id, rating",
+    ) -> list[dict[str, Any]]:
+        """
+        Get all of a user's ratings.
+
+        Args:
+            user_id: User UUID
+            columns: Projection (must include movie_id)
+
+        Returns:
+            List of rating rows ordered by movie_id
+        """
+        ratings = []
+        async for page in self._keyset_pages("ratings", columns, "movie_id", {"user_id": user_id}):
+            ratings.extend(page)
+        return ratings
+
+    async def get_ratings_fingerprint(self, user_id: str) -> str:
+        """
+        Get a cheap fingerprint of a user's ratings.
+
+        Combines the row count with the latest updated_at in a single
+        one-row query, so it changes whenever a rating is added, updated
+        or deleted.
+
+        Returns:
+            Fingerprint string "<count>:<latest updated_at>"
+        """
+        response = await self._table("ratings").select(
+            "updated_at", count="exact"
+        ).eq(
+            "user_id", user_id
+        ).order(
+            "updated_at", desc=True
+        ).limit(1).execute()
+        latest = response.data[0]["updated_at"] if response.data else ""
+        return f"{response.count or 0}:{latest}"
+
+    async def get_top_ratings(self, user_id: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Get a user's highest ratings (movie_id, rating)."""
+        response = await self._table("ratings").select(
+            "movie_id, rating"
+        ).eq(
+            "user_id", user_id
+        ).order(
+            "rating", desc=True
+        ).limit(limit).execute()
+        return response.data or []
+
+    async def iter_all_ratings(
+        self,
+        columns: str = "id, user_id, movie_id, rating",
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield every rating in the table, one keyset page at a time.
+
+        Args:
+            columns: Projection (must include id)
+        """
+        async for page in self._keyset_pages("ratings", columns, "id", {}):
+            yield page
+
+    # ---- watchlist / viewing history ----
+
+    async def get_watchlist(self, user_id: str) -> list[dict[str, Any]]:
+        """Get all of a user's watchlist entries (movie_id, created_at)."""
+        items = []
+        async for page in self._keyset_pages(
+            "watchlist", "movie_id, created_at", "movie_id", {"user_id": user_id}
+        ):
+            items.extend(page)
+        return items
+
+    async def get_viewing_history(
+        self,
+        user_id: str,
+        limit: int = 100,
+        before: tuple[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get a page of a user's viewing history, newest first.
+
+        Rows are ordered by (created_at, id), so rows sharing a timestamp
+        across a page boundary are neither skipped nor repeated.
+
+        Args:
+            user_id: User UUID
+            limit: Max rows to return
+            before: (created_at, id) of the previous page's last row
+
+        Returns:
+            List of {id, movie_id, action_type, created_at} rows
+        """
+        query = self._table("viewing_history").select(
+            "id, movie_id, action_type, created_at"
+        ).eq("user_id", user_id)
+        if before is not None:
+            created_at, row_id = before
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+            )
+        response = await query.order(
+            "created_at", desc=True
+        ).order(
+            "id", desc=True
+        ).limit(limit).execute()
+        return response.data or []
+
+    # ---- ai_explanations ----
+
+    async def get_explanation(self, user_id: str, movie_id: int) -> dict[str, Any] | None:
+        """Get a cached explanation row (explanation, factors, expires_at) or None."""
+        response = await self._table("ai_explanations").select(
+            "explanation, factors, expires_at"
+        ).eq(
+            "user_id", user_id
+        ).eq(
+            "movie_id", movie_id
+        ).limit(1).execute()
+        return response.data[0] if response.data else None
+
+    async def upsert_explanation(
+        self,
+        user_id: str,
+        movie_id: int,
+        explanation: str,
+        factors: list[str],
+        generated_at: datetime,
+        expires_at: datetime,
+    ) -> None:
+        """Insert or replace a cached explanation."""
+        await self._table("ai_explanations").upsert({
+            "user_id": user_id,
+            "movie_id": movie_id,
+            "explanation": explanation,
+            "factors": factors,
+            "generated_at": generated_at.isoformat(),
+            "expires_at": expires_at.isoformat(),
+        }).execute()
+
+    async def rpc(self, function: str, params: dict[str, Any]) -> Any:
+        """Call a Postgres function via PostgREST RPC."""
+        if self._client is None:
+            raise RuntimeError("SupabaseDataAccess.connect() has not been awaited")
+        response = await self._client.rpc(function, params).execute()
+        return response.data
@@ -0,0 +1,80 @@
+"""
+Per-request latency budgets.
+
+A Deadline is created when a request arrives and passed down the
+recommendation pipeline. Each stage awaits its work with whatever budget
+remains (minus what later stages need) and steps down to a cheaper
+fallback when the budget runs out, instead of letting a slow CF pass,
+Supabase read or TMDB call hold the response.
+"""
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable
+
+# Degradation ladder, from full quality to cheapest
+DEGRADATION_STEPS = ("none", "content_only", "cached", "popular")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage does not finish within the remaining budget."""
+
+
+class Deadline:
+    """Absolute deadline for one request (budget=None means unbounded)."""
+
+    def __init__(self, budget: float | None):
+        """
+        Start the clock.
+
+        Args:
+            budget: Total seconds allowed for the request, or None for no limit
+        """
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = None if budget is None else self.started_at + budget
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.monotonic() - self.started_at
+
+    def timeout(self, reserve: float = 0.0, limit: float | None = None) -> float | None:
+        """
+        Get the time a stage may take.
+
+        Args:
+            reserve: Seconds held back for later stages
+            limit: Cap for this stage regardless of the remaining budget
+
+        Returns:
+            Seconds (>= 0), or None if neither a deadline nor a limit applies
+        """
+        if self.expires_at is None:
+            return limit
+        remaining = max(0.0, self.expires_at - time.monotonic() - reserve)
+        return remaining if limit is None else min(remaining, limit)
+
+    async def run(
+        self,
+        awaitable: Awaitable[Any],
+        reserve: float = 0.0,
+        limit: float | None = None,
+    ) -> Any:
+        """
+        Await a stage within the remaining budget.
+
+        Work handed to an executor keeps running after a timeout; only the
+        caller stops waiting for it.
+
+        Raises:
+            DeadlineExceeded: If the stage does not finish in time
+        """
+        timeout = self.timeout(reserve, limit)
+        if timeout == 0.0:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded("No budget left for this stage")
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Stage did not finish within {timeout:.3f}s")
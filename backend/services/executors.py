@@ -0,0 +1,266 @@
+"""
+Executor layer for CPU-bound work called from async handlers.
+
+Recommendation scoring (cosine similarity, SVD predictions) and query
+encoding would otherwise run on the event loop and freeze every other
+request on the worker. Work is submitted to a thread pool (numpy/scipy and
+torch release the GIL) or, optionally, a process pool for pure-Python
+scoring. Each executor bounds how many calls may wait for a slot and
+records the wait time, so saturation shows up in /metrics instead of as
+unbounded latency.
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from config import settings
+from ml.embeddings import open_embedding_store
+from services.metrics import metrics
+from services.recommender import RecommenderService
+from services.sharded_scoring import ShardedScorer
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when an executor's wait queue is full."""
+
+
+class BoundedExecutor:
+    """
+    Async front for a concurrent.futures executor with a bounded wait queue.
+
+    At most `max_workers` calls run at once; at most `max_queue` more may
+    wait for a slot. Further calls fail fast with ExecutorSaturatedError.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int, max_queue: int):
+        """
+        Args:
+            name: Label used in metrics
+            executor: Underlying thread or process pool
+            max_workers: Concurrent calls allowed (matches the pool size)
+            max_queue: Calls allowed to wait for a free slot
+        """
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = asyncio.Semaphore(max_workers)
+        self._waiting = 0
+        self._running = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs) in the executor and await its result.
+
+        Raises:
+            ExecutorSaturatedError: If the wait queue is full
+        """
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            metrics.inc("executor_rejected_total", executor=self.name)
+            raise ExecutorSaturatedError(f"{self.name} executor is saturated")
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        self._update_gauges()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        metrics.observe("executor_wait_seconds", started_at - queued_at, executor=self.name)
+        self._running += 1
+        self._update_gauges()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(started_at)
+            raise
+
+        # The slot is held until the job itself finishes, not until this caller
+        # stops waiting: a deadline timeout cancels the await, but the job keeps
+        # its worker busy, so releasing early would let the pool's own queue
+        # grow without bound under exactly the load the bound is meant for
+        def on_done(_future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release, started_at)
+            except RuntimeError:  # event loop already closed (shutdown)
+                pass
+
+        future.add_done_callback(on_done)
+        return await asyncio.shield(asyncio.wrap_future(future, loop=loop))
+
+    def _release(self, started_at: float) -> None:
+        self._running -= 1
+        self._slots.release()
+        self._update_gauges()
+        metrics.observe(
+            "executor_run_seconds", time.perf_counter() - started_at, executor=self.name
+        )
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("executor_queue_depth", self._waiting, executor=self.name)
+        metrics.set_gauge("executor_in_flight", self._running, executor=self.name)
+
+    def shutdown(self) -> None:
+        """Shut down the underlying pool without waiting for queued work."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---- process pool workers (each process loads its own model copy) ----
+
+_process_recommender: RecommenderService | None = None
+
+
+def _init_recommender_process(model_dir: str) -> None:
+    """Process pool initializer: load models once per worker process."""
+    global _process_recommender
+    _process_recommender = RecommenderService()
+    _process_recommender.load_model(model_dir)
+    _process_recommender.load_collaborative_model(model_dir)
+    if settings.embedding_fusion_weight > 0:
+        _process_recommender.load_embeddings_from_store(
+            open_embedding_store(settings.embedding_backend, settings.embedding_rerank_factor),
+            settings.embedding_fusion_weight,
+        )
+
+
+def _hybrid_recommendations_in_process(
+    user_id: str,
+    ratings: list[dict],
+    top_n: int,
+    diversity_seed: int | None,
+    page_size: int | None,
+) -> tuple[list[dict], str]:
+    return _process_recommender.hybrid_recommendations(
+        user_id=user_id,
+        ratings=ratings,
+        top_n=top_n,
+        diversity_seed=diversity_seed,
+        page_size=page_size,
+    )
+
+
+class ExecutorPool:
+    """
+    App-scoped executors: a thread pool for numpy/torch work, a small thread
+    pool reserved for the content-only degradation step, an optional
+    process pool (settings.cpu_process_workers > 0) for pure-Python scoring
+    and an optional catalog-sharded scorer (settings.scoring_shards > 0).
+    """
+
+    def __init__(self):
+        self.threads = BoundedExecutor(
+            "cpu_threads",
+            ThreadPoolExecutor(
+                max_workers=settings.cpu_thread_workers, thread_name_prefix="cpu"
+            ),
+            max_workers=settings.cpu_thread_workers,
+            max_queue=settings.executor_max_queue,
+        )
+        self.fallback = BoundedExecutor(
+            "cpu_fallback",
+            ThreadPoolExecutor(
+                max_workers=settings.cpu_fallback_workers, thread_name_prefix="cpu-fallback"
+            ),
+            max_workers=settings.cpu_fallback_workers,
+            max_queue=settings.executor_max_queue,
+        )
+        self.processes: BoundedExecutor | None = None
+        self.sharded: ShardedScorer | None = None
+
+    def start_process_pool(self, model_dir: str) -> None:
+        """Start the optional process pool; each worker loads the models."""
+        if settings.cpu_process_workers <= 0 or self.processes is not None:
+            return
+        self.processes = BoundedExecutor(
+            "cpu_processes",
+            ProcessPoolExecutor(
+                max_workers=settings.cpu_process_workers,
+                initializer=_init_recommender_process,
+                initargs=(model_dir,),
+            ),
+            max_workers=settings.cpu_process_workers,
+            max_queue=settings.executor_max_queue,
+        )
+        logger.info(f"Started scoring process pool with {settings.cpu_process_workers} workers")
+
+    def start_sharded_scorer(self, recommender: RecommenderService) -> None:
+        """Publish the loaded catalog to shared memory and start the shard workers."""
+        if settings.scoring_shards <= 0 or self.sharded is not None or not recommender.is_loaded():
+            return
+        self.sharded = ShardedScorer(
+            settings.scoring_shards, workers=settings.scoring_shard_workers or None
+        )
+        self.sharded.build_from_recommender(recommender)
+
+    async def run_cpu(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run numpy/torch-heavy work on the thread pool."""
+        return await self.threads.run(fn, *args, **kwargs)
+
+    async def run_fallback(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a degraded-path job on the reserved fallback pool.
+
+        Timed-out hybrid jobs keep their scoring workers until they finish,
+        so the cheaper fallback must not queue behind them.
+        """
+        return await self.fallback.run(fn, *args, **kwargs)
+
+    async def hybrid_recommendations(
+        self,
+        recommender: RecommenderService,
+        user_id: str,
+        ratings: list[dict],
+        top_n: int,
+        diversity_seed: int | None = None,
+        page_size: int | None = None,
+    ) -> tuple[list[dict], str]:
+        """
+        Score hybrid recommendations off the event loop.
+
+        Uses the sharded scorer when enabled (the calling thread only merges
+        per-shard top-k lists), else the process pool when enabled (hybrid
+        fusion and diversity sampling run in pure Python and hold the GIL),
+        otherwise the thread pool with the shared service.
+        """
+        if self.sharded is not None:
+            return await self.threads.run(
+                self.sharded.hybrid_recommendations,
+                recommender,
+                user_id=user_id,
+                ratings=ratings,
+                top_n=top_n,
+                diversity_seed=diversity_seed,
+                page_size=page_size,
+            )
+        if self.processes is not None:
+            return await self.processes.run(
+                _hybrid_recommendations_in_process,
+                user_id, ratings, top_n, diversity_seed, page_size,
+            )
+        return await self.threads.run(
+            recommender.hybrid_recommendations,
+            user_id=user_id,
+            ratings=ratings,
+            top_n=top_n,
+            diversity_seed=diversity_seed,
+            page_size=page_size,
+        )
+
+    def shutdown(self) -> None:
+        """Shut down all pools."""
+        self.threads.shutdown()
+        self.fallback.shutdown()
+        if self.processes is not None:
+            self.processes.shutdown()
+            self.processes = None
+        if self.sharded is not None:
+            self.sharded.close()
+            self.sharded = None
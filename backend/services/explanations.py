@@ -2,23 +2,26 @@
 AI-powered explanation service using RAG pipeline.
 
 Implements retrieval-augmented generation for personalized recommendation
-explanations: ChromaDB retrieval + Claude generation + PostgreSQL caching.
+explanations: embedding-store retrieval + Claude generation + PostgreSQL caching.
 """
+import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from anthropic import AsyncAnthropic
-from supabase import create_client, Client
 
 from config import settings
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
 from ml.embeddings.store import EmbeddingStore
+from services.database import SupabaseDataAccess
+from services.neighbors import NeighborIndex
 from services.tmdb import TMDBService
 
 logger = logging.getLogger(__name__)
 
-# Required Supabase table schema (self-bootstrapping on init)
+# Required Supabase table schema (self-bootstrapping at startup)
 TABLE_SCHEMA = """
 CREATE TABLE IF NOT EXISTS ai_explanations (
   user_id UUID NOT NULL,
@@ -46,13 +49,28 @@ class ExplanationService:
     5. Cache result for 7 days
     """
 
-    def __init__(self):
-        """Initialize the explanation service."""
-        # Supabase client for cache and user data
-        self.supabase: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_service_role_key
-        )
+    def __init__(
+        self,
+        data_access: SupabaseDataAccess,
+        neighbor_index: NeighborIndex | None = None,
+        embedding_store: EmbeddingStore | NumpyEmbeddingStore | None = None,
+        run_cpu: Callable[..., Awaitable[Any]] | None = None,
+    ):
+        """
+        Initialize the explanation service.
+
+        Args:
+            data_access: Shared async Supabase data access (cache and user data)
+            neighbor_index: Precomputed similar-movie tables (falls back to
+                embedding store queries for movies not in the tables)
+            embedding_store: Shared embedding store for similar-movie
+                metadata and the query fallback (default: ChromaDB)
+            run_cpu: Awaitable runner for blocking store calls (e.g.
+                ExecutorPool.run_cpu; default asyncio.to_thread)
+        """
+        self.data_access = data_access
+        self.neighbor_index = neighbor_index
+        self.run_cpu = run_cpu or asyncio.to_thread
 
         # Claude API client
         self.anthropic_client = AsyncAnthropic(
@@ -60,24 +78,18 @@ class ExplanationService:
         ) if settings.anthropic_api_key else None
 
         # Embedding store for similarity retrieval
-        self.embedding_store = EmbeddingStore()
+        self.embedding_store = embedding_store if embedding_store is not None else EmbeddingStore()
 
         # TMDB service for movie metadata
         self.tmdb_service = TMDBService()
 
-        # Bootstrap table on init
-        self._create_table_if_not_exists()
-
         logger.info("ExplanationService initialized")
 
-    def _create_table_if_not_exists(self) -> None:
-        """Create ai_explanations table if it doesn't exist."""
+    async def create_table_if_not_exists(self) -> None:
+        """Create ai_explanations table if it doesn't exist (called from lifespan)."""
         try:
             # Use raw SQL via service role client
-            self.supabase.postgrest.schema("public").rpc(
-                "exec",
-                {"sql": TABLE_SCHEMA}
-            )
+            await self.data_access.rpc("exec", {"sql": TABLE_SCHEMA})
             logger.info("ai_explanations table ready")
         except Exception as e:
             # Table might already exist or exec RPC might not be available
@@ -102,7 +114,7 @@ class ExplanationService:
             Dict with keys: movie_id, explanation, factors, cached
         """
         # 1. CACHE CHECK
-        cached_result = self._check_cache(user_id, movie_id)
+        cached_result = await self._check_cache(user_id, movie_id)
         if cached_result:
             logger.info(f"Cache hit for user {user_id}, movie {movie_id}")
             return cached_result
@@ -131,11 +143,11 @@ class ExplanationService:
             "cached": False
         }
 
-        self._store_cache(user_id, movie_id, result)
+        await self._store_cache(user_id, movie_id, result)
 
         return result
 
-    def _check_cache(self, user_id: str, movie_id: int) -> dict[str, Any] | None:
+    async def _check_cache(self, user_id: str, movie_id: int) -> dict[str, Any] | None:
         """
         Check cache for existing explanation.
 
@@ -143,17 +155,11 @@ class ExplanationService:
             Cached explanation dict or None if not found/expired
         """
         try:
-            response = self.supabase.table("ai_explanations").select("*").eq(
-                "user_id", user_id
-            ).eq(
-                "movie_id", movie_id
-            ).execute()
+            cached = await self.data_access.get_explanation(user_id, movie_id)
 
-            if not response.data or len(response.data) == 0:
+            if not cached:
                 return None
 
-            cached = response.data[0]
-
             # Check expiration
             expires_at = datetime.fromisoformat(cached["expires_at"].replace("Z", "+00:00"))
             if datetime.now(expires_at.tzinfo) > expires_at:
@@ -186,15 +192,7 @@ class ExplanationService:
 
         # Fetch user's top-rated movies
         try:
-            ratings_response = self.supabase.table("ratings").select(
-                "movie_id, rating"
-            ).eq(
-                "user_id", user_id
-            ).order(
-                "rating", desc=True
-            ).limit(10).execute()
-
-            user_ratings = ratings_response.data if ratings_response.data else []
+            user_ratings = await self.data_access.get_top_ratings(user_id, limit=10)
 
             # Enrich with TMDB metadata
             enriched_ratings = []
@@ -230,34 +228,14 @@ class ExplanationService:
             logger.error(f"Failed to fetch recommended movie metadata: {e}")
             context["recommended_movie"] = {"title": "Unknown", "year": "", "overview": "", "genres": "", "director": ""}
 
-        # Query ChromaDB for similar movies
+        # Similar movies: precomputed neighbor lookup, ChromaDB query as fallback
         try:
-            # Get embedding for the recommended movie
-            movie_results = self.embedding_store.get_by_ids([str(movie_id)])
-            if movie_results["embeddings"] and len(movie_results["embeddings"]) > 0:
-                query_embedding = movie_results["embeddings"][0]
-
-                # Find similar movies
-                similar = self.embedding_store.query_similar(query_embedding, n_results=4)
-
-                # Exclude the query movie itself and take top 3
-                similar_movies = []
-                for item in similar:
-                    if item["id"] != str(movie_id):
-                        similar_movies.append({
-                            "title": item["metadata"].get("title", "Unknown"),
-                            "year": item["metadata"].get("year", ""),
-                            "genres": item["metadata"].get("genres", "")
-                        })
-                        if len(similar_movies) >= 3:
-                            break
-
-                context["similar_movies"] = similar_movies
-            else:
-                context["similar_movies"] = []
-
+            similar_movies = await self._similar_from_neighbors(movie_id)
+            if similar_movies is None:
+                similar_movies = await self.run_cpu(self._similar_from_embeddings, movie_id)
+            context["similar_movies"] = similar_movies
         except Exception as e:
-            logger.warning(f"ChromaDB query failed: {e}")
+            logger.warning(f"Similar movie retrieval failed: {e}")
             context["similar_movies"] = []
 
         # Determine recommendation strategy
@@ -272,6 +250,61 @@ class ExplanationService:
 
         return context
 
+    async def _similar_from_neighbors(self, movie_id: int, limit: int = 3) -> list[dict[str, Any]] | None:
+        """
+        Get similar movies from the precomputed neighbor tables.
+
+        Titles, years and genres come from the embedding store's metadata,
+        so a lookup costs no TMDB calls.
+
+        Returns:
+            Up to `limit` {title, year, genres} dicts, or None if the movie
+            has no neighbors in the tables
+        """
+        if self.neighbor_index is None:
+            return None
+        neighbors = self.neighbor_index.similar(movie_id, source="blended", k=limit)
+        if not neighbors:
+            return None
+
+        results = await self.run_cpu(
+            self.embedding_store.get_by_ids, [str(n["movie_id"]) for n in neighbors]
+        )
+        metadata_by_id = dict(zip(results["ids"], results["metadatas"]))
+        similar_movies = []
+        for neighbor in neighbors:
+            metadata = metadata_by_id.get(str(neighbor["movie_id"]))
+            if metadata is None:
+                continue
+            similar_movies.append({
+                "title": metadata.get("title", "Unknown"),
+                "year": metadata.get("year", ""),
+                "genres": metadata.get("genres", "")
+            })
+        return similar_movies or None
+
+    def _similar_from_embeddings(self, movie_id: int, limit: int = 3) -> list[dict[str, Any]]:
+        """Query the embedding store for movies similar to the given one (used when it has no neighbor row)."""
+        movie_results = self.embedding_store.get_by_ids([str(movie_id)])
+        embeddings = movie_results.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return []
+
+        similar = self.embedding_store.query_similar(embeddings[0], n_results=limit + 1)
+
+        # Exclude the query movie itself
+        similar_movies = []
+        for item in similar:
+            if item["id"] != str(movie_id):
+                similar_movies.append({
+                    "title": item["metadata"].get("title", "Unknown"),
+                    "year": item["metadata"].get("year", ""),
+                    "genres": item["metadata"].get("genres", "")
+                })
+                if len(similar_movies) >= limit:
+                    break
+        return similar_movies
+
     def _extract_director(self, movie_data: dict[str, Any]) -> str:
         """Extract director name from TMDB movie data."""
         try:
@@ -411,7 +444,7 @@ Valid factors: "content_similarity", "collaborative_filtering", "genre_match", "
             "cached": False
         }
 
-    def _store_cache(
+    async def _store_cache(
         self,
         user_id: str,
         movie_id: int,
@@ -426,14 +459,15 @@ Valid factors: "content_similarity", "collaborative_filtering", "genre_match", "
             result: Explanation result to cache
         """
         try:
-            self.supabase.table("ai_explanations").upsert({
-                "user_id": user_id,
-                "movie_id": movie_id,
-                "explanation": result["explanation"],
-                "factors": result["factors"],
-                "generated_at": datetime.utcnow().isoformat(),
-                "expires_at": (datetime.utcnow() + timedelta(days=7)).isoformat()
-            }).execute()
+            generated_at = datetime.utcnow()
+            await self.data_access.upsert_explanation(
+                user_id=user_id,
+                movie_id=movie_id,
+                explanation=result["explanation"],
+                factors=result["factors"],
+                generated_at=generated_at,
+                expires_at=generated_at + timedelta(days=7),
+            )
 
             logger.info(f"Cached explanation for user {user_id}, movie {movie_id}")
 
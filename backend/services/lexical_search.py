@@ -0,0 +1,237 @@
+"""
+BM25 lexical search over the movie text representations.
+
+ml/build_lexical_index.py tokenizes the same text that embeddings are built
+from (title, overview, genres, director, top cast; see
+build_text_representation) and writes ml/models/lexical_index.npz. The
+index is a term -> movie CSR matrix whose values are precomputed BM25
+weights, so a query is a few postings-row slices summed into one score
+array. The vocabulary, postings and result metadata columns are plain
+numpy arrays.
+
+Semantic search merges these rankings with the vector results by
+reciprocal rank fusion, and serves them alone when the sentence model
+is not loaded.
+"""
+import logging
+import re
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+
+from ml.embeddings.filters import MetadataFilterIndex, SearchFilters
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_INDEX_FILENAME = "lexical_index.npz"
+
+# Standard Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Case-folded word tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+def bm25_matrix(documents: list[str], k1: float = BM25_K1, b: float = BM25_B) -> tuple[np.ndarray, sp.csr_matrix]:
+    """
+    Build BM25 term weights for a corpus.
+
+    Args:
+        documents: One text per movie
+        k1: Term frequency saturation
+        b: Document length normalization
+
+    Returns:
+        (sorted vocabulary, (n_terms, n_docs) CSR matrix of BM25 weights)
+    """
+    tokenized = [tokenize(doc) for doc in documents]
+    vocabulary = np.array(sorted({token for tokens in tokenized for token in tokens}))
+    term_index = {term: i for i, term in enumerate(vocabulary)}
+
+    rows, cols = [], []
+    for doc, tokens in enumerate(tokenized):
+        rows.extend(term_index[token] for token in tokens)
+        cols.extend([doc] * len(tokens))
+    # Duplicate (term, doc) entries sum into term frequencies
+    tf = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(vocabulary), len(documents)),
+    )
+    tf.sum_duplicates()
+
+    doc_lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.float32)
+    avg_length = doc_lengths.mean() if len(doc_lengths) else 1.0
+    doc_freq = np.diff(tf.indptr).astype(np.float32)
+    idf = np.log(1 + (len(documents) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1e-9))
+    term_rows = np.repeat(np.arange(len(vocabulary)), np.diff(tf.indptr))
+    tf.data = idf[term_rows] * tf.data * (k1 + 1) / (tf.data + length_norm[tf.indices])
+    return vocabulary, tf
+
+
+def save_lexical_index(
+    path: Path,
+    movie_ids: list[int],
+    documents: list[str],
+    metadatas: list[dict[str, Any]],
+    generated_at: float,
+) -> None:
+    """
+    Build and write the BM25 index atomically.
+
+    Args:
+        path: Destination file
+        movie_ids: Catalog movie IDs, aligned with documents
+        documents: Text representations
+        metadatas: Metadata dicts (title, genres, year) for lexical-only results
+        generated_at: Unix timestamp of the build
+    """
+    vocabulary, weights = bm25_matrix(documents)
+    arrays = {
+        "movie_ids": np.asarray(movie_ids, dtype=np.int32),
+        "vocabulary": vocabulary,
+        "indptr": weights.indptr.astype(np.int64),
+        "indices": weights.indices.astype(np.int32),
+        "weights": weights.data.astype(np.float32),
+        "generated_at": np.array(generated_at),
+    }
+    for field in ("title", "genres", "year"):
+        arrays[field] = np.array([str(m.get(field, "")) for m in metadatas])
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    tmp_path.replace(path)
+
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = 60) -> list[tuple[int, float]]:
+    """
+    Merge ranked ID lists by reciprocal rank fusion.
+
+    Each list contributes 1 / (k + rank) per ID (rank starting at 1), so
+    agreement across lists outweighs a high rank in just one.
+
+    Args:
+        rankings: Ranked ID lists, best first
+        k: Damping constant (60 in the original RRF paper)
+
+    Returns:
+        (ID, fused score) pairs, best first; ties keep first-seen order
+    """
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda pair: -pair[1])
+
+
+class LexicalIndex:
+    """Read side of the BM25 index, fully loaded in memory."""
+
+    def __init__(self):
+        self.path: Path | None = None
+        self.generated_at: float | None = None
+        self.movie_ids = np.zeros(0, dtype=np.int32)
+        self._terms: dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._columns: dict[str, np.ndarray] = {}
+        self._filter_index = MetadataFilterIndex([], [])
+
+    def load(self, model_dir: str) -> None:
+        """
+        Load lexical_index.npz from model_dir if present (missing file = no lexical search).
+
+        Args:
+            model_dir: Directory containing lexical_index.npz
+        """
+        self.path = Path(model_dir) / LEXICAL_INDEX_FILENAME
+        if not self.path.exists():
+            logger.info("No lexical index found; run ml/build_lexical_index.py to enable hybrid search")
+            return
+        try:
+            with np.load(self.path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.error(f"Error loading lexical index: {e}")
+            return
+
+        self.movie_ids = arrays["movie_ids"]
+        self._terms = {str(term): i for i, term in enumerate(arrays["vocabulary"])}
+        self._indptr = arrays["indptr"]
+        self._indices = arrays["indices"]
+        self._weights = arrays["weights"]
+        self._columns = {field: arrays[field] for field in ("title", "genres", "year")}
+        self._filter_index = MetadataFilterIndex(self._columns["genres"], self._columns["year"])
+        self.generated_at = float(arrays["generated_at"])
+        logger.info(f"Loaded lexical index: {len(self.movie_ids)} movies, {len(self._terms)} terms")
+
+    def is_loaded(self) -> bool:
+        """Check if the index is loaded."""
+        return len(self.movie_ids) > 0
+
+    def version(self) -> str:
+        """Build timestamp, for search result cache keys."""
+        return f"{self.generated_at:.0f}" if self.generated_at is not None else "none"
+
+    def search(self, query: str, top_n: int = 10, filters: SearchFilters | None = None) -> list[dict[str, Any]]:
+        """
+        Rank movies by BM25 score for a query.
+
+        Args:
+            query: Search text
+            top_n: Max results
+            filters: Optional metadata constraints
+
+        Returns:
+            List of dicts with keys: movie_id, title, year, genres,
+            lexical_score (BM25 score divided by the best score, in (0, 1]);
+            only movies matching at least one query term
+        """
+        if not self.is_loaded():
+            return []
+        scores = np.zeros(len(self.movie_ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            row = self._terms.get(term)
+            if row is None:
+                continue
+            start, end = self._indptr[row], self._indptr[row + 1]
+            scores[self._indices[start:end]] += self._weights[start:end]
+
+        mask = self._filter_index.mask(filters)
+        if mask is not None:
+            scores[~mask] = 0.0
+        matched = np.flatnonzero(scores > 0)
+        metrics.inc("lexical_search_total", result="hit" if len(matched) else "miss")
+        if len(matched) > top_n:
+            matched = matched[np.argpartition(-scores[matched], top_n - 1)[:top_n]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        best = scores[matched[0]] if len(matched) else 1.0
+        return [
+            {
+                "movie_id": int(self.movie_ids[doc]),
+                "title": str(self._columns["title"][doc]),
+                "year": str(self._columns["year"][doc]),
+                "genres": str(self._columns["genres"][doc]),
+                "lexical_score": float(scores[doc] / best),
+            }
+            for doc in matched
+        ]
+
+    def status(self) -> dict[str, Any]:
+        """Index summary for /metrics."""
+        return {
+            "movies": len(self.movie_ids),
+            "terms": len(self._terms),
+            "generated_at": self.generated_at,
+        }
@@ -0,0 +1,105 @@
+"""
+In-process metrics registry.
+
+Counters, gauges and timing summaries keyed by name + labels, plus
+collectors that report component state (cache stats, queue depths) at
+snapshot time. Exposed as JSON by the /metrics endpoint.
+"""
+import threading
+from collections import deque
+from typing import Any, Callable
+
+
+def _key(name: str, labels: dict[str, Any]) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+class TimingSummary:
+    """Count/sum/max plus percentiles over a bounded window of recent samples."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    def snapshot(self) -> dict[str, float]:
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry (executor threads record timings too)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, TimingSummary] = {}
+        self._collectors: dict[str, Callable[[], Any]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Increment a counter."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a timing sample (seconds)."""
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._timings.get(key)
+            if summary is None:
+                summary = self._timings[key] = TimingSummary()
+            summary.observe(value)
+
+    def register_collector(self, name: str, collect: Callable[[], Any]) -> None:
+        """Register a callable whose return value is included in snapshots."""
+        self._collectors[name] = collect
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get all metrics as a JSON-serializable dict."""
+        with self._lock:
+            result = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {k: v.snapshot() for k, v in self._timings.items()},
+            }
+        collected = {}
+        for name, collect in self._collectors.items():
+            try:
+                collected[name] = collect()
+            except Exception as e:
+                collected[name] = {"error": str(e)}
+        result["collectors"] = collected
+        return result
+
+
+metrics = MetricsRegistry()
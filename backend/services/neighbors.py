@@ -0,0 +1,133 @@
+"""
+Precomputed item-to-item neighbor tables.
+
+ml/build_neighbors.py writes, for every catalog movie, its top-K most
+similar movies by TF-IDF content, sentence embeddings, SVD item factors
+and a blend of the three into ml/models/neighbors.npz. NeighborIndex
+serves "more like this" lookups from those arrays: a dict probe plus a
+row slice, with no similarity computation or vector-store query at
+request time.
+"""
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_FILENAME = "neighbors.npz"
+
+# "blended" combines whichever of the other sources were available at build time
+NEIGHBOR_SOURCES = ("tfidf", "embedding", "svd", "blended")
+
+
+def save_neighbors(
+    path: Path,
+    movie_ids: np.ndarray,
+    tables: dict[str, tuple[np.ndarray, np.ndarray]],
+    generated_at: float,
+) -> None:
+    """
+    Write neighbor tables atomically as a compressed .npz file.
+
+    Args:
+        path: Destination file
+        movie_ids: Catalog movie IDs, one per table row
+        tables: source -> (neighbor movie IDs, scores), both (n_movies, K);
+            rows shorter than K are padded with -1 IDs
+        generated_at: Unix timestamp of the build
+    """
+    arrays = {"movie_ids": np.asarray(movie_ids, dtype=np.int32), "generated_at": np.array(generated_at)}
+    for source, (neighbor_ids, scores) in tables.items():
+        arrays[f"{source}_ids"] = neighbor_ids.astype(np.int32)
+        arrays[f"{source}_scores"] = scores.astype(np.float16)
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    tmp_path.replace(path)
+
+
+class NeighborIndex:
+    """Read side of the neighbor tables, fully loaded in memory."""
+
+    def __init__(self):
+        self.path: Path | None = None
+        self.generated_at: float | None = None
+        self._row: dict[int, int] = {}
+        self._tables: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def load(self, model_dir: str) -> None:
+        """
+        Load neighbors.npz from model_dir if present (missing file = no lookups).
+
+        Args:
+            model_dir: Directory containing neighbors.npz
+        """
+        self.path = Path(model_dir) / NEIGHBORS_FILENAME
+        if not self.path.exists():
+            logger.info("No neighbor tables found; run ml/build_neighbors.py to enable similar movies")
+            return
+        try:
+            with np.load(self.path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.error(f"Error loading neighbor tables: {e}")
+            return
+
+        self._row = {int(movie_id): i for i, movie_id in enumerate(arrays["movie_ids"])}
+        self._tables = {
+            source: (arrays[f"{source}_ids"], arrays[f"{source}_scores"])
+            for source in NEIGHBOR_SOURCES
+            if f"{source}_ids" in arrays
+        }
+        self.generated_at = float(arrays["generated_at"])
+        logger.info(
+            f"Loaded neighbor tables for {len(self._row)} movies "
+            f"(sources: {', '.join(self._tables)})"
+        )
+
+    def is_loaded(self) -> bool:
+        """Check if any neighbor table is loaded."""
+        return bool(self._tables)
+
+    def sources(self) -> list[str]:
+        """Sources available in the loaded tables."""
+        return list(self._tables)
+
+    def similar(self, movie_id: int, source: str = "blended", k: int = 10) -> list[dict[str, Any]] | None:
+        """
+        Get a movie's precomputed nearest neighbors.
+
+        Args:
+            movie_id: TMDB movie ID
+            source: One of NEIGHBOR_SOURCES
+            k: Max neighbors to return (at most the K used at build time)
+
+        Returns:
+            List of {movie_id, score} dicts, most similar first, or None if
+            the movie or source is not in the tables
+        """
+        row = self._row.get(movie_id)
+        table = self._tables.get(source)
+        if row is None or table is None:
+            metrics.inc("neighbor_lookups_total", source=source, result="miss")
+            return None
+        metrics.inc("neighbor_lookups_total", source=source, result="hit")
+        neighbor_ids, scores = table
+        return [
+            {"movie_id": int(neighbor_id), "score": float(score)}
+            for neighbor_id, score in zip(neighbor_ids[row, :k], scores[row, :k])
+            if neighbor_id >= 0
+        ]
+
+    def status(self) -> dict[str, Any]:
+        """Table summary for /metrics."""
+        return {
+            "movies": len(self._row),
+            "sources": self.sources(),
+            "generated_at": self.generated_at,
+        }
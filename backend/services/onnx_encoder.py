@@ -0,0 +1,142 @@
+"""
+ONNX Runtime query encoder for semantic search.
+
+Runs an int8-quantized ONNX export of all-MiniLM-L6-v2 (produced by
+ml/export_onnx_encoder.py) with the Rust `tokenizers` tokenizer, then applies
+the same mean pooling and L2 normalization as the SentenceTransformer
+pipeline. Neither torch nor transformers is imported, which cuts import
+time and resident memory per worker; both runtime packages already ship
+as ChromaDB dependencies.
+
+encode() mirrors SentenceTransformer.encode for the arguments semantic
+search uses, so SemanticSearchService can hold either as `self.model`.
+"""
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENCODER_DIR = Path(__file__).resolve().parents[1] / "ml" / "models" / "onnx_encoder"
+MODEL_FILENAME = "model_int8.onnx"
+TOKENIZER_FILENAME = "tokenizer.json"
+CONFIG_FILENAME = "encoder.json"
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, normalize: bool = True) -> np.ndarray:
+    """
+    Average token embeddings over non-padding tokens, then L2-normalize.
+
+    Args:
+        token_embeddings: (batch, tokens, dim) transformer output
+        attention_mask: (batch, tokens) 1 for real tokens, 0 for padding
+        normalize: L2-normalize each pooled vector
+
+    Returns:
+        (batch, dim) float32 sentence embeddings
+    """
+    mask = attention_mask[..., None].astype(np.float32)
+    pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    if normalize:
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled.astype(np.float32)
+
+
+class OnnxQueryEncoder:
+    """Sentence encoder backed by an ONNX Runtime CPU session."""
+
+    def __init__(self, session, tokenizer, max_seq_length: int = 256, normalize: bool = True):
+        """
+        Args:
+            session: onnxruntime.InferenceSession over the exported transformer
+            tokenizer: tokenizers.Tokenizer for the same model
+            max_seq_length: Truncation length (the SentenceTransformer's max_seq_length)
+            normalize: L2-normalize embeddings (all-MiniLM-L6-v2 does)
+        """
+        self.session = session
+        self.tokenizer = tokenizer
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+        self.normalize = normalize
+        self.input_names = {i.name for i in session.get_inputs()}
+
+    @staticmethod
+    def exists(model_dir: str | Path | None = None) -> bool:
+        """Check whether an exported encoder is present."""
+        model_dir = Path(model_dir or ENCODER_DIR)
+        return (model_dir / MODEL_FILENAME).exists() and (model_dir / TOKENIZER_FILENAME).exists()
+
+    @classmethod
+    def load(cls, model_dir: str | Path | None = None, threads: int = 0) -> "OnnxQueryEncoder":
+        """
+        Load an exported encoder.
+
+        Args:
+            model_dir: Directory written by ml/export_onnx_encoder.py
+            threads: ONNX Runtime intra-op threads (0 = runtime default)
+
+        Returns:
+            Loaded encoder
+
+        Raises:
+            FileNotFoundError: If the export is missing
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir or ENCODER_DIR)
+        if not cls.exists(model_dir):
+            raise FileNotFoundError(f"No exported ONNX encoder in {model_dir}")
+        config_path = model_dir / CONFIG_FILENAME
+        config = json.loads(config_path.read_text()) if config_path.exists() else {}
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            str(model_dir / MODEL_FILENAME), options, providers=["CPUExecutionProvider"]
+        )
+        tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILENAME))
+        logger.info(f"Loaded ONNX query encoder from {model_dir}")
+        return cls(
+            session,
+            tokenizer,
+            max_seq_length=config.get("max_seq_length", 256),
+            normalize=config.get("normalize", True),
+        )
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        convert_to_numpy: bool = True,
+        batch_size: int = 32,
+    ) -> np.ndarray:
+        """
+        Encode one sentence or a list of sentences.
+
+        Args:
+            sentences: Text or list of texts
+            convert_to_numpy: Accepted for SentenceTransformer compatibility
+                              (results are always numpy)
+            batch_size: Texts per session run
+
+        Returns:
+            (dim,) array for a single text, else (len, dim)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batches = []
+        for start in range(0, len(texts), max(batch_size, 1)):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            feeds = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            batches.append(mean_pool(token_embeddings, feeds["attention_mask"], self.normalize))
+        embeddings = np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
@@ -0,0 +1,185 @@
+"""
+Precomputed recommendation store.
+
+Serves the ranked lists written by ml/precompute_recommendations.py. A
+user's entry is only used while it is fresh: its ratings fingerprint must
+equal the user's current one (so any rating added, changed or deleted
+since the batch run invalidates it) and its model version must match the
+loaded models. Otherwise the API falls back to online scoring.
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STORE_FILENAME = "precomputed_recommendations.npz"
+
+
+def save_store(
+    path: Path,
+    entries: list[dict[str, Any]],
+    model_version: str,
+    generated_at: float,
+) -> None:
+    """
+    Write a store atomically as a compressed .npz file.
+
+    Args:
+        path: Destination file
+        entries: Per-user dicts with user_id, fingerprint, total_ratings,
+            strategy and items [{movie_id, score}]
+        model_version: RecommenderService.model_version used for scoring
+        generated_at: Unix timestamp of the batch run
+    """
+    offsets = np.zeros(len(entries) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e["items"]) for e in entries])
+    movie_ids = np.fromiter(
+        (item["movie_id"] for e in entries for item in e["items"]), dtype=np.int32, count=offsets[-1]
+    )
+    scores = np.fromiter(
+        (item["score"] for e in entries for item in e["items"]), dtype=np.float32, count=offsets[-1]
+    )
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            user_ids=np.array([e["user_id"] for e in entries], dtype=str),
+            fingerprints=np.array([e["fingerprint"] for e in entries], dtype=str),
+            total_ratings=np.array([e["total_ratings"] for e in entries], dtype=np.int32),
+            strategies=np.array([e["strategy"] for e in entries], dtype=str),
+            offsets=offsets,
+            movie_ids=movie_ids,
+            scores=scores,
+            model_version=np.array(model_version),
+            generated_at=np.array(generated_at),
+        )
+    tmp_path.replace(path)
+
+
+class PrecomputedRecommendations:
+    """
+    Read side of the precomputed store, reloaded when the file changes.
+
+    Lookups are a dict probe plus an array slice, so serving a fresh user
+    costs no scoring at all.
+    """
+
+    def __init__(self, reload_interval: float = 300.0):
+        """
+        Args:
+            reload_interval: Min seconds between checks for a newer file
+        """
+        self.reload_interval = reload_interval
+        self.path: Path | None = None
+        self.model_version: str | None = None
+        self.generated_at: float | None = None
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+        self._index: dict[str, int] = {}
+        self._arrays: dict[str, np.ndarray] = {}
+
+    def load(self, model_dir: str) -> None:
+        """
+        Load the store from model_dir if present (missing store = online only).
+
+        Args:
+            model_dir: Directory containing precomputed_recommendations.npz
+        """
+        self.path = Path(model_dir) / STORE_FILENAME
+        self._checked_at = time.monotonic()
+        if not self.path.exists():
+            logger.info("No precomputed recommendations found; serving online scores only")
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+            with np.load(self.path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.error(f"Error loading precomputed recommendations: {e}")
+            return
+
+        self._arrays = arrays
+        self._index = {str(user_id): i for i, user_id in enumerate(arrays["user_ids"])}
+        self.model_version = str(arrays["model_version"])
+        self.generated_at = float(arrays["generated_at"])
+        self._mtime = mtime
+        logger.info(
+            f"Loaded precomputed recommendations for {len(self._index)} users "
+            f"(model {self.model_version})"
+        )
+
+    def maybe_reload(self) -> None:
+        """Reload if the store file changed (checked at most every reload_interval)."""
+        if self.path is None or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            self.load(str(self.path.parent))
+
+    def _entry(self, row: int) -> dict[str, Any]:
+        arrays = self._arrays
+        start, end = arrays["offsets"][row], arrays["offsets"][row + 1]
+        strategy = str(arrays["strategies"][row])
+        return {
+            "items": [
+                {"movie_id": int(movie_id), "score": float(score), "reason": strategy}
+                for movie_id, score in zip(arrays["movie_ids"][start:end], arrays["scores"][start:end])
+            ],
+            "strategy": strategy,
+            "total_ratings": int(arrays["total_ratings"][row]),
+        }
+
+    def lookup(
+        self,
+        user_id: str,
+        ratings_fingerprint: str,
+        model_version: str,
+    ) -> dict[str, Any] | None:
+        """
+        Get a user's precomputed list if it is still fresh.
+
+        Args:
+            user_id: User ID
+            ratings_fingerprint: Current SupabaseDataAccess.get_ratings_fingerprint()
+            model_version: Currently loaded RecommenderService.model_version
+
+        Returns:
+            {items, strategy, total_ratings}, or None if missing or stale
+        """
+        self.maybe_reload()
+        row = self._index.get(user_id)
+        if row is None:
+            metrics.inc("precomputed_lookups_total", result="miss")
+            return None
+        if (
+            self.model_version != model_version
+            or str(self._arrays["fingerprints"][row]) != ratings_fingerprint
+        ):
+            metrics.inc("precomputed_lookups_total", result="stale")
+            return None
+        metrics.inc("precomputed_lookups_total", result="hit")
+        return self._entry(row)
+
+    def lookup_stale(self, user_id: str) -> dict[str, Any] | None:
+        """Get a user's precomputed list regardless of freshness (degraded serving)."""
+        row = self._index.get(user_id)
+        return self._entry(row) if row is not None else None
+
+    def status(self) -> dict[str, Any]:
+        """Store summary for /metrics."""
+        return {
+            "users": len(self._index),
+            "model_version": self.model_version,
+            "generated_at": self.generated_at,
+        }
@@ -0,0 +1,98 @@
+"""
+Speculative prefetch of movie detail payloads.
+
+After recommendations are served, the top results' full detail payloads
+(credits + videos) are fetched into the TMDB cache in the background, so a
+click-through to the detail page is a cache hit.
+"""
+import asyncio
+import logging
+from typing import Any
+
+from config import settings
+from services.tmdb import TMDBService, details_cache_key, tmdb_cache
+
+logger = logging.getLogger(__name__)
+
+
+class DetailPrefetcher:
+    """
+    Bounded, deduplicated background queue of movie detail fetches.
+
+    Enqueueing never blocks the request path: IDs that are already cached or
+    queued are skipped, and IDs are dropped when the queue is full. The worker
+    fetches with low priority against the shared TMDB rate budget.
+    """
+
+    def __init__(self, tmdb_service: TMDBService, max_queue_size: int = settings.prefetch_queue_size):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            tmdb_service: TMDB service used for fetches
+            max_queue_size: Maximum number of pending prefetches
+        """
+        self.tmdb_service = tmdb_service
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=max_queue_size)
+        self._pending: set[int] = set()
+        self._task: asyncio.Task | None = None
+        self.stats = {"enqueued": 0, "deduplicated": 0, "dropped": 0, "fetched": 0, "errors": 0}
+
+    def enqueue(self, movie_ids: list[int]) -> int:
+        """
+        Queue detail prefetches without waiting.
+
+        Args:
+            movie_ids: Movie IDs in priority order
+
+        Returns:
+            Number of IDs actually queued
+        """
+        queued = 0
+        for movie_id in movie_ids:
+            if movie_id in self._pending or details_cache_key(movie_id) in tmdb_cache:
+                self.stats["deduplicated"] += 1
+                continue
+            try:
+                self._queue.put_nowait(movie_id)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+                continue
+            self._pending.add(movie_id)
+            queued += 1
+
+        self.stats["enqueued"] += queued
+        return queued
+
+    async def _run(self) -> None:
+        while True:
+            movie_id = await self._queue.get()
+            try:
+                if details_cache_key(movie_id) not in tmdb_cache:
+                    await self.tmdb_service.get_movie_details(movie_id, low_priority=True)
+                    self.stats["fetched"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Prefetch failed for movie {movie_id}: {e}")
+            finally:
+                self._pending.discard(movie_id)
+                self._queue.task_done()
+
+    def status(self) -> dict[str, Any]:
+        """Get queue depth and counters."""
+        return {"queue_depth": self._queue.qsize(), **self.stats}
+
+    def start(self) -> None:
+        """Start the prefetch worker as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the prefetch worker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
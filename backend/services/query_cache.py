@@ -0,0 +1,155 @@
+"""
+Two-level cache for semantic search.
+
+Level 1 maps a normalized query string to its float32 query embedding
+(LRU bounded by bytes), so repeated and near-identical queries skip
+SentenceTransformer inference. It stays per worker: it is read and written
+on the executor threads inside the encode path, so it must be synchronous
+and thread-safe, and a hit costs a dict lookup where a shared-tier round
+trip would cost a sizeable fraction of the encode it saves.
+
+Level 2 maps (normalized query, top_n, index version) to the ranked
+results, so popular queries skip the vector query too. It is a SharedCache,
+so with REDIS_URL set a result ranked by one worker serves every worker.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from services.metrics import metrics
+from services.shared_cache import RedisTier, SharedCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache lookups and encoding.
+
+    Case-folds, collapses whitespace and strips surrounding punctuation.
+    all-MiniLM-L6-v2 lowercases its input anyway, so the normalized form
+    encodes to the same embedding as the original.
+    """
+    return _WHITESPACE.sub(" ", query.casefold()).strip(" \t\n.,;:!?\"'")
+
+
+class EmbeddingLRU:
+    """Thread-safe LRU of query embeddings bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Max bytes of embeddings plus keys held at once
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size(key: str, embedding: np.ndarray) -> int:
+        return embedding.nbytes + len(key)
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Get an embedding and mark it recently used."""
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def set(self, key: str, embedding: np.ndarray) -> None:
+        """Store an embedding (as float32), evicting least recently used entries."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        size = self._size(key, embedding)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(key, old)
+            self._entries[key] = embedding
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old = self._entries.popitem(last=False)
+                self._bytes -= self._size(old_key, old)
+
+    def stats(self) -> dict[str, Any]:
+        """Get entry count, bytes used and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class SemanticQueryCache:
+    """Query-embedding cache plus ranked-result cache for semantic search."""
+
+    def __init__(
+        self,
+        embedding_max_bytes: int,
+        result_max_entries: int,
+        result_ttl: float,
+        remote: RedisTier | None = None,
+    ):
+        """
+        Args:
+            embedding_max_bytes: Byte budget of the embedding level
+            result_max_entries: Max cached result lists per worker
+            result_ttl: Seconds a result list stays valid
+            remote: Shared tier for the result level, or None for local-only
+        """
+        self.embeddings = EmbeddingLRU(embedding_max_bytes)
+        self.results = SharedCache(
+            "search_results", max_entries=result_max_entries, default_ttl=result_ttl, remote=remote
+        )
+
+    def get_embedding(self, query: str) -> np.ndarray | None:
+        """Get the cached embedding of a normalized query."""
+        embedding = self.embeddings.get(query)
+        metrics.inc(
+            "semantic_search_cache_total",
+            level="embedding",
+            result="miss" if embedding is None else "hit",
+        )
+        return embedding
+
+    def set_embedding(self, query: str, embedding: np.ndarray) -> None:
+        """Cache the embedding of a normalized query."""
+        self.embeddings.set(query, embedding)
+
+    @staticmethod
+    def _results_key(query: str, top_n: int, index_version: str) -> str:
+        return f"{index_version}\x1f{top_n}\x1f{query}"
+
+    async def get_results(self, query: str, top_n: int, index_version: str) -> list[dict] | None:
+        """Get cached ranked results (a fresh list; entries are shared)."""
+        results = await self.results.get(self._results_key(query, top_n, index_version))
+        metrics.inc(
+            "semantic_search_cache_total",
+            level="results",
+            result="miss" if results is None else "hit",
+        )
+        return list(results) if results is not None else None
+
+    async def set_results(self, query: str, top_n: int, index_version: str, results: list[dict]) -> None:
+        """Cache ranked results for a normalized query."""
+        await self.results.set(self._results_key(query, top_n, index_version), list(results))
+
+    def stats(self) -> dict[str, Any]:
+        """Hit rates and sizes of both levels for /metrics."""
+        return {"embedding": self.embeddings.stats(), "results": self.results.stats()}
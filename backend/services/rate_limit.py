@@ -0,0 +1,73 @@
+"""
+Token bucket rate limiting for outbound API budgets.
+
+A bucket refills continuously at `rate` tokens per second up to `capacity`.
+Callers can hold back a `reserve` of tokens so background work (cache
+warming, prefetching) only spends budget that user-facing requests don't need.
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Continuous-refill token bucket for use on the asyncio event loop."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def available(self) -> float:
+        """Get the number of tokens currently in the bucket."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0, reserve: float = 0.0) -> bool:
+        """
+        Take tokens without waiting.
+
+        Args:
+            tokens: Number of tokens to take
+            reserve: Tokens that must remain in the bucket afterwards
+
+        Returns:
+            True if tokens were taken, False otherwise
+        """
+        self._refill()
+        reserve = min(reserve, self.capacity - tokens)
+        if self._tokens - tokens >= reserve:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1.0, reserve: float = 0.0) -> float:
+        """Get seconds until try_acquire(tokens, reserve) could succeed."""
+        self._refill()
+        reserve = min(reserve, self.capacity - tokens)
+        deficit = tokens + reserve - self._tokens
+        return max(0.0, deficit / self.rate) if self.rate > 0 else float("inf")
+
+    async def acquire(self, tokens: float = 1.0, reserve: float = 0.0) -> None:
+        """
+        Take tokens, sleeping until enough have refilled.
+
+        Args:
+            tokens: Number of tokens to take
+            reserve: Tokens that must remain in the bucket afterwards
+        """
+        while not self.try_acquire(tokens, reserve):
+            await asyncio.sleep(self.retry_after(tokens, reserve))
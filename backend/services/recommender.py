@@ -4,6 +4,7 @@ Recommender service for content-based movie recommendations.
 Uses pre-computed TF-IDF matrix and user rating profiles to generate
 personalized recommendations via cosine similarity.
 """
+import hashlib
 import joblib
 import numpy as np
 import random
@@ -14,6 +15,36 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# TMDB genre ID -> genre term as it appears in the TF-IDF vocabulary
+# (build_model.py folds genre names into each movie's text)
+TMDB_GENRE_TERMS: dict[int, str] = {
+    28: "action",
+    12: "adventure",
+    16: "animation",
+    35: "comedy",
+    80: "crime",
+    99: "documentary",
+    18: "drama",
+    10751: "family",
+    14: "fantasy",
+    36: "history",
+    27: "horror",
+    10402: "music",
+    9648: "mystery",
+    10749: "romance",
+    878: "science fiction",
+    10770: "tv movie",
+    53: "thriller",
+    10752: "war",
+    37: "western",
+}
+
+
+def diversity_seed_for(user_id: str, ratings_fingerprint: str) -> int:
+    """Derive a stable exploration seed: same user + ratings = same diversity picks."""
+    digest = hashlib.blake2b(f"{user_id}:{ratings_fingerprint}".encode(), digest_size=4)
+    return int.from_bytes(digest.digest(), "big")
+
 
 class RecommenderService:
     """
@@ -31,6 +62,35 @@ class RecommenderService:
         self.movie_id_to_index = None
         self.svd_model = None
         self.cf_trainset = None
+        self.content_model_version = None
+        self.cf_model_version = None
+        self.genre_masks: dict[int, np.ndarray] = {}
+        self.cf_item_inner_ids = None
+        self.embedding_matrix = None
+        self.embedding_weight = 0.0
+        self.embedding_model_version = None
+
+    @staticmethod
+    def _hash_files(paths: list[Path]) -> str:
+        """Content hash of model artifacts, used as a model version."""
+        digest = hashlib.blake2b(digest_size=6)
+        for path in paths:
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    @property
+    def model_version(self) -> str:
+        """
+        Version of the loaded models (changes when any artifact changes).
+
+        Returns:
+            "<content version>-<cf version>", with "none" for unloaded models,
+            plus "-<embedding version>" when the embedding scorer is loaded
+        """
+        version = f"{self.content_model_version or 'none'}-{self.cf_model_version or 'none'}"
+        if self.embedding_model_version is not None:
+            version += f"-{self.embedding_model_version}"
+        return version
 
     def load_model(self, model_dir: str) -> None:
         """
@@ -60,11 +120,14 @@ class RecommenderService:
             self.vectorizer = joblib.load(vectorizer_path)
             self.tfidf_matrix = joblib.load(matrix_path)
             self.movie_ids = joblib.load(ids_path)
+            self.content_model_version = self._hash_files([matrix_path, ids_path])
 
             # Build index mapping for fast lookup
             self.movie_id_to_index = {
                 movie_id: idx for idx, movie_id in enumerate(self.movie_ids)
             }
+            self._build_genre_masks()
+            self._index_cf_items()
 
             logger.info(
                 f"Recommender model loaded successfully. "
@@ -78,6 +141,8 @@ class RecommenderService:
             self.tfidf_matrix = None
             self.movie_ids = None
             self.movie_id_to_index = None
+            self.content_model_version = None
+            self.genre_masks = {}
 
     def is_loaded(self) -> bool:
         """
@@ -93,6 +158,32 @@ class RecommenderService:
             self.movie_id_to_index is not None
         ])
 
+    def _build_genre_masks(self) -> None:
+        """Precompute a boolean catalog mask per TMDB genre from TF-IDF genre terms."""
+        vocabulary = self.vectorizer.vocabulary_
+        self.genre_masks = {}
+        for genre_id, term in TMDB_GENRE_TERMS.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                self.genre_masks[genre_id] = self.tfidf_matrix[:, column].toarray().ravel() > 0
+
+    def genre_mask(self, genre_ids: list[int]) -> np.ndarray:
+        """
+        Get a catalog mask of movies matching any of the given genres.
+
+        Args:
+            genre_ids: TMDB genre IDs
+
+        Returns:
+            Boolean array aligned with movie_ids
+        """
+        mask = np.zeros(len(self.movie_ids), dtype=bool)
+        for genre_id in genre_ids:
+            genre = self.genre_masks.get(genre_id)
+            if genre is not None:
+                mask |= genre
+        return mask
+
     def build_user_profile(self, ratings: list[dict]) -> Optional[np.ndarray]:
         """
         Build user taste profile from ratings.
@@ -185,6 +276,43 @@ class RecommenderService:
 
         return candidates[:top_n]
 
+    def content_recommendations(self, ratings: list[dict], top_n: int = 10) -> list[dict]:
+        """
+        Content-based recommendations with the embedding source mixed in.
+
+        The content-only hybrid path (no CF weight or no CF model): scores
+        are (1 - w) * content + w * embedding with w = embedding_weight, the
+        same fusion the CF path applies. Identical to get_recommendations
+        when the embedding scorer is not loaded.
+
+        Args:
+            ratings: List of {movie_id: int, rating: float} dicts
+            top_n: Number of recommendations to return
+
+        Returns:
+            List of {movie_id: int, score: float} dicts, sorted by score descending
+        """
+        embedding_scores = self.get_embedding_scores(ratings)
+        if embedding_scores is None:
+            return self.get_recommendations(ratings, top_n)
+
+        user_profile = self.build_user_profile(ratings)
+        if user_profile is None:
+            return []
+        content_scores = cosine_similarity(user_profile, self.tfidf_matrix).flatten()
+        beta = self.embedding_weight
+        scores = (1 - beta) * content_scores + beta * embedding_scores
+        scores[[
+            self.movie_id_to_index[r["movie_id"]]
+            for r in ratings if r.get("movie_id") in self.movie_id_to_index
+        ]] = -np.inf
+
+        top = np.argsort(-scores, kind="stable")[:top_n]
+        return [
+            {"movie_id": self.movie_ids[idx], "score": float(scores[idx])}
+            for idx in top if np.isfinite(scores[idx])
+        ]
+
     def get_popular_fallback(self, top_n: int = 10) -> list[int]:
         """
         Get popular movies as fallback for cold-start users.
@@ -229,6 +357,8 @@ class RecommenderService:
         try:
             self.svd_model = joblib.load(svd_path)
             self.cf_trainset = joblib.load(trainset_path)
+            self.cf_model_version = self._hash_files([svd_path])
+            self._index_cf_items()
 
             logger.info(
                 f"Collaborative filtering model loaded successfully. "
@@ -241,6 +371,8 @@ class RecommenderService:
             # Reset to None on error
             self.svd_model = None
             self.cf_trainset = None
+            self.cf_model_version = None
+            self.cf_item_inner_ids = None
 
     def is_collaborative_loaded(self) -> bool:
         """
@@ -274,6 +406,168 @@ class RecommenderService:
         else:
             return 0.7
 
+    def _index_cf_items(self) -> None:
+        """Map each catalog index to its SVD inner item ID (-1 if not in the trainset)."""
+        if self.movie_ids is None or not self.is_collaborative_loaded():
+            return
+        trainset = self.svd_model.trainset
+        inner_ids = np.full(len(self.movie_ids), -1, dtype=np.int64)
+        for idx, movie_id in enumerate(self.movie_ids):
+            try:
+                inner_ids[idx] = trainset.to_inner_iid(movie_id)
+            except ValueError:
+                pass
+        self.cf_item_inner_ids = inner_ids
+
+    def predict_cf_vector(self, user_id: str) -> Optional[np.ndarray]:
+        """
+        Predict the user's rating for every catalog movie in one pass.
+
+        Mirrors SVD.predict (global mean + biases + qi . pu, clipped to the
+        rating scale) with array operations instead of one predict() call
+        per movie. Impossible predictions get the neutral 3.0 fallback.
+
+        Args:
+            user_id: User ID (Supabase UUID or "ml_X" for MovieLens users)
+
+        Returns:
+            Array of raw rating estimates aligned with movie_ids, or None if
+            either model is not loaded
+        """
+        if not self.is_loaded() or not self.is_collaborative_loaded():
+            return None
+        if self.cf_item_inner_ids is None:
+            self._index_cf_items()
+
+        svd = self.svd_model
+        trainset = svd.trainset
+        try:
+            inner_uid = trainset.to_inner_uid(user_id)
+        except ValueError:
+            inner_uid = None
+
+        inner_iids = self.cf_item_inner_ids
+        known_items = inner_iids >= 0
+        known_iids = inner_iids[known_items]
+
+        if svd.biased:
+            estimates = np.full(len(inner_iids), trainset.global_mean)
+            if inner_uid is not None:
+                estimates += svd.bu[inner_uid]
+                estimates[known_items] += svd.qi[known_iids] @ svd.pu[inner_uid]
+            estimates[known_items] += svd.bi[known_iids]
+        else:
+            estimates = np.full(len(inner_iids), 3.0)
+            if inner_uid is not None:
+                estimates[known_items] = svd.qi[known_iids] @ svd.pu[inner_uid]
+
+        low, high = trainset.rating_scale
+        return np.clip(estimates, low, high)
+
+    def load_embeddings(self, movie_ids: list[int], embeddings: np.ndarray, weight: float) -> None:
+        """
+        Load sentence embeddings as a third hybrid scoring source.
+
+        Rows are aligned with the TF-IDF catalog and L2-normalized into one
+        float32 matrix, so scoring the catalog is a single mat-vec.
+        Catalog movies without an embedding get a zero row (neutral score).
+
+        Args:
+            movie_ids: Movie ID for each embedding row
+            embeddings: (n, dim) embedding vectors
+            weight: Fusion weight of the embedding score in hybrid ranking
+        """
+        if not self.is_loaded() or len(movie_ids) == 0:
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        matrix = np.zeros((len(self.movie_ids), embeddings.shape[1]), dtype=np.float32)
+        for movie_id, vector in zip(movie_ids, embeddings):
+            idx = self.movie_id_to_index.get(movie_id)
+            if idx is not None:
+                matrix[idx] = vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+        self.embedding_matrix = matrix
+        self.embedding_weight = weight
+        # Versioned by the vectors as stored, so every process reading the same
+        # store agrees; the renormalized matrix's bytes can differ in the last bit
+        digest = hashlib.blake2b(np.asarray(movie_ids, dtype=np.int64).tobytes(), digest_size=6)
+        digest.update(embeddings.tobytes())
+        digest.update(str(weight).encode())
+        self.embedding_model_version = digest.hexdigest()
+        logger.info(
+            f"Embedding scorer loaded: {int((norms > 0).sum())}/{len(self.movie_ids)} movies, "
+            f"weight {weight}"
+        )
+
+    def load_embeddings_from_store(self, embedding_store, weight: float) -> None:
+        """
+        Load embeddings from an EmbeddingStore (failures leave the scorer off).
+
+        Args:
+            embedding_store: Object with get_all_embeddings() -> (movie_ids, matrix)
+            weight: Fusion weight (0 skips loading)
+        """
+        if weight <= 0:
+            return
+        try:
+            movie_ids, embeddings = embedding_store.get_all_embeddings()
+        except Exception as e:
+            logger.warning(f"Embedding scorer disabled, could not read embeddings: {e}")
+            return
+        self.load_embeddings(movie_ids, embeddings, weight)
+
+    def is_embedding_loaded(self) -> bool:
+        """Check if the embedding scorer is loaded and weighted into hybrid ranking."""
+        return self.embedding_matrix is not None and self.embedding_weight > 0
+
+    def build_embedding_profile(self, ratings: list[dict]) -> Optional[np.ndarray]:
+        """
+        Build a unit-length user vector in embedding space.
+
+        Each rated movie's embedding is weighted by (rating - 3), so liked
+        movies pull the vector toward them and disliked ones push it away.
+
+        Args:
+            ratings: List of {movie_id: int, rating: float} dicts
+
+        Returns:
+            (dim,) float32 vector, or None without usable ratings
+        """
+        if self.embedding_matrix is None:
+            return None
+        indices, weights = [], []
+        for r in ratings:
+            idx = self.movie_id_to_index.get(r.get("movie_id"))
+            if idx is not None and r.get("rating", 3.0) != 3.0:
+                indices.append(idx)
+                weights.append(r["rating"] - 3.0)
+        if not indices:
+            return None
+        profile = np.asarray(weights, dtype=np.float32) @ self.embedding_matrix[indices]
+        norm = np.linalg.norm(profile)
+        return profile / norm if norm > 0 else None
+
+    def get_embedding_scores(self, ratings: list[dict]) -> Optional[np.ndarray]:
+        """
+        Score the whole catalog against the user's embedding profile.
+
+        Args:
+            ratings: List of {movie_id: int, rating: float} dicts
+
+        Returns:
+            Scores in 0-1 (cosine mapped from [-1, 1]; 0.5 for movies
+            without an embedding) aligned with movie_ids, or None if the
+            scorer is not loaded or the ratings give no profile
+        """
+        if not self.is_embedding_loaded():
+            return None
+        profile = self.build_embedding_profile(ratings)
+        if profile is None:
+            return None
+        return (self.embedding_matrix @ profile + 1.0) / 2.0
+
     def get_cf_scores(self, user_id: str, candidate_movie_ids: list[int]) -> dict[int, float]:
         """
         Get collaborative filtering scores for candidate movies.
@@ -288,8 +582,14 @@ class RecommenderService:
         if not self.is_collaborative_loaded():
             return {}
 
+        estimates = self.predict_cf_vector(user_id)
+
         predictions = {}
         for movie_id in candidate_movie_ids:
+            idx = self.movie_id_to_index.get(movie_id) if estimates is not None else None
+            if idx is not None:
+                predictions[movie_id] = float(estimates[idx])
+                continue
             try:
                 pred = self.svd_model.predict(user_id, movie_id)
                 # If prediction was impossible (user/item not in trainset), use neutral fallback
@@ -324,7 +624,8 @@ class RecommenderService:
         user_ratings: list[dict],
         hybrid_scores: dict[int, float],
         rated_ids: set,
-        num_picks: int
+        num_picks: int,
+        rng: random.Random | None = None
     ) -> list[dict]:
         """
         Get diversity/exploration picks from mid-ranked movies.
@@ -337,6 +638,7 @@ class RecommenderService:
             hybrid_scores: Dict of movie_id -> hybrid_score
             rated_ids: Set of already-rated movie IDs
             num_picks: Number of diversity picks to return
+            rng: Random generator (seeded for reproducible picks)
 
         Returns:
             List of {movie_id: int, score: float} dicts
@@ -364,7 +666,7 @@ class RecommenderService:
 
         # Sample randomly from mid-range
         sample_size = min(num_picks, len(mid_range))
-        sampled = random.sample(mid_range, sample_size)
+        sampled = (rng or random).sample(mid_range, sample_size)
 
         return [{"movie_id": movie_id, "score": score} for movie_id, score in sampled]
 
@@ -373,7 +675,9 @@ class RecommenderService:
         user_id: str,
         ratings: list[dict],
         top_n: int = 10,
-        diversity_ratio: float = 0.15
+        diversity_ratio: float = 0.15,
+        diversity_seed: int | None = None,
+        page_size: int | None = None
     ) -> tuple[list[dict], str]:
         """
         Get hybrid recommendations combining content-based and collaborative filtering.
@@ -383,6 +687,10 @@ class RecommenderService:
         - 5-19 ratings: Content-heavy hybrid (alpha = 0.0-0.3)
         - 20+ ratings: Collaborative-heavy hybrid (alpha = 0.7)
 
+        When the embedding scorer is loaded, its catalog scores are mixed in
+        with weight embedding_weight: (1 - w) * hybrid + w * embedding, on
+        the content-only path too.
+
         Includes diversity injection (10-20% exploration picks).
 
         Args:
@@ -390,6 +698,11 @@ class RecommenderService:
             ratings: List of {movie_id: int, rating: float} dicts
             top_n: Number of recommendations to return
             diversity_ratio: Fraction of recommendations to use for exploration (default 0.15)
+            diversity_seed: Seed for exploration picks; the same seed and ratings
+                give the same list (None = random)
+            page_size: Size of the first page when ranking a long list for
+                pagination; exploration picks are placed within it and the
+                rest follows in score order (default: top_n)
 
         Returns:
             Tuple of (recommendations_list, strategy_string)
@@ -401,9 +714,10 @@ class RecommenderService:
         # Calculate fusion weight
         alpha = self.calculate_alpha(len(ratings))
 
-        # If alpha is 0 or CF model not loaded, fall back to pure content-based
+        # If alpha is 0 or CF model not loaded, fall back to content-based
+        # (still fused with the embedding source when it is loaded)
         if alpha == 0.0 or not self.is_collaborative_loaded():
-            recommendations = self.get_recommendations(ratings, top_n)
+            recommendations = self.content_recommendations(ratings, top_n)
             return (recommendations, "content_based")
 
         # Build user profile for content-based scores
@@ -411,7 +725,7 @@ class RecommenderService:
 
         if user_profile is None:
             # No high ratings - fall back to content-based
-            recommendations = self.get_recommendations(ratings, top_n)
+            recommendations = self.content_recommendations(ratings, top_n)
             return (recommendations, "content_based")
 
         # Get content-based scores for all unrated movies
@@ -430,19 +744,27 @@ class RecommenderService:
         # Get CF scores for the same movies
         cf_scores = self.get_cf_scores(user_id, list(content_scores.keys()))
 
-        # Compute hybrid scores: (1 - alpha) * content + alpha * cf
+        # Semantic scores from the sentence embeddings (optional third source)
+        embedding_scores = self.get_embedding_scores(ratings)
+        beta = self.embedding_weight if embedding_scores is not None else 0.0
+
+        # Compute hybrid scores: (1 - alpha) * content + alpha * cf, then mix in embeddings
         hybrid_scores = {}
         for movie_id in content_scores.keys():
             content_score = content_scores[movie_id]
             cf_score = cf_scores.get(movie_id, 0.5)  # Fallback to neutral if missing
             hybrid_scores[movie_id] = (1 - alpha) * content_score + alpha * cf_score
+            if beta > 0.0:
+                embedding_score = float(embedding_scores[self.movie_id_to_index[movie_id]])
+                hybrid_scores[movie_id] = (1 - beta) * hybrid_scores[movie_id] + beta * embedding_score
 
         # Sort by hybrid score descending
         sorted_candidates = sorted(hybrid_scores.items(), key=lambda x: x[1], reverse=True)
 
-        # Split into exploit and explore
-        num_explore = max(1, int(top_n * diversity_ratio))
-        num_exploit = top_n - num_explore
+        # Split the first page into exploit and explore
+        page_size = min(page_size or top_n, top_n)
+        num_explore = max(1, int(page_size * diversity_ratio))
+        num_exploit = page_size - num_explore
 
         # Take top exploit picks
         exploit_picks = [
@@ -451,12 +773,156 @@ class RecommenderService:
         ]
 
         # Get diversity picks from mid-ranked range
-        explore_picks = self.get_diversity_picks(ratings, hybrid_scores, rated_movie_ids, num_explore)
+        explore_picks = self.get_diversity_picks(
+            ratings, hybrid_scores, rated_movie_ids, num_explore, rng=random.Random(diversity_seed)
+        )
 
-        # Combine
+        # Combine, then continue in score order past the first page
         recommendations = exploit_picks + explore_picks
+        if top_n > page_size:
+            shown = {item["movie_id"] for item in recommendations}
+            recommendations += [
+                {"movie_id": movie_id, "score": score}
+                for movie_id, score in sorted_candidates
+                if movie_id not in shown
+            ][:top_n - len(recommendations)]
 
         # Determine strategy string
         strategy = "hybrid_content_heavy" if alpha < 0.5 else "hybrid_collaborative_heavy"
 
         return (recommendations, strategy)
+
+    @staticmethod
+    def _top_unused(scores: np.ndarray, k: int, used: set[int]) -> list[int]:
+        """Indices of the k best finite scores, skipping indices already used."""
+        n_candidates = min(len(scores), k + len(used))
+        if n_candidates <= 0:
+            return []
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        picked = []
+        for idx in candidates:
+            if len(picked) == k or not np.isfinite(scores[idx]):
+                break
+            if int(idx) not in used:
+                picked.append(int(idx))
+        return picked
+
+    def compute_rows(
+        self,
+        user_id: str,
+        ratings: list[dict],
+        masked_rows: list[dict],
+        per_row: int = 10,
+        num_seeds: int = 2
+    ) -> tuple[list[dict], str]:
+        """
+        Score every home-page row for a user in one vectorized pass.
+
+        The user profile and the TF-IDF vectors of up to `num_seeds` of the
+        user's favourite movies are stacked into one query matrix, so a
+        single cosine_similarity call scores the whole catalog for "for you"
+        and every "because you liked" row. Genre/mood rows reuse the
+        personalized scores under a genre mask. Rated movies are excluded
+        and each movie appears in at most one row (rows are filled in order).
+
+        Args:
+            user_id: User ID for collaborative filtering
+            ratings: List of {movie_id: int, rating: float} dicts
+            masked_rows: Genre-filtered rows as {id, kind, genre_ids} dicts
+            per_row: Max movies per row
+            num_seeds: Max "because you liked" rows
+
+        Returns:
+            Tuple of (rows, strategy). Each row is {id, kind, seed_movie_id,
+            items: [{movie_id, score}]}; empty rows are omitted.
+        """
+        if not self.is_loaded():
+            return ([], "popularity_fallback")
+
+        n_movies = len(self.movie_ids)
+        rated_indices = [
+            self.movie_id_to_index[r["movie_id"]]
+            for r in ratings if r.get("movie_id") in self.movie_id_to_index
+        ]
+        seed_indices = [
+            self.movie_id_to_index[r["movie_id"]]
+            for r in sorted(ratings, key=lambda r: r.get("rating", 0), reverse=True)
+            if r.get("rating", 0) >= 4.0 and r.get("movie_id") in self.movie_id_to_index
+        ][:num_seeds]
+
+        user_profile = self.build_user_profile(ratings)
+        alpha = self.calculate_alpha(len(ratings))
+
+        if user_profile is None:
+            # No usable taste profile: rank by corpus (TMDB popularity) order
+            base_scores = 1.0 - np.arange(n_movies) / n_movies
+            seed_scores = np.empty((0, n_movies))
+            strategy = "popularity_fallback"
+        else:
+            queries = np.vstack([
+                np.asarray(user_profile),
+                self.tfidf_matrix[seed_indices].toarray(),
+            ])
+            similarities = cosine_similarity(queries, self.tfidf_matrix)
+            base_scores = similarities[0]
+            seed_scores = similarities[1:]
+            strategy = "content_based"
+
+            cf_estimates = self.predict_cf_vector(user_id) if alpha > 0.0 else None
+            if cf_estimates is not None:
+                unrated = np.ones(n_movies, dtype=bool)
+                unrated[rated_indices] = False
+                low, high = cf_estimates[unrated].min(), cf_estimates[unrated].max()
+                cf_scores = (
+                    (cf_estimates - low) / (high - low) if high > low
+                    else np.full(n_movies, 0.5)
+                )
+                base_scores = (1 - alpha) * base_scores + alpha * cf_scores
+                strategy = "hybrid_content_heavy" if alpha < 0.5 else "hybrid_collaborative_heavy"
+
+            embedding_scores = self.get_embedding_scores(ratings)
+            if embedding_scores is not None:
+                beta = self.embedding_weight
+                base_scores = (1 - beta) * base_scores + beta * embedding_scores
+
+        base_scores = base_scores.astype(float)
+        base_scores[rated_indices] = -np.inf
+
+        row_specs = [{"id": "for_you", "kind": "for_you", "seed_movie_id": None, "scores": base_scores}]
+        for seed_idx, scores in zip(seed_indices, seed_scores):
+            scores = scores.astype(float)
+            scores[rated_indices] = -np.inf
+            seed_movie_id = self.movie_ids[seed_idx]
+            row_specs.append({
+                "id": f"because:{seed_movie_id}",
+                "kind": "because_you_liked",
+                "seed_movie_id": seed_movie_id,
+                "scores": scores,
+            })
+        for row in masked_rows:
+            row_specs.append({
+                "id": row["id"],
+                "kind": row["kind"],
+                "seed_movie_id": None,
+                "scores": np.where(self.genre_mask(row["genre_ids"]), base_scores, -np.inf),
+            })
+
+        rows = []
+        used: set[int] = set()
+        for spec in row_specs:
+            picked = self._top_unused(spec["scores"], per_row, used)
+            if not picked:
+                continue
+            used.update(picked)
+            rows.append({
+                "id": spec["id"],
+                "kind": spec["kind"],
+                "seed_movie_id": spec["seed_movie_id"],
+                "items": [
+                    {"movie_id": self.movie_ids[idx], "score": float(spec["scores"][idx])}
+                    for idx in picked
+                ],
+            })
+
+        return (rows, strategy)
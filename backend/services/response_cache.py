@@ -0,0 +1,104 @@
+"""
+Pre-serialized response cache for hot browse endpoints.
+
+Stores the validated, JSON-encoded response body and a strong ETag per
+endpoint + parameters. Entries remember the upstream TMDB payload they were
+built from, so a refreshed upstream entry (e.g. by the cache warmer)
+transparently invalidates the encoded bytes.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from config import settings
+from services.cache import TTLCache
+
+
+class PreEncodedJSONResponse(Response):
+    """JSON response whose body is already encoded bytes."""
+
+    media_type = "application/json"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether an If-None-Match header matches the given strong ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from response bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class ResponseCache:
+    """Cache of (upstream payload, encoded body, ETag) keyed by endpoint + params."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.response_cache_max_entries,
+        ttl: float = settings.tmdb_list_cache_ttl_seconds,
+    ):
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=ttl)
+
+    def encode(
+        self,
+        key: str,
+        source: dict[str, Any],
+        model: type[BaseModel],
+    ) -> tuple[bytes, str]:
+        """
+        Get encoded bytes and ETag for an upstream payload.
+
+        Validation and encoding run only when the key is missing or the
+        upstream payload object has changed since the entry was built.
+
+        Args:
+            key: Endpoint + parameters cache key
+            source: Raw upstream payload
+            model: Pydantic response model used to validate the payload
+
+        Returns:
+            Tuple of (JSON body bytes, strong ETag)
+        """
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] is source:
+            return entry[1], entry[2]
+
+        body = model.model_validate(source).model_dump_json().encode()
+        etag = make_etag(body)
+        self._cache.set(key, (source, body, etag))
+        return body, etag
+
+    def respond(
+        self,
+        request: Request,
+        key: str,
+        source: dict[str, Any],
+        model: type[BaseModel],
+    ) -> Response:
+        """
+        Build a response from the cache, answering If-None-Match with 304.
+
+        Args:
+            request: Incoming request (for conditional headers)
+            key: Endpoint + parameters cache key
+            source: Raw upstream payload
+            model: Pydantic response model
+
+        Returns:
+            304 Not Modified or a pre-encoded JSON response, both with ETag
+        """
+        body, etag = self.encode(key, source, model)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return PreEncodedJSONResponse(content=body, headers={"ETag": etag})
+
+    def stats(self) -> dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        return self._cache.stats()
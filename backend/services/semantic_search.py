@@ -2,13 +2,26 @@
 Semantic search service using ChromaDB vector search.
 
 Uses sentence-transformers to encode natural language queries and ChromaDB
-for vector similarity search over the movie catalog.
+for vector similarity search over the movie catalog. When an int8 ONNX
+export of the encoder is present it runs through ONNX Runtime instead, and
+sentence-transformers (and torch) are never imported.
+
+With a BM25 lexical index loaded (see lexical_search.py), vector and
+lexical rankings are merged by reciprocal rank fusion so exact title,
+actor and director matches surface; without the sentence model, search
+degrades to lexical-only results.
 """
 import logging
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from sentence_transformers import SentenceTransformer
+from config import settings
+from ml.embeddings.filters import SearchFilters
 from ml.embeddings.store import EmbeddingStore
+from services.batch_encoder import MicroBatchEncoder
+from services.lexical_search import LexicalIndex, reciprocal_rank_fusion
+from services.onnx_encoder import OnnxQueryEncoder
+from services.query_cache import SemanticQueryCache, normalize_query
+from services.shared_cache import shared_tier
 
 logger = logging.getLogger(__name__)
 
@@ -18,21 +31,51 @@ class SemanticSearchService:
     Service for semantic search over movies using ChromaDB vector search.
 
     Encodes natural language queries with sentence-transformers and performs
-    cosine similarity search over movie embeddings.
+    cosine similarity search over movie embeddings. Query embeddings and
+    ranked results are cached per normalized query (see SemanticQueryCache;
+    the result level is shared across workers).
     """
 
-    def __init__(self, embedding_store: EmbeddingStore):
+    def __init__(self, embedding_store: EmbeddingStore, lexical_index: LexicalIndex | None = None):
         """
         Initialize the semantic search service.
 
         The SentenceTransformer model is loaded here. On Railway cold starts the
         ~90MB HuggingFace download can time out — if that happens we log the
         failure and set self.model = None so the process can still boot. The
-        search() method then returns an empty list instead of raising.
+        search() method then serves lexical-only results (or an empty list
+        when no lexical index is loaded) instead of raising.
+
+        With search_encoder_backend="onnx" and an exported encoder on disk,
+        the quantized ONNX model is used and the PyTorch model is only
+        loaded if it fails.
         """
         self.embedding_store = embedding_store
+        self.lexical_index = lexical_index if lexical_index is not None else LexicalIndex()
         self.model = None
+        self.cache = SemanticQueryCache(
+            embedding_max_bytes=settings.search_embedding_cache_max_bytes,
+            result_max_entries=settings.search_result_cache_max_entries,
+            result_ttl=settings.search_result_cache_ttl_seconds,
+            remote=shared_tier,
+        )
+        self.index_version = "unknown"
+        self.refresh_index_version()
+        # Concurrent queries are encoded together in short windows
+        self.encoder = MicroBatchEncoder(
+            self._encode_batch,
+            max_batch_size=settings.search_batch_max_size,
+            max_wait_ms=settings.search_batch_window_ms,
+        ) if settings.search_batching_enabled else None
+        if settings.search_encoder_backend == "onnx" and OnnxQueryEncoder.exists():
+            try:
+                self.model = OnnxQueryEncoder.load(threads=settings.search_encoder_threads)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX query encoder, falling back to PyTorch: {e}")
         try:
+            from sentence_transformers import SentenceTransformer
+
             self.model = SentenceTransformer('all-MiniLM-L6-v2')
             logger.info("Loaded SentenceTransformer model: all-MiniLM-L6-v2")
         except Exception as e:
@@ -41,46 +84,221 @@ class SemanticSearchService:
             )
             # DO NOT re-raise — boot must continue so /recommendations and /health still work.
 
-    def search(self, query: str, top_n: int = 10) -> list[dict[str, Any]]:
+    def refresh_index_version(self) -> None:
+        """
+        Re-read the index version that result cache keys include.
+
+        The collection size stands in for an embedding index version (a
+        rebuilt index with a different catalog gets new keys, and the result
+        TTL covers rebuilds that keep the size); the lexical index adds its
+        build timestamp. Call again after loading the lexical index.
+        """
+        try:
+            self.index_version = f"{self.embedding_store.count()}:{self.lexical_index.version()}"
+        except Exception as e:
+            logger.warning(f"Could not read embedding index version: {e}")
+
+    def _encode_batch(self, texts: list[str]):
+        return self.model.encode(texts, convert_to_numpy=True, batch_size=len(texts))
+
+    def encode_query(self, query: str) -> list[float]:
+        """
+        Encode a normalized query, reusing a cached embedding when present.
+
+        Blocks until the query's micro-batch has been encoded.
+
+        Args:
+            query: Output of normalize_query()
+
+        Returns:
+            Query embedding as a list of floats
+        """
+        embedding = self.cache.get_embedding(query)
+        if embedding is None:
+            if self.encoder is not None:
+                embedding = self.encoder.encode(query)
+            else:
+                embedding = self.model.encode(query, convert_to_numpy=True)
+            self.cache.set_embedding(query, embedding)
+        return embedding.tolist()
+
+    async def encode_query_async(self, query: str, run_cpu: Callable[..., Awaitable[Any]]) -> list[float]:
+        """
+        Async encode_query: waits for the micro-batch without holding a thread.
+
+        With batching disabled the blocking encode runs through `run_cpu`,
+        never on the event loop.
+        """
+        embedding = self.cache.get_embedding(query)
+        if embedding is None:
+            if self.encoder is None:
+                return await run_cpu(self.encode_query, query)
+            embedding = await self.encoder.encode_async(query)
+            self.cache.set_embedding(query, embedding)
+        return embedding.tolist()
+
+    def _vector_results(
+        self, query_embedding: list[float], n_results: int, filters: SearchFilters | None
+    ) -> list[dict[str, Any]]:
+        """Query the embedding store and format its hits."""
+        results = self.embedding_store.query_similar(
+            query_embedding=query_embedding,
+            n_results=n_results,
+            filters=filters
+        )
+
+        # Transform results into API response format
+        movies = []
+        for result in results:
+            movies.append({
+                "movie_id": int(result["id"]),
+                "title": result["metadata"]["title"],
+                "year": result["metadata"]["year"],
+                "genres": result["metadata"]["genres"],
+                "distance": result["distance"],
+                "lexical_score": None,
+                "match": "semantic",
+            })
+        return movies
+
+    def _fuse(self, semantic: list[dict[str, Any]], lexical: list[dict[str, Any]], top_n: int) -> list[dict[str, Any]]:
+        """Merge vector and BM25 rankings by reciprocal rank fusion."""
+        by_id = {r["movie_id"]: {**r, "distance": None, "match": "lexical"} for r in lexical}
+        for result in semantic:
+            entry = by_id.get(result["movie_id"])
+            if entry is None:
+                by_id[result["movie_id"]] = result
+            else:
+                entry.update(distance=result["distance"], match="both")
+        fused = reciprocal_rank_fusion(
+            [[r["movie_id"] for r in semantic], [r["movie_id"] for r in lexical]],
+            k=settings.search_rrf_k,
+        )
+        return [by_id[movie_id] for movie_id, _ in fused[:top_n]]
+
+    def _rank(
+        self,
+        query: str,
+        normalized: str,
+        query_embedding: list[float] | None,
+        top_n: int,
+        filters: SearchFilters | None,
+    ) -> list[dict[str, Any]]:
+        """Rank movies for an encoded query (None = lexical only)."""
+        hybrid = settings.search_hybrid_enabled and self.lexical_index.is_loaded()
+        if query_embedding is None:
+            movies = [
+                {**r, "distance": None, "match": "lexical"}
+                for r in self.lexical_index.search(normalized, top_n, filters)
+            ]
+        elif not hybrid:
+            movies = self._vector_results(query_embedding, top_n, filters)
+        else:
+            candidates = max(top_n, settings.search_fusion_candidates)
+            movies = self._fuse(
+                self._vector_results(query_embedding, candidates, filters),
+                self.lexical_index.search(normalized, candidates, filters),
+                top_n,
+            )
+
+        logger.info(f"Semantic search for '{query}' returned {len(movies)} results")
+        return movies
+
+    @staticmethod
+    def _cache_key(normalized: str, filters: SearchFilters | None) -> str:
+        """Result cache key: the normalized query plus any filter constraints."""
+        if filters is None or filters.is_empty():
+            return normalized
+        return f"{normalized}\x1f{filters.cache_key()}"
+
+    def _available(self) -> bool:
+        if self.model is not None:
+            return True
+        if self.lexical_index.is_loaded():
+            return True
+        logger.warning("Semantic search requested but model is not loaded; returning empty results.")
+        return False
+
+    def search(
+        self, query: str, top_n: int = 10, filters: SearchFilters | None = None
+    ) -> list[dict[str, Any]]:
         """
         Search for movies using natural language query.
 
+        Blocking variant for scripts; it reuses cached query embeddings but
+        not the (async, shared) result cache that search_async() reads.
+
         Args:
             query: Natural language search query
             top_n: Number of results to return (default 10)
+            filters: Optional year range / genre constraints, applied inside
+                     the vector and lexical scans so all top_n results match
 
         Returns:
-            List of dicts with keys: movie_id, title, year, genres, distance
-            Results are sorted by cosine similarity (closest first)
+            List of dicts with keys: movie_id, title, year, genres,
+            distance (cosine distance, None for lexical-only hits),
+            lexical_score (normalized BM25, None for semantic-only hits) and
+            match ("semantic", "lexical" or "both"). Sorted by fused rank
+            when a lexical index is loaded, else by cosine similarity
         """
-        if self.model is None:
-            logger.warning("Semantic search requested but model is not loaded; returning empty results.")
+        if not self._available():
             return []
 
+        normalized = normalize_query(query)
         try:
-            # Encode the query text into an embedding vector
-            query_embedding = self.model.encode(query, convert_to_numpy=True).tolist()
+            # Encode the query text into an embedding vector (cached per normalized query)
+            query_embedding = self.encode_query(normalized) if self.model is not None else None
 
-            # Query ChromaDB for similar movies
-            results = self.embedding_store.query_similar(
-                query_embedding=query_embedding,
-                n_results=top_n
-            )
+            # Query the vector store (and lexical index) for matching movies
+            return self._rank(query, normalized, query_embedding, top_n, filters)
 
-            # Transform results into API response format
-            movies = []
-            for result in results:
-                movies.append({
-                    "movie_id": int(result["id"]),
-                    "title": result["metadata"]["title"],
-                    "year": result["metadata"]["year"],
-                    "genres": result["metadata"]["genres"],
-                    "distance": result["distance"]
-                })
+        except Exception as e:
+            logger.error(f"Failed to perform semantic search: {e}")
+            raise
 
-            logger.info(f"Semantic search for '{query}' returned {len(movies)} results")
-            return movies
+    async def search_async(
+        self,
+        query: str,
+        top_n: int,
+        run_cpu: Callable[..., Awaitable[Any]],
+        filters: SearchFilters | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Async search: awaits the batched encode, then runs the vector query
+        through `run_cpu` (e.g. ExecutorPool.run_cpu).
 
+        Waiting for a micro-batch holds no executor thread, so batches can
+        grow past the thread pool size under concurrent load.
+
+        Args:
+            query: Natural language search query
+            top_n: Number of results to return
+            run_cpu: Awaitable runner for blocking calls
+            filters: Optional year range / genre constraints
+
+        Returns:
+            Same as search()
+        """
+        if not self._available():
+            return []
+
+        normalized = normalize_query(query)
+        cache_key = self._cache_key(normalized, filters)
+        index_version = self.index_version
+        cached = await self.cache.get_results(cache_key, top_n, index_version)
+        if cached is not None:
+            return cached
+
+        try:
+            query_embedding = await self.encode_query_async(normalized, run_cpu) if self.model is not None else None
+            movies = await run_cpu(self._rank, query, normalized, query_embedding, top_n, filters)
         except Exception as e:
             logger.error(f"Failed to perform semantic search: {e}")
             raise
+        await self.cache.set_results(cache_key, top_n, index_version, movies)
+        return movies
+
+    def close(self) -> None:
+        """Stop the encoder worker thread."""
+        if self.encoder is not None:
+            self.encoder.stop()
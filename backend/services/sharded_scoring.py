@@ -0,0 +1,356 @@
+"""
+Catalog-sharded scoring across worker processes.
+
+For large catalogs the single cosine_similarity + CF pass over the whole
+TF-IDF matrix is the bottleneck and runs on one core. ShardedScorer places
+the TF-IDF CSR arrays and the per-movie CF factors in shared memory once,
+splits the catalog into N contiguous row shards, and lets a process pool
+score the shards in parallel. Each shard returns its local top-k and the
+results are merged with a heap, so only k * N candidates cross process
+boundaries per request.
+
+Enabled with settings.scoring_shards > 0 (see ExecutorPool).
+"""
+import heapq
+import logging
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+
+def _to_shared(array: np.ndarray) -> tuple[shared_memory.SharedMemory, dict[str, Any]]:
+    """Copy an array into a new shared memory block."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+# ---- worker side (module-level so the process pool can pickle the calls) ----
+
+_worker_blocks: list[shared_memory.SharedMemory] = []
+_worker_arrays: dict[str, np.ndarray] = {}
+_worker_shards: list[dict[str, Any]] = []
+
+
+def _attach_worker(specs: dict[str, dict[str, Any]], bounds: list[int]) -> None:
+    """Process pool initializer: map the shared arrays and build zero-copy shard views."""
+    for key, spec in specs.items():
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        _worker_blocks.append(shm)
+        _worker_arrays[key] = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+
+    data, indices, indptr = (_worker_arrays[k] for k in ("data", "indices", "indptr"))
+    n_features = int(_worker_arrays["n_features"][0])
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        lo, hi = indptr[start], indptr[end]
+        _worker_shards.append({
+            "start": start,
+            "end": end,
+            "tfidf": sp.csr_matrix(
+                (data[lo:hi], indices[lo:hi], indptr[start:end + 1] - lo),
+                shape=(end - start, n_features),
+            ),
+        })
+
+
+def _shard_cf_estimates(shard: dict[str, Any], cf: dict[str, Any]) -> np.ndarray:
+    """Raw SVD estimates for a shard (mirrors RecommenderService.predict_cf_vector)."""
+    start, end = shard["start"], shard["end"]
+    known = _worker_arrays["known"][start:end]
+    if cf["biased"]:
+        estimates = np.full(end - start, cf["global_mean"] + cf["user_bias"])
+        estimates += _worker_arrays["item_bias"][start:end]
+        if cf["user_factors"] is not None:
+            estimates += _worker_arrays["item_factors"][start:end] @ cf["user_factors"]
+    else:
+        estimates = np.full(end - start, 3.0)
+        if cf["user_factors"] is not None:
+            factors = _worker_arrays["item_factors"][start:end] @ cf["user_factors"]
+            estimates[known] = factors[known]
+    return np.clip(estimates, cf["low"], cf["high"])
+
+
+def _shard_cf_range(shard_id: int, cf: dict[str, Any], exclude: np.ndarray) -> tuple[float, float]:
+    """Min/max CF estimate over a shard's unexcluded movies (for global normalization)."""
+    shard = _worker_shards[shard_id]
+    estimates = _shard_cf_estimates(shard, cf)
+    local = exclude[(exclude >= shard["start"]) & (exclude < shard["end"])] - shard["start"]
+    keep = np.ones(len(estimates), dtype=bool)
+    keep[local] = False
+    if not keep.any():
+        return float("inf"), float("-inf")
+    return float(estimates[keep].min()), float(estimates[keep].max())
+
+
+def _shard_top_k(
+    shard_id: int,
+    profile: np.ndarray,
+    cf: dict[str, Any] | None,
+    alpha: float,
+    cf_range: tuple[float, float],
+    exclude: np.ndarray,
+    k: int,
+    embedding_profile: np.ndarray | None = None,
+    beta: float = 0.0,
+) -> list[tuple[float, int]]:
+    """Score one shard and return its top-k as (score, catalog index) pairs."""
+    shard = _worker_shards[shard_id]
+    start = shard["start"]
+    # Rows are L2-normalized and the profile arrives unit-length, so dot = cosine
+    scores = shard["tfidf"] @ profile
+
+    if cf is not None:
+        low, high = cf_range
+        estimates = _shard_cf_estimates(shard, cf)
+        cf_scores = (estimates - low) / (high - low) if high > low else np.full(len(scores), 0.5)
+        scores = (1 - alpha) * scores + alpha * cf_scores
+
+    if embedding_profile is not None:
+        embedding_scores = (_worker_arrays["embeddings"][start:shard["end"]] @ embedding_profile + 1.0) / 2.0
+        scores = (1 - beta) * scores + beta * embedding_scores
+
+    local = exclude[(exclude >= start) & (exclude < shard["end"])] - start
+    scores[local] = -np.inf
+
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    return [(float(scores[i]), start + int(i)) for i in top if np.isfinite(scores[i])]
+
+
+class ShardedScorer:
+    """Owns the shared-memory catalog and the scoring process pool."""
+
+    def __init__(self, n_shards: int, workers: int | None = None):
+        """
+        Args:
+            n_shards: Number of contiguous catalog shards
+            workers: Process pool size (default: n_shards)
+        """
+        self.n_shards = n_shards
+        self.workers = workers or n_shards
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._pool: ProcessPoolExecutor | None = None
+        self.n_movies = 0
+
+    def build(
+        self,
+        tfidf_matrix: sp.spmatrix,
+        item_factors: np.ndarray | None = None,
+        item_bias: np.ndarray | None = None,
+        known: np.ndarray | None = None,
+        embeddings: np.ndarray | None = None,
+    ) -> None:
+        """
+        Publish the catalog to shared memory and start the pool.
+
+        Args:
+            tfidf_matrix: L2-normalized TF-IDF rows, one per catalog movie
+            item_factors: SVD qi row per catalog movie (zeros if not in trainset)
+            item_bias: SVD bi per catalog movie (zeros if not in trainset)
+            known: Whether each catalog movie is in the CF trainset
+            embeddings: Unit-length sentence embedding per catalog movie
+                (zero rows for movies without one)
+        """
+        self.close()
+        tfidf = sp.csr_matrix(tfidf_matrix, dtype=np.float32)
+        self.n_movies, n_features = tfidf.shape
+        if item_factors is None:
+            item_factors = np.zeros((self.n_movies, 1), dtype=np.float32)
+            item_bias = np.zeros(self.n_movies, dtype=np.float32)
+            known = np.zeros(self.n_movies, dtype=bool)
+        if embeddings is None:
+            embeddings = np.zeros((self.n_movies, 1), dtype=np.float32)
+
+        arrays = {
+            "data": tfidf.data,
+            "indices": tfidf.indices,
+            "indptr": tfidf.indptr,
+            "n_features": np.array([n_features], dtype=np.int64),
+            "item_factors": np.ascontiguousarray(item_factors, dtype=np.float32),
+            "item_bias": np.asarray(item_bias, dtype=np.float32),
+            "known": np.asarray(known, dtype=bool),
+            "embeddings": np.ascontiguousarray(embeddings, dtype=np.float32),
+        }
+        specs = {}
+        for key, array in arrays.items():
+            shm, specs[key] = _to_shared(array)
+            self._blocks.append(shm)
+
+        bounds = np.linspace(0, self.n_movies, self.n_shards + 1, dtype=int).tolist()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_attach_worker, initargs=(specs, bounds)
+        )
+        logger.info(
+            f"Sharded scorer ready: {self.n_movies} movies in {self.n_shards} shards, "
+            f"{self.workers} worker processes"
+        )
+
+    def build_from_recommender(self, recommender) -> None:
+        """Publish a loaded RecommenderService's TF-IDF matrix, SVD item factors and embeddings."""
+        embeddings = recommender.embedding_matrix if recommender.is_embedding_loaded() else None
+        if not recommender.is_collaborative_loaded() or recommender.cf_item_inner_ids is None:
+            self.build(recommender.tfidf_matrix, embeddings=embeddings)
+            return
+        svd = recommender.svd_model
+        inner_ids = recommender.cf_item_inner_ids
+        known = inner_ids >= 0
+        item_factors = np.zeros((len(inner_ids), svd.qi.shape[1]), dtype=np.float32)
+        item_factors[known] = svd.qi[inner_ids[known]]
+        item_bias = np.zeros(len(inner_ids), dtype=np.float32)
+        if svd.biased:
+            item_bias[known] = svd.bi[inner_ids[known]]
+        self.build(recommender.tfidf_matrix, item_factors, item_bias, known, embeddings)
+
+    def top_k(
+        self,
+        profile: np.ndarray,
+        k: int,
+        exclude: np.ndarray,
+        cf: dict[str, Any] | None = None,
+        alpha: float = 0.0,
+        embedding_profile: np.ndarray | None = None,
+        beta: float = 0.0,
+    ) -> list[tuple[int, float]]:
+        """
+        Score every shard in parallel and merge the local top-k lists.
+
+        Args:
+            profile: Dense user profile over TF-IDF features
+            k: Number of results
+            exclude: Catalog indices to skip (already rated)
+            cf: CF user parameters (global_mean, user_bias, user_factors,
+                biased, low, high), or None for content-only scoring
+            alpha: CF fusion weight
+            embedding_profile: Unit-length user vector in embedding space,
+                or None to skip the embedding source
+            beta: Embedding fusion weight
+
+        Returns:
+            List of (catalog index, score), best first
+        """
+        if self._pool is None:
+            raise RuntimeError("ShardedScorer.build() has not been called")
+        norm = np.linalg.norm(profile)
+        profile = (profile / norm if norm > 0 else profile).astype(np.float32)
+        exclude = np.asarray(exclude, dtype=np.int64)
+        shard_ids = range(self.n_shards)
+
+        cf_range = (0.0, 0.0)
+        if cf is not None:
+            ranges = list(self._pool.map(
+                _shard_cf_range, shard_ids, [cf] * self.n_shards, [exclude] * self.n_shards
+            ))
+            cf_range = (min(r[0] for r in ranges), max(r[1] for r in ranges))
+
+        shard_results = self._pool.map(
+            _shard_top_k,
+            shard_ids,
+            [profile] * self.n_shards,
+            [cf] * self.n_shards,
+            [alpha] * self.n_shards,
+            [cf_range] * self.n_shards,
+            [exclude] * self.n_shards,
+            [k] * self.n_shards,
+            [embedding_profile] * self.n_shards,
+            [beta] * self.n_shards,
+        )
+        best = heapq.nlargest(k, (pair for result in shard_results for pair in result))
+        return [(idx, score) for score, idx in best]
+
+    def hybrid_recommendations(
+        self,
+        recommender,
+        user_id: str,
+        ratings: list[dict],
+        top_n: int = 10,
+        diversity_ratio: float = 0.15,
+        diversity_seed: int | None = None,
+        page_size: int | None = None,
+    ) -> tuple[list[dict], str]:
+        """
+        Sharded counterpart of RecommenderService.hybrid_recommendations.
+
+        Same fusion weights and strategies. Exploration picks are sampled
+        from the ranks just below the first page rather than the 50th-80th
+        percentile, which would need the full catalog ranking.
+        """
+        profile = recommender.build_user_profile(ratings)
+        if profile is None:
+            return recommender.hybrid_recommendations(
+                user_id, ratings, top_n, diversity_ratio, diversity_seed, page_size
+            )
+
+        alpha = recommender.calculate_alpha(len(ratings))
+        exclude = np.array([
+            recommender.movie_id_to_index[r["movie_id"]]
+            for r in ratings if r.get("movie_id") in recommender.movie_id_to_index
+        ], dtype=np.int64)
+        profile = np.asarray(profile).ravel()
+        embedding_profile = (
+            recommender.build_embedding_profile(ratings) if recommender.is_embedding_loaded() else None
+        )
+        beta = recommender.embedding_weight if embedding_profile is not None else 0.0
+
+        if alpha == 0.0 or not recommender.is_collaborative_loaded():
+            ranked = self.top_k(
+                profile, top_n, exclude, embedding_profile=embedding_profile, beta=beta
+            )
+            return (
+                [{"movie_id": recommender.movie_ids[i], "score": s} for i, s in ranked],
+                "content_based",
+            )
+
+        svd = recommender.svd_model
+        trainset = svd.trainset
+        try:
+            inner_uid = trainset.to_inner_uid(user_id)
+        except ValueError:
+            inner_uid = None
+        cf = {
+            "global_mean": trainset.global_mean,
+            "user_bias": float(svd.bu[inner_uid]) if svd.biased and inner_uid is not None else 0.0,
+            "user_factors": svd.pu[inner_uid].astype(np.float32) if inner_uid is not None else None,
+            "biased": svd.biased,
+            "low": trainset.rating_scale[0],
+            "high": trainset.rating_scale[1],
+        }
+
+        page_size = min(page_size or top_n, top_n)
+        num_explore = max(1, int(page_size * diversity_ratio))
+        num_exploit = page_size - num_explore
+        ranked = self.top_k(
+            profile, max(top_n, 4 * page_size) + page_size, exclude, cf, alpha, embedding_profile, beta
+        )
+
+        exploit = ranked[:num_exploit]
+        explore_pool = ranked[page_size:4 * page_size] or ranked[num_exploit:]
+        explore = random.Random(diversity_seed).sample(
+            explore_pool, min(num_explore, len(explore_pool))
+        )
+        shown = {idx for idx, _ in exploit + explore}
+        rest = [pair for pair in ranked if pair[0] not in shown]
+        ordered = (exploit + explore + rest)[:top_n]
+
+        strategy = "hybrid_content_heavy" if alpha < 0.5 else "hybrid_collaborative_heavy"
+        return (
+            [{"movie_id": recommender.movie_ids[i], "score": s} for i, s in ordered],
+            strategy,
+        )
+
+    def close(self) -> None:
+        """Stop the pool and release the shared memory."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
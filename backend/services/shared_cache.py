@@ -0,0 +1,249 @@
+"""
+Two-tier cache shared across uvicorn workers and nodes.
+
+Each worker keeps an in-process LRU tier (TTLCache) in front of an optional
+shared tier speaking the Redis protocol. Keys are namespaced
+("<prefix>:<namespace>:<key>"), values are stored as JSON with the same TTL
+as the local entry, and writes and deletes are broadcast on a pub/sub
+channel so other workers drop their now-stale local copy. Without REDIS_URL the cache is local-only
+and behaves like the plain TTLCache it wraps.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any
+
+from config import settings
+from services.cache import TTLCache
+from services.metrics import metrics
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional: only needed when REDIS_URL is set
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class RedisTier:
+    """
+    Shared tier over an async Redis-protocol client.
+
+    The client only needs get, set(px=), pttl, delete, publish and pubsub(),
+    so tests can pass an in-memory stand-in.
+    """
+
+    def __init__(self, client: Any, prefix: str = "cache"):
+        """
+        Args:
+            client: Async Redis-protocol client (e.g. redis.asyncio.Redis)
+            prefix: Key prefix shared by every namespace
+        """
+        self.client = client
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+        self.origin = uuid.uuid4().hex
+        self._caches: dict[str, "SharedCache"] = {}
+        self._listener: asyncio.Task | None = None
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cache") -> "RedisTier":
+        """Create a tier from a redis:// URL (requires the redis package)."""
+        if redis_asyncio is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        return cls(redis_asyncio.from_url(url), prefix=prefix)
+
+    def register(self, cache: "SharedCache") -> None:
+        """Route invalidations for cache.namespace to this cache's local tier."""
+        self._caches[cache.namespace] = cache
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> tuple[Any, float] | None:
+        """
+        Get a value and its remaining TTL.
+
+        Returns:
+            (value, ttl_seconds), or None on a miss or a Redis error
+        """
+        full_key = self._key(namespace, key)
+        try:
+            raw = await self.client.get(full_key)
+            if raw is None:
+                return None
+            ttl_ms = await self.client.pttl(full_key)
+        except Exception as e:
+            self._error("get", e)
+            return None
+        if ttl_ms is not None and ttl_ms == -2:
+            return None  # expired between the two calls
+        ttl = ttl_ms / 1000 if ttl_ms and ttl_ms > 0 else None
+        return json.loads(raw), ttl
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a JSON-serializable value with a TTL and tell other workers to
+        drop their local copy (errors are logged, not raised).
+        """
+        try:
+            await self.client.set(
+                self._key(namespace, key),
+                json.dumps(value, separators=(",", ":")),
+                px=max(1, int(ttl * 1000)),
+            )
+            await self._publish(namespace, key)
+        except Exception as e:
+            self._error("set", e)
+
+    async def delete(self, namespace: str, key: str | None) -> None:
+        """
+        Delete a key and tell other workers to drop their local copy.
+
+        Args:
+            namespace: Cache namespace
+            key: Key to delete, or None to invalidate the namespace's local tiers
+        """
+        try:
+            if key is not None:
+                await self.client.delete(self._key(namespace, key))
+            await self._publish(namespace, key)
+        except Exception as e:
+            self._error("delete", e)
+
+    async def _publish(self, namespace: str, key: str | None) -> None:
+        await self.client.publish(self.channel, json.dumps({
+            "origin": self.origin, "namespace": namespace, "key": key,
+        }))
+
+    def _error(self, operation: str, error: Exception) -> None:
+        metrics.inc("shared_cache_errors_total", operation=operation)
+        logger.warning(f"Shared cache {operation} failed: {error}")
+
+    def handle_invalidation(self, message: dict[str, Any]) -> None:
+        """Apply an invalidation message published by another worker."""
+        if message.get("origin") == self.origin:
+            return
+        cache = self._caches.get(message.get("namespace"))
+        if cache is None:
+            return
+        if message.get("key") is None:
+            cache.local.clear()
+        else:
+            cache.local.delete(message["key"])
+        metrics.inc("shared_cache_invalidations_total", namespace=cache.namespace)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_invalidation(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._error("subscribe", e)
+                await asyncio.sleep(1.0)
+
+    def start(self) -> None:
+        """Start listening for invalidations (call from the running event loop)."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+class SharedCache:
+    """
+    Namespaced cache with a per-worker LRU tier and an optional shared tier.
+
+    Reads check the local tier first; a shared-tier hit is copied into the
+    local tier with the remaining TTL. Writes go to both tiers. Values must
+    be JSON-serializable when a shared tier is configured.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 1024,
+        default_ttl: float = 300.0,
+        remote: RedisTier | None = None,
+    ):
+        """
+        Args:
+            namespace: Key namespace in the shared tier (e.g. "tmdb")
+            max_entries: Max entries in the local LRU tier
+            default_ttl: TTL in seconds used when set() is called without one
+            remote: Shared tier, or None for a local-only cache
+        """
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.local = TTLCache(max_entries=max_entries, default_ttl=default_ttl)
+        self.remote = remote
+        self.remote_hits = 0
+        if remote is not None:
+            remote.register(self)
+
+    async def get(self, key: str) -> Any | None:
+        """Get a value from the local tier, falling back to the shared tier."""
+        value = self.local.get(key)
+        if value is not None or self.remote is None:
+            return value
+        found = await self.remote.get(self.namespace, key)
+        if found is None:
+            return None
+        value, ttl = found
+        self.remote_hits += 1
+        self.local.set(key, value, ttl=ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value in both tiers."""
+        ttl = self.default_ttl if ttl is None else ttl
+        self.local.set(key, value, ttl=ttl)
+        if self.remote is not None:
+            await self.remote.set(self.namespace, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Delete a key everywhere and invalidate other workers' local copies."""
+        self.local.delete(key)
+        if self.remote is not None:
+            await self.remote.delete(self.namespace, key)
+
+    def clear(self) -> None:
+        """Clear this worker's local tier."""
+        self.local.clear()
+
+    def ttl_remaining(self, key: str) -> float | None:
+        """Seconds until the local entry expires, or None if absent."""
+        return self.local.ttl_remaining(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.local
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    def stats(self) -> dict[str, Any]:
+        """Local tier stats plus shared-tier hits."""
+        return {
+            **self.local.stats(),
+            "shared_tier": self.remote is not None,
+            "remote_hits": self.remote_hits,
+        }
+
+
+# Process-wide shared tier (None unless REDIS_URL is configured)
+shared_tier = RedisTier.from_url(settings.redis_url, prefix=settings.redis_key_prefix) \
+    if settings.redis_url else None
@@ -1,10 +1,45 @@
 import httpx
 from typing import Dict, Any, Optional
 from config import settings
+from services.shared_cache import SharedCache, shared_tier
+from services.rate_limit import TokenBucket
 
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p"
 
+# Shared across all TMDBService instances (routers create their own instances)
+tmdb_cache = SharedCache(
+    "tmdb", max_entries=settings.tmdb_cache_max_entries, remote=shared_tier
+)
+tmdb_rate_budget = TokenBucket(
+    rate=settings.tmdb_rate_limit_per_second,
+    capacity=settings.tmdb_rate_limit_burst,
+)
+
+# Background callers leave this many tokens for user-facing requests
+LOW_PRIORITY_RESERVE = settings.tmdb_rate_limit_burst * 0.25
+
+
+# Cache keys (also used by the cache warmer to check freshness)
+def popular_cache_key(page: int) -> str:
+    return f"popular:{page}"
+
+
+def search_cache_key(query: str, page: int) -> str:
+    return f"search:{query.strip().lower()}:{page}"
+
+
+def discover_cache_key(genre_ids: str, page: int) -> str:
+    return f"discover:{genre_ids}:{page}"
+
+
+def details_cache_key(movie_id: int) -> str:
+    return f"movie:{movie_id}"
+
+
+def summary_cache_key(movie_id: int) -> str:
+    return f"movie_summary:{movie_id}"
+
 
 class TMDBService:
     """Service for interacting with The Movie Database (TMDB) API."""
@@ -25,29 +60,78 @@ class TMDBService:
             return "https://via.placeholder.com/500x750?text=No+Image"
         return f"{TMDB_IMAGE_BASE}/{size}{path}"
 
-    async def get_popular(self, page: int = 1) -> Dict[str, Any]:
+    async def _get_cached(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        ttl: float,
+        force_refresh: bool = False,
+        low_priority: bool = False,
+    ) -> Dict[str, Any]:
         """
-        Fetch popular movies from TMDB.
+        GET a TMDB endpoint through the shared cache and rate budget.
 
         Args:
-            page: Page number for pagination
+            path: API path relative to TMDB_BASE_URL
+            params: Query parameters (api_key is added here)
+            cache_key: Key for the shared response cache
+            ttl: Cache TTL in seconds
+            force_refresh: Skip the cache lookup and re-fetch
+            low_priority: Leave LOW_PRIORITY_RESERVE tokens for user requests
 
         Returns:
-            TMDB API response with popular movies
+            Parsed JSON response
 
         Raises:
-            httpx.HTTPStatusError: If API request fails
+            httpx.HTTPStatusError: If API request fails (errors are not cached)
         """
+        if not force_refresh:
+            cached = await tmdb_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        await tmdb_rate_budget.acquire(reserve=LOW_PRIORITY_RESERVE if low_priority else 0.0)
+
         async with httpx.AsyncClient() as client:
             response = await client.get(
-                f"{TMDB_BASE_URL}/movie/popular",
-                params={
-                    "api_key": settings.tmdb_api_key,
-                    "page": page
-                }
+                f"{TMDB_BASE_URL}{path}",
+                params={"api_key": settings.tmdb_api_key, **params}
             )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+
+        await tmdb_cache.set(cache_key, data, ttl=ttl)
+        return data
+
+    async def get_popular(
+        self,
+        page: int = 1,
+        force_refresh: bool = False,
+        low_priority: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Fetch popular movies from TMDB.
+
+        Args:
+            page: Page number for pagination
+            force_refresh: Bypass the response cache
+            low_priority: Spend only budget not reserved for user requests
+
+        Returns:
+            TMDB API response with popular movies
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+        """
+        return await self._get_cached(
+            "/movie/popular",
+            {"page": page},
+            cache_key=popular_cache_key(page),
+            ttl=settings.tmdb_list_cache_ttl_seconds,
+            force_refresh=force_refresh,
+            low_priority=low_priority,
+        )
 
     async def search_movies(self, query: str, page: int = 1) -> Dict[str, Any]:
         """
@@ -63,25 +147,28 @@ class TMDBService:
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/search/movie",
-                params={
-                    "api_key": settings.tmdb_api_key,
-                    "query": query,
-                    "page": page
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get_cached(
+            "/search/movie",
+            {"query": query, "page": page},
+            cache_key=search_cache_key(query, page),
+            ttl=settings.tmdb_list_cache_ttl_seconds,
+        )
 
-    async def discover_by_genre(self, genre_id: int, page: int = 1) -> Dict[str, Any]:
+    async def discover_by_genre(
+        self,
+        genre_id: int,
+        page: int = 1,
+        force_refresh: bool = False,
+        low_priority: bool = False,
+    ) -> Dict[str, Any]:
         """
         Fetch movies by genre using TMDB discover endpoint.
 
         Args:
             genre_id: TMDB genre ID (e.g., 28 for Action, 878 for Sci-Fi)
             page: Page number for pagination
+            force_refresh: Bypass the response cache
+            low_priority: Spend only budget not reserved for user requests
 
         Returns:
             TMDB API response with movies in the given genre
@@ -89,15 +176,25 @@ class TMDBService:
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        return await self.discover_by_genres(str(genre_id), page)
+        return await self.discover_by_genres(
+            str(genre_id), page, force_refresh=force_refresh, low_priority=low_priority
+        )
 
-    async def discover_by_genres(self, genre_ids: str, page: int = 1) -> Dict[str, Any]:
+    async def discover_by_genres(
+        self,
+        genre_ids: str,
+        page: int = 1,
+        force_refresh: bool = False,
+        low_priority: bool = False,
+    ) -> Dict[str, Any]:
         """
         Fetch movies by multiple genres using TMDB discover endpoint.
 
         Args:
             genre_ids: Pipe-separated TMDB genre IDs (e.g., "28|12" for Action OR Adventure)
             page: Page number for pagination
+            force_refresh: Bypass the response cache
+            low_priority: Spend only budget not reserved for user requests
 
         Returns:
             TMDB API response with movies in the given genres
@@ -105,26 +202,33 @@ class TMDBService:
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/discover/movie",
-                params={
-                    "api_key": settings.tmdb_api_key,
-                    "with_genres": genre_ids,
-                    "sort_by": "popularity.desc",
-                    "vote_count.gte": 100,
-                    "page": page,
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get_cached(
+            "/discover/movie",
+            {
+                "with_genres": genre_ids,
+                "sort_by": "popularity.desc",
+                "vote_count.gte": 100,
+                "page": page,
+            },
+            cache_key=discover_cache_key(genre_ids, page),
+            ttl=settings.tmdb_list_cache_ttl_seconds,
+            force_refresh=force_refresh,
+            low_priority=low_priority,
+        )
 
-    async def get_movie_details(self, movie_id: int) -> Dict[str, Any]:
+    async def get_movie_details(
+        self,
+        movie_id: int,
+        force_refresh: bool = False,
+        low_priority: bool = False,
+    ) -> Dict[str, Any]:
         """
         Fetch detailed information about a specific movie.
 
         Args:
             movie_id: TMDB movie ID
+            force_refresh: Bypass the response cache
+            low_priority: Spend only budget not reserved for user requests
 
         Returns:
             TMDB API response with movie details, credits, and videos
@@ -132,13 +236,38 @@ class TMDBService:
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/movie/{movie_id}",
-                params={
-                    "api_key": settings.tmdb_api_key,
-                    "append_to_response": "credits,videos"
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get_cached(
+            f"/movie/{movie_id}",
+            {"append_to_response": "credits,videos"},
+            cache_key=details_cache_key(movie_id),
+            ttl=settings.tmdb_detail_cache_ttl_seconds,
+            force_refresh=force_refresh,
+            low_priority=low_priority,
+        )
+
+    async def get_movie_summary(self, movie_id: int) -> Dict[str, Any]:
+        """
+        Fetch core movie fields (title, poster, overview, ratings) for hydration.
+
+        Served from the full details cache entry when one exists; otherwise
+        fetches the smaller payload without credits/videos.
+
+        Args:
+            movie_id: TMDB movie ID
+
+        Returns:
+            TMDB movie payload (may include credits/videos if served from details cache)
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+        """
+        details = await tmdb_cache.get(details_cache_key(movie_id))
+        if details is not None:
+            return details
+
+        return await self._get_cached(
+            f"/movie/{movie_id}",
+            {},
+            cache_key=summary_cache_key(movie_id),
+            ttl=settings.tmdb_detail_cache_ttl_seconds,
+        )
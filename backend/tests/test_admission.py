@@ -0,0 +1,104 @@
+"""Admission control: bounded queues, shedding and per-client rate limits."""
+import asyncio
+import time
+
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.admission import AdmissionController, AdmissionMiddleware, ClientRateLimiter
+from services.auth import TokenVerifier
+from services.metrics import metrics
+
+
+def test_controller_sheds_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        controller = AdmissionController("test_admit", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        assert await controller.acquire() is None
+
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert await controller.acquire() == "queue_full"
+        assert await waiter == "queue_timeout"
+
+        controller.release()
+        assert await controller.acquire() is None
+        controller.release()
+
+    asyncio.run(scenario())
+
+    counters = metrics.snapshot()["counters"]
+    assert counters['admission_shed_total{endpoint="test_admit",reason="queue_full"}'] == 1
+    assert counters['admission_shed_total{endpoint="test_admit",reason="queue_timeout"}'] == 1
+
+
+def test_middleware_only_limits_matching_paths():
+    app = FastAPI()
+
+    @app.get("/expensive")
+    async def expensive():
+        return {"ok": True}
+
+    @app.get("/cheap")
+    async def cheap():
+        return {"ok": True}
+
+    controller = AdmissionController("test_mw", max_concurrent=1, max_queue=0, queue_timeout=0.05)
+    app.add_middleware(
+        AdmissionMiddleware,
+        policies=[(r"/expensive", controller)],
+        rate_limiter=ClientRateLimiter(rate=0.1, burst=2),
+    )
+
+    with TestClient(app) as client:
+        assert client.get("/expensive").status_code == 200
+        assert client.get("/expensive").status_code == 200
+        limited = client.get("/expensive")
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) >= 1
+
+        # Other paths are unaffected
+        assert all(client.get("/cheap").status_code == 200 for _ in range(5))
+    assert controller.status()["in_flight"] == 0
+
+
+def test_rate_limit_keys_on_verified_users_not_raw_tokens():
+    secret = "test-jwt-secret-with-at-least-32-bytes!"
+    verifier = TokenVerifier(jwt_secret=secret, supabase_url="", audience="authenticated")
+    tokens = {
+        user: jwt.encode(
+            {"sub": user, "aud": "authenticated", "exp": int(time.time()) + 600}, secret, algorithm="HS256"
+        )
+        for user in ("user-a", "user-b")
+    }
+    for token in tokens.values():
+        asyncio.run(verifier.verify(token))
+
+    app = FastAPI()
+
+    @app.get("/expensive")
+    async def expensive():
+        return {"ok": True}
+
+    controller = AdmissionController("test_keys", max_concurrent=4, max_queue=0, queue_timeout=0.05)
+    app.add_middleware(
+        AdmissionMiddleware,
+        policies=[(r"/expensive", controller)],
+        rate_limiter=ClientRateLimiter(rate=0.1, burst=2),
+        token_verifier=verifier,
+    )
+
+    with TestClient(app) as client:
+        # Made-up tokens share the caller's address bucket
+        statuses = [
+            client.get("/expensive", headers={"Authorization": f"Bearer junk-{i}"}).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+
+        # Verified users get their own buckets
+        user_a = {"Authorization": f"Bearer {tokens['user-a']}"}
+        assert client.get("/expensive", headers=user_a).status_code == 200
+        assert client.get("/expensive", headers=user_a).status_code == 200
+        assert client.get("/expensive", headers=user_a).status_code == 429
+        assert client.get("/expensive", headers={"Authorization": f"Bearer {tokens['user-b']}"}).status_code == 200
@@ -0,0 +1,64 @@
+"""Local Supabase JWT verification and the verified-token cache."""
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from services.auth import TokenVerificationError, TokenVerifier
+
+SECRET = "test-jwt-secret-with-at-least-32-bytes!"
+
+
+def make_token(secret=SECRET, **claims):
+    payload = {"sub": "user-123", "aud": "authenticated", "exp": int(time.time()) + 3600}
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def make_verifier():
+    return TokenVerifier(jwt_secret=SECRET, supabase_url="", audience="authenticated")
+
+
+def test_valid_token_is_verified_locally_and_cached():
+    verifier = make_verifier()
+    token = make_token()
+
+    async def remote_not_allowed(_token):
+        raise AssertionError("network fallback should not be used")
+
+    verifier._verify_remote = remote_not_allowed
+
+    assert asyncio.run(verifier.verify(token)) == "user-123"
+    assert len(verifier.cache) == 1
+    assert asyncio.run(verifier.verify(token)) == "user-123"
+    assert verifier.cache.hits == 1
+
+
+@pytest.mark.parametrize("token", [
+    make_token(exp=int(time.time()) - 10),
+    make_token(aud="anon"),
+    make_token(secret="some-other-secret-with-at-least-32-bytes"),
+    "not-a-jwt",
+])
+def test_invalid_tokens_are_rejected(token):
+    verifier = make_verifier()
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(token))
+    assert len(verifier.cache) == 0
+
+
+def test_falls_back_to_remote_without_key_material():
+    verifier = TokenVerifier(jwt_secret="", supabase_url="", audience="authenticated")
+    calls = []
+
+    async def remote(token):
+        calls.append(token)
+        return "user-remote"
+
+    verifier._verify_remote = remote
+    token = make_token()
+
+    assert asyncio.run(verifier.verify(token)) == "user-remote"
+    assert asyncio.run(verifier.verify(token)) == "user-remote"
+    assert calls == [token]
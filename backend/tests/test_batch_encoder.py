@@ -0,0 +1,119 @@
+"""Micro-batched query encoding."""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from services.batch_encoder import MicroBatchEncoder
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def encode_batch(self, texts):
+        with self.lock:
+            self.calls.append(list(texts))
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+def test_concurrent_queries_share_a_batch():
+    model = FakeModel()
+    encoder = MicroBatchEncoder(model.encode_batch, max_batch_size=8, max_wait_ms=50)
+    queries = ["alien", "heist", "noir", "alien", "western"]
+
+    async def run():
+        return await asyncio.gather(*(encoder.encode_async(q) for q in queries))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        encoder.stop()
+
+    # Every caller gets its own query's embedding back
+    for query, embedding in zip(queries, results):
+        assert embedding.tolist() == [len(query), ord(query[0])]
+    # Five callers, one encode call, duplicate encoded once
+    assert model.calls == [["alien", "heist", "noir", "western"]]
+    assert encoder.stats()["batches"] == 1
+
+
+def test_batches_are_capped_at_max_size():
+    model = FakeModel()
+    encoder = MicroBatchEncoder(model.encode_batch, max_batch_size=2, max_wait_ms=50)
+    futures = [encoder.submit(text) for text in ["a", "bb", "ccc"]]
+    try:
+        assert [f.result(timeout=5)[0] for f in futures] == [1, 2, 3]
+    finally:
+        encoder.stop()
+    assert [len(call) for call in model.calls] == [2, 1]
+
+
+def test_encode_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    encoder = MicroBatchEncoder(failing, max_wait_ms=1)
+    try:
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            encoder.encode("alien")
+    finally:
+        encoder.stop()
+
+
+def test_cancelled_caller_does_not_kill_the_worker():
+    release = threading.Event()
+    model = FakeModel()
+
+    def slow(texts):
+        release.wait(5)
+        return model.encode_batch(texts)
+
+    encoder = MicroBatchEncoder(slow, max_batch_size=1, max_wait_ms=1)
+    try:
+        blocker = encoder.submit("first")  # occupies the worker
+        cancelled = encoder.submit("second")
+        assert cancelled.cancel()  # still queued, as when encode_async is cancelled
+        release.set()
+
+        assert blocker.result(timeout=5)[0] == 5
+        assert encoder.submit("third").result(timeout=5)[0] == 5
+        assert encoder._thread.is_alive()
+    finally:
+        encoder.stop()
+    assert ["second"] not in model.calls
+
+
+def test_unbatched_async_search_encodes_off_the_event_loop(monkeypatch):
+    from config import settings
+    from services.semantic_search import SemanticSearchService
+
+    class Store:
+        def count(self):
+            return 1
+
+        def query_similar(self, query_embedding, n_results, filters=None):
+            return [{"id": "1", "metadata": {"title": "A", "year": "", "genres": ""}, "distance": 0.1}]
+
+    monkeypatch.setattr(settings, "search_batching_enabled", False)
+    service = SemanticSearchService(Store())
+    encoded_on = []
+
+    class Model:
+        def encode(self, text, convert_to_numpy=True):
+            encoded_on.append(threading.current_thread())
+            return np.ones(4, dtype=np.float32)
+
+    service.model = Model()
+    runner_calls = []
+
+    async def run_cpu(fn, *args):
+        runner_calls.append(fn.__name__)
+        return await asyncio.to_thread(fn, *args)
+
+    results = asyncio.run(service.search_async("heist", 5, run_cpu))
+    assert results[0]["movie_id"] == 1
+    assert runner_calls == ["encode_query", "_rank"]
+    assert encoded_on and encoded_on[0] is not threading.main_thread()
@@ -0,0 +1,87 @@
+"""
+TMDB cache, rate budget and cache warmer behaviour.
+
+Uses a stub TMDB service so no network access is needed.
+"""
+import asyncio
+
+from services.cache import TTLCache
+from services.cache_warmer import CacheWarmer
+from services.rate_limit import TokenBucket
+from services.tmdb import details_cache_key, discover_cache_key, popular_cache_key, tmdb_cache
+
+
+class StubTMDBService:
+    """Writes into the shared TMDB cache the way TMDBService does."""
+
+    def __init__(self, fail_movie_ids=()):
+        self.calls = []
+        self.fail_movie_ids = set(fail_movie_ids)
+
+    async def get_popular(self, page=1, force_refresh=False, low_priority=False):
+        self.calls.append(("popular", page, low_priority))
+        await tmdb_cache.set(popular_cache_key(page), {"page": page}, ttl=600)
+
+    async def discover_by_genres(self, genre_ids, page=1, force_refresh=False, low_priority=False):
+        self.calls.append(("discover", genre_ids, low_priority))
+        await tmdb_cache.set(discover_cache_key(genre_ids, page), {"page": page}, ttl=600)
+
+    async def discover_by_genre(self, genre_id, page=1, force_refresh=False, low_priority=False):
+        await self.discover_by_genres(str(genre_id), page, force_refresh, low_priority)
+
+    async def get_movie_details(self, movie_id, force_refresh=False, low_priority=False):
+        self.calls.append(("movie", movie_id, low_priority))
+        if movie_id in self.fail_movie_ids:
+            raise RuntimeError("TMDB down")
+        await tmdb_cache.set(details_cache_key(movie_id), {"id": movie_id}, ttl=600)
+
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    cache = TTLCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert 0 < cache.ttl_remaining("a") <= 60
+
+    cache.set("stale", 1, ttl=0)
+    assert cache.get("stale") is None
+    assert cache.ttl_remaining("stale") is None
+
+
+def test_token_bucket_reserve_holds_back_tokens():
+    bucket = TokenBucket(rate=0.0001, capacity=4)
+    assert bucket.try_acquire(reserve=2)
+    assert bucket.try_acquire(reserve=2)
+    assert not bucket.try_acquire(reserve=2)
+    assert bucket.try_acquire()  # high priority can still spend the reserve
+
+
+def test_warmer_refreshes_missing_and_expiring_keys():
+    tmdb_cache.clear()
+    stub = StubTMDBService(fail_movie_ids={3})
+    warmer = CacheWarmer(
+        stub,
+        featured_movie_ids=[1, 2, 3],
+        mood_genre_map={"cozy": "18|10749", "romantic": "18|10749", "funny": "35"},
+        genre_ids=[28],
+        refresh_margin_seconds=120,
+    )
+
+    refreshed = asyncio.run(warmer.warm_once())
+
+    # popular + 2 distinct mood genre sets + 1 genre row + 2 of 3 featured
+    assert refreshed == 6
+    assert all(low_priority for *_, low_priority in stub.calls)
+    coverage = warmer.coverage()
+    assert coverage["warm"] == 6 and coverage["total"] == 7
+    assert coverage["last_errors"] == 1
+
+    # Fresh keys are skipped; keys inside the refresh margin are refreshed
+    stub.calls.clear()
+    asyncio.run(tmdb_cache.set(popular_cache_key(1), {"page": 1}, ttl=60))
+    assert asyncio.run(warmer.warm_once()) == 1
+    assert [c[0] for c in stub.calls] == ["popular", "movie"]
+    tmdb_cache.clear()
@@ -0,0 +1,51 @@
+"""Cold-start clusters built from the committed models."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ml.build_cold_start import cluster_profiles, rank_cluster_lists, trainset_user_ratings
+from services.cold_start import ColdStartClusters, save_clusters
+from services.recommender import RecommenderService
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "ml" / "models"
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    service.load_collaborative_model(str(MODEL_DIR))
+    if not (service.is_loaded() and service.is_collaborative_loaded()):
+        pytest.skip("model artifacts not available")
+    return service
+
+
+def test_new_user_gets_nearest_cluster_list(recommender, tmp_path):
+    centroids, labels, user_ratings = cluster_profiles(
+        recommender, trainset_user_ratings(recommender.cf_trainset), n_clusters=4
+    )
+    movie_ids, scores = rank_cluster_lists(recommender, centroids, labels, user_ratings, top_n=20)
+    first = int(movie_ids[0, 0])
+    save_clusters(
+        tmp_path / "cold_start_clusters.npz", centroids, movie_ids, scores,
+        {first: {"id": first, "title": "Hydrated"}},
+        model_version=recommender.content_model_version, generated_at=0.0,
+    )
+    clusters = ColdStartClusters()
+    clusters.load(str(tmp_path))
+
+    # A member's own profile lands in their cluster
+    member = int(np.flatnonzero(labels == 0)[0])
+    assert clusters.assign(recommender.build_user_profile(user_ratings[member])) == 0
+
+    ratings = [{"movie_id": int(movie_ids[0, 1]), "rating": 5}]
+    cluster = clusters.assign(recommender.build_user_profile(ratings))
+    items = clusters.recommend(recommender, ratings, top_n=5)
+    expected = [int(m) for m in movie_ids[cluster] if m != ratings[0]["movie_id"]][:5]
+    assert [item["movie_id"] for item in items] == expected
+    assert all(item["reason"] == "cold_start_cluster" for item in items)
+    if cluster == 0:
+        assert items[0]["movie"]["title"] == "Hydrated"
+
+    assert clusters.recommend(recommender, [{"movie_id": first, "rating": 2}], top_n=5) is None
@@ -0,0 +1,121 @@
+"""Keyset pagination and fingerprints against an in-memory PostgREST stand-in."""
+import asyncio
+import re
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+from services.database import SupabaseDataAccess
+
+BASE_URL = "http://supabase.test/rest/v1"
+
+
+def _value(raw: str):
+    raw = raw.strip('"')
+    return int(raw) if raw.lstrip("-").isdigit() else raw
+
+
+def _condition(expr: str):
+    """Parse one `column.op.value` term (eq/gt/lt) into a row predicate."""
+    column, op, raw = expr.split(".", 2)
+    value = _value(raw)
+    compare = {"eq": lambda a: a == value, "gt": lambda a: a > value, "lt": lambda a: a < value}[op]
+    return lambda row: compare(row[column])
+
+
+def _or_condition(expr: str):
+    """Parse `(a.lt.x,and(a.eq.x,b.lt.y))`, the only `or` shape the data layer sends."""
+    match = re.fullmatch(r"\((.+?),and\((.+?),(.+?)\)\)", expr)
+    first, second, third = (_condition(term) for term in match.groups())
+    return lambda row: first(row) or (second(row) and third(row))
+
+
+class FakePostgREST:
+    """Just the select features SupabaseDataAccess uses: eq/gt/lt, or, order, limit, count."""
+
+    def __init__(self, tables: dict[str, list[dict]]):
+        self.tables = tables
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        rows = list(self.tables[request.url.path.rsplit("/", 1)[-1]])
+        limit = None
+        for name, raw in request.url.params.multi_items():
+            if name == "or":
+                predicate = _or_condition(raw)
+            elif name == "order":
+                for term in reversed(raw.split(",")):
+                    column, direction = term.split(".")[:2]
+                    rows.sort(key=lambda row: row[column], reverse=direction == "desc")
+                continue
+            elif name == "limit":
+                limit = int(raw)
+                continue
+            elif name == "select":
+                continue
+            else:
+                predicate = _condition(f"{name}.{raw}")
+            rows = [row for row in rows if predicate(row)]
+        total = len(rows)
+        page = rows[:limit] if limit is not None else rows
+        return httpx.Response(
+            200, json=page, headers={"Content-Range": f"0-{max(len(page) - 1, 0)}/{total}"}
+        )
+
+
+def connect(server: FakePostgREST, page_size: int) -> SupabaseDataAccess:
+    data_access = SupabaseDataAccess("http://supabase.test", "key", page_size=page_size)
+    data_access._http = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(server))
+    data_access._client = AsyncPostgrestClient(BASE_URL, http_client=data_access._http)
+    return data_access
+
+
+def test_viewing_history_pages_do_not_skip_rows_sharing_a_timestamp():
+    # Five rows share one timestamp, so every page boundary falls inside a tie
+    timestamps = ["2026-01-02T00:00:00+00:00"] * 5 + ["2026-01-01T00:00:00+00:00"] * 2
+    rows = [
+        {"id": f"00000000-0000-0000-0000-00000000000{i}", "user_id": "u1", "movie_id": i,
+         "action_type": "view", "created_at": created_at}
+        for i, created_at in enumerate(timestamps)
+    ]
+    server = FakePostgREST({"viewing_history": rows})
+
+    async def scenario():
+        data_access = connect(server, page_size=100)
+        seen, before = [], None
+        while True:
+            page = await data_access.get_viewing_history("u1", limit=2, before=before)
+            if not page:
+                break
+            seen.extend(page)
+            before = (page[-1]["created_at"], page[-1]["id"])
+        await data_access.close()
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert sorted(row["movie_id"] for row in seen) == list(range(7))
+    assert [row["movie_id"] for row in seen] == [4, 3, 2, 1, 0, 6, 5]
+
+
+def test_keyset_pages_cover_every_rating_and_fingerprint_tracks_changes():
+    ratings = [
+        {"id": i, "user_id": "u1", "movie_id": 100 + i, "rating": 4, "updated_at": f"2026-01-0{1 + i % 3}"}
+        for i in range(7)
+    ]
+    server = FakePostgREST({"ratings": ratings})
+
+    async def scenario():
+        data_access = connect(server, page_size=3)
+        fetched = await data_access.get_ratings("u1")
+        assert len(server.requests) == 3  # 7 rows in pages of 3, none truncated
+        fingerprint = await data_access.get_ratings_fingerprint("u1")
+        ratings.append({"id": 7, "user_id": "u1", "movie_id": 200, "rating": 5, "updated_at": "2026-01-01"})
+        changed = await data_access.get_ratings_fingerprint("u1")
+        await data_access.close()
+        return fetched, fingerprint, changed
+
+    fetched, fingerprint, changed = asyncio.run(scenario())
+    assert [row["movie_id"] for row in fetched] == [100 + i for i in range(7)]
+    assert fingerprint == "7:2026-01-03"
+    assert changed == "8:2026-01-03"
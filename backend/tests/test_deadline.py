@@ -0,0 +1,32 @@
+"""Per-request deadlines used by the degradation ladder."""
+import asyncio
+
+import pytest
+
+from services.deadline import Deadline, DeadlineExceeded
+
+
+def test_stage_times_out_against_the_remaining_budget():
+    async def scenario():
+        deadline = Deadline(0.2)
+        with pytest.raises(DeadlineExceeded):
+            await deadline.run(asyncio.sleep(1), reserve=0.1)
+        # The reserve was kept back for later stages
+        assert 0 < deadline.timeout() <= 0.1
+        assert await deadline.run(asyncio.sleep(0, result="fast")) == "fast"
+
+    asyncio.run(scenario())
+
+
+def test_exhausted_budget_fails_without_awaiting():
+    deadline = Deadline(0.0)
+    coro = asyncio.sleep(0)
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(deadline.run(coro))
+    assert coro.cr_frame is None  # closed, so no "never awaited" warning
+
+
+def test_unbounded_deadline_only_applies_stage_limits():
+    deadline = Deadline(None)
+    assert deadline.timeout() is None
+    assert deadline.timeout(reserve=5, limit=1.5) == 1.5
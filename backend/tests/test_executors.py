@@ -0,0 +1,85 @@
+"""Bounded executor queueing, saturation and wait-time metrics."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.executors import BoundedExecutor, ExecutorSaturatedError
+from services.metrics import metrics
+
+
+def test_bounded_executor_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    async def scenario():
+        executor = BoundedExecutor(
+            "test_pool", ThreadPoolExecutor(max_workers=1), max_workers=1, max_queue=1
+        )
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]['executor_rejected_total{executor="test_pool"}'] == 1
+    wait = snapshot["timings"]['executor_wait_seconds{executor="test_pool"}']
+    assert wait["count"] == 2 and wait["max"] > 0
+
+
+def test_timed_out_caller_keeps_the_slot_until_the_job_finishes():
+    release = threading.Event()
+
+    async def scenario():
+        executor = BoundedExecutor(
+            "test_timeout_pool", ThreadPoolExecutor(max_workers=1), max_workers=1, max_queue=0
+        )
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(release.wait), 0.05)
+
+        # The job is still running, so the only slot is still taken
+        assert executor._running == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert executor._running == 0
+        assert await executor.run(lambda: "ok") == "ok"
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_fallback_pool_runs_while_scoring_pool_is_saturated(monkeypatch):
+    from config import settings
+    from services.executors import ExecutorPool
+
+    monkeypatch.setattr(settings, "cpu_thread_workers", 1)
+    monkeypatch.setattr(settings, "executor_max_queue", 0)
+    release = threading.Event()
+
+    async def scenario():
+        pool = ExecutorPool()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.run_cpu(release.wait), 0.05)
+            with pytest.raises(ExecutorSaturatedError):
+                await pool.run_cpu(lambda: "hybrid")
+            # The content-only step does not queue behind the late hybrid job
+            assert await asyncio.wait_for(pool.run_fallback(lambda: "content"), 1) == "content"
+        finally:
+            release.set()
+            pool.shutdown()
+
+    asyncio.run(scenario())
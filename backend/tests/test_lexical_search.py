@@ -0,0 +1,65 @@
+"""BM25 lexical index and reciprocal rank fusion."""
+from services.lexical_search import LexicalIndex, reciprocal_rank_fusion, save_lexical_index
+from services.semantic_search import SemanticSearchService
+
+DOCUMENTS = {
+    1: ("Zodiac", "Zodiac A cartoonist hunts a serial killer in San Francisco. Genres: Crime, Thriller Director: David Fincher"),
+    2: ("Heat", "Heat A detective chases a crew of professional thieves. Genres: Crime Director: Michael Mann Cast: Al Pacino"),
+    3: ("Up", "Up An old man flies his house to South America with balloons. Genres: Animation Director: Pete Docter"),
+    4: ("Se7en", "Se7en Two detectives hunt a serial killer. Genres: Crime Director: David Fincher Cast: Brad Pitt"),
+}
+
+
+def build_index(tmp_path):
+    save_lexical_index(
+        tmp_path / "lexical_index.npz",
+        list(DOCUMENTS),
+        [doc for _, doc in DOCUMENTS.values()],
+        [{"title": title, "genres": "", "year": "2000"} for title, _ in DOCUMENTS.values()],
+        generated_at=1.0,
+    )
+    index = LexicalIndex()
+    index.load(str(tmp_path))
+    return index
+
+
+def test_bm25_ranks_exact_matches(tmp_path):
+    index = build_index(tmp_path)
+    assert [r["movie_id"] for r in index.search("Up")] == [3]
+    ranked = index.search("fincher serial killer")
+    assert {r["movie_id"] for r in ranked} == {1, 4}
+    assert ranked[0]["lexical_score"] == 1.0
+    assert index.search("nonexistent") == []
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4]], k=60)
+    assert [item for item, _ in fused] == [3, 1, 2, 4]
+
+
+class Store:
+    def count(self):
+        return len(DOCUMENTS)
+
+    def query_similar(self, query_embedding, n_results, filters=None):
+        # Vector search "prefers" Heat, then Zodiac
+        return [
+            {"id": str(i), "metadata": {"title": DOCUMENTS[i][0], "year": "2000", "genres": ""}, "distance": d}
+            for i, d in [(2, 0.3), (1, 0.4)]
+        ][:n_results]
+
+
+def test_search_fuses_rankings_and_falls_back_to_lexical(tmp_path):
+    service = SemanticSearchService(Store(), build_index(tmp_path))
+    service.refresh_index_version()
+
+    # No sentence model here: lexical-only results instead of []
+    service.model = None
+    results = service.search("Pete Docter", top_n=5)
+    assert [(r["movie_id"], r["match"], r["distance"]) for r in results] == [(3, "lexical", None)]
+
+    service.model = object()
+    service.encode_query = lambda query: [0.0]
+    results = service.search("zodiac killer", top_n=3)
+    assert results[0]["movie_id"] == 1 and results[0]["match"] == "both"
+    assert {r["movie_id"]: r["match"] for r in results} == {1: "both", 2: "semantic", 4: "lexical"}
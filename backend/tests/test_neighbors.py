@@ -0,0 +1,90 @@
+"""Neighbor table build and lookup."""
+import asyncio
+
+import numpy as np
+import scipy.sparse as sp
+
+from ml.build_neighbors import build_neighbor_tables
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+from services.neighbors import NeighborIndex, save_neighbors
+
+
+def test_tables_skip_self_and_missing_vectors(tmp_path):
+    content = sp.csr_matrix(np.array([
+        [1.0, 0.0, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+    ]))
+    factors = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.1], [0.0, 0.0]])
+    in_trainset = np.array([True, True, True, False])
+
+    tables = build_neighbor_tables(
+        {"tfidf": (content, np.ones(4, dtype=bool)), "svd": (factors, in_trainset)}, k=2
+    )
+
+    assert tables["tfidf"][0][0, 0] == 1
+    assert (tables["tfidf"][0] != np.arange(4)[:, None]).all()
+    assert tables["svd"][0][0, 0] == 2
+    assert (tables["svd"][0][3] == -1).all()  # not in the CF trainset
+    assert 3 not in tables["svd"][0]
+
+    movie_ids = np.array([10, 20, 30, 40])
+    catalog = np.append(movie_ids, -1)
+    save_neighbors(
+        tmp_path / "neighbors.npz",
+        movie_ids,
+        {name: (catalog[ids], scores) for name, (ids, scores) in tables.items()},
+        generated_at=0.0,
+    )
+    index = NeighborIndex()
+    index.load(str(tmp_path))
+
+    assert index.sources() == ["tfidf", "svd", "blended"]
+    assert index.similar(10, source="tfidf", k=1) == [
+        {"movie_id": 20, "score": float(np.float16(tables["tfidf"][1][0, 0]))}
+    ]
+    assert index.similar(40, source="svd") == []
+    assert index.similar(99) is None
+    assert index.similar(10, source="embedding") is None
+
+
+def test_explanations_read_neighbor_metadata_from_the_store(tmp_path):
+    from services.explanations import ExplanationService
+
+    store = NumpyEmbeddingStore(str(tmp_path / "index"))
+    store.upsert_movies(
+        ids=["20", "30"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0]],
+        documents=["", ""],
+        metadatas=[
+            {"title": "Heat", "year": "1995", "genres": "Crime"},
+            {"title": "Ronin", "year": "1998", "genres": "Action"},
+        ],
+    )
+
+    class Neighbors:
+        def similar(self, movie_id, source="blended", k=10):
+            return {10: [{"movie_id": 30, "score": 0.9}, {"movie_id": 20, "score": 0.8}], 11: []}.get(movie_id)
+
+    class NoTMDB:
+        async def get_movie_summary(self, movie_id):
+            raise AssertionError("neighbor metadata should not hit TMDB")
+
+    runner_calls = []
+
+    async def run_cpu(fn, *args):
+        runner_calls.append(fn.__name__)
+        return fn(*args)
+
+    service = ExplanationService(None, Neighbors(), store, run_cpu)
+    service.tmdb_service = NoTMDB()
+
+    assert asyncio.run(service._similar_from_neighbors(10)) == [
+        {"title": "Ronin", "year": "1998", "genres": "Action"},
+        {"title": "Heat", "year": "1995", "genres": "Crime"},
+    ]
+    assert runner_calls == ["get_by_ids"]
+    # No neighbor row (or an empty one) falls back to the embedding query
+    assert asyncio.run(service._similar_from_neighbors(11)) is None
+    assert asyncio.run(service._similar_from_neighbors(99)) is None
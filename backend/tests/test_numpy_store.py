@@ -0,0 +1,92 @@
+"""In-memory numpy embedding index."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ml.embeddings import open_embedding_store
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+from services.recommender import RecommenderService
+
+
+def make_store(tmp_path, n=50, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    store = NumpyEmbeddingStore(str(tmp_path / "index"))
+    store.upsert_movies(
+        ids=[str(100 + i) for i in range(n)],
+        embeddings=vectors.tolist(),
+        documents=[f"doc {i}" for i in range(n)],
+        metadatas=[{"title": f"Movie {i}", "genres": "Drama", "year": str(1990 + i)} for i in range(n)],
+    )
+    return store, vectors
+
+
+def test_query_matches_brute_force_cosine(tmp_path):
+    store, vectors = make_store(tmp_path)
+    query = vectors[7] + 0.1
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    cosine = normalized @ (query / np.linalg.norm(query))
+    expected = np.argsort(-cosine)[:5]
+
+    results = store.query_similar(query.tolist(), n_results=5)
+    assert [r["id"] for r in results] == [str(100 + i) for i in expected]
+    assert np.allclose([r["distance"] for r in results], 1 - cosine[expected], atol=1e-5)
+    assert results[0]["metadata"] == {"title": "Movie 7", "genres": "Drama", "year": "1997"}
+
+    batched = store.query_similar_batch(vectors[[7, 3]] + 0.1, n_results=5)
+    assert [r["id"] for r in batched[0]] == [r["id"] for r in results]
+    assert np.allclose([r["distance"] for r in batched[0]], [r["distance"] for r in results], atol=1e-5)
+    assert batched[1][0]["id"] == "103"
+
+
+def test_saved_index_loads_memory_mapped(tmp_path):
+    store, vectors = make_store(tmp_path)
+    store.save()
+
+    loaded = NumpyEmbeddingStore.load(store.persist_dir)
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.count() == 50
+    assert loaded.query_similar(vectors[4].tolist(), 1)[0]["id"] == "104"
+
+    # Upserts replace by ID without writing into the read-only map
+    loaded.upsert_movies(["104"], [vectors[9].tolist()], ["new"], [{"title": "Replaced"}])
+    assert loaded.count() == 50
+    assert loaded.get_by_ids(["104"])["metadatas"][0]["title"] == "Replaced"
+    assert {r["id"] for r in loaded.query_similar(vectors[9].tolist(), 2)} == {"104", "109"}
+
+
+def test_every_loader_gets_the_configured_store_and_version(tmp_path, monkeypatch):
+    model_dir = str(Path(__file__).resolve().parents[1] / "ml" / "models")
+    services = [RecommenderService(), RecommenderService()]
+    for service in services:
+        service.load_model(model_dir)
+    if not services[0].is_loaded():
+        pytest.skip("model artifacts not available")
+
+    rng = np.random.default_rng(0)
+    store = NumpyEmbeddingStore(str(tmp_path / "index"))
+    catalog_ids = [int(movie_id) for movie_id in services[0].movie_ids[:50]]
+    store.upsert_movies(
+        ids=[str(movie_id) for movie_id in catalog_ids],
+        embeddings=rng.normal(size=(50, 16)).astype(np.float32).tolist(),
+        documents=[""] * 50,
+        metadatas=[{"title": "", "genres": "", "year": ""}] * 50,
+    )
+    store.save()
+    load = NumpyEmbeddingStore.load.__func__
+    monkeypatch.setattr(NumpyEmbeddingStore, "exists", classmethod(lambda cls, persist_dir=None: True))
+    monkeypatch.setattr(
+        NumpyEmbeddingStore,
+        "load",
+        classmethod(lambda cls, persist_dir=None, mmap=True, rerank_factor=4: load(cls, store.persist_dir, mmap, rerank_factor)),
+    )
+
+    # The API (in memory) and the process pool / precompute job (memory-mapped
+    # reload of the same index) must agree, or precomputed lists look stale
+    services[0].load_embeddings_from_store(store, 0.3)
+    opened = open_embedding_store("numpy", rerank_factor=2)
+    assert isinstance(opened, NumpyEmbeddingStore) and opened.rerank_factor == 2
+    services[1].load_embeddings_from_store(opened, 0.3)
+    assert services[0].embedding_model_version == services[1].embedding_model_version
+    assert services[0].model_version == services[1].model_version
@@ -0,0 +1,54 @@
+"""ONNX query encoder."""
+import numpy as np
+import pytest
+
+from services.onnx_encoder import mean_pool
+
+
+def test_mean_pool_ignores_padding():
+    tokens = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+    assert np.allclose(mean_pool(tokens, mask, normalize=False), [[2.0, 0.0]])
+    assert np.allclose(mean_pool(tokens, mask), [[1.0, 0.0]])
+
+
+def test_export_is_discarded_when_parity_drops(tmp_path):
+    from ml.export_onnx_encoder import PARITY_MIN_COSINE, check_parity, parity
+
+    class Reference:
+        def encode(self, queries, convert_to_numpy=True, normalize_embeddings=True):
+            return np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+    class Drifted:
+        def encode(self, queries):
+            return np.array([[1.0, 0.0], [0.5, 0.5]], dtype=np.float32)
+
+    cosines = parity(Reference(), Drifted(), ["a", "b"])
+    assert np.allclose(cosines, [1.0, np.sqrt(0.5)])
+
+    model_path = tmp_path / "model_int8.onnx"
+    model_path.write_bytes(b"onnx")
+    check_parity(np.array([1.0, PARITY_MIN_COSINE]), model_path)
+    assert model_path.exists()
+    with pytest.raises(RuntimeError, match="export discarded"):
+        check_parity(cosines, model_path)
+    assert not model_path.exists()
+
+
+def test_int8_export_matches_pytorch_encoder(tmp_path):
+    pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    from ml.export_onnx_encoder import PARITY_QUERIES, main, parity
+    from services.onnx_encoder import OnnxQueryEncoder
+
+    try:
+        main(tmp_path)
+    except OSError as e:  # model download unavailable
+        pytest.skip(f"all-MiniLM-L6-v2 unavailable: {e}")
+
+    encoder = OnnxQueryEncoder.load(tmp_path)
+    reference = sentence_transformers.SentenceTransformer("all-MiniLM-L6-v2")
+    assert parity(reference, encoder, PARITY_QUERIES).min() > 0.98
+    assert encoder.encode("heist").shape == (384,)
+    assert encoder.encode(["heist", "space opera"], batch_size=1).shape == (2, 384)
@@ -0,0 +1,49 @@
+"""Nightly precompute job output and the freshness rules of the serving store."""
+from pathlib import Path
+
+import pytest
+
+from ml import precompute_recommendations as job
+from services.precomputed import STORE_FILENAME, PrecomputedRecommendations, save_store
+from services.recommender import RecommenderService, diversity_seed_for
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "ml" / "models"
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    service.load_collaborative_model(str(MODEL_DIR))
+    if not service.is_loaded():
+        pytest.skip("model artifacts not available")
+    return service
+
+
+def test_store_serves_fresh_lists_identical_to_online_scoring(recommender, tmp_path):
+    ratings = [
+        {"movie_id": movie_id, "rating": 5 if i % 2 else 3}
+        for i, movie_id in enumerate(recommender.movie_ids[:25])
+    ]
+    user = {"user_id": "ml_308", "fingerprint": "25:2026-01-01T00:00:00+00:00", "ratings": ratings}
+
+    job._init_worker(str(MODEL_DIR))
+    entries = job._score_chunk([user], top_n=50, page_size=10)
+    save_store(tmp_path / STORE_FILENAME, entries, recommender.model_version, generated_at=1.0)
+
+    store = PrecomputedRecommendations()
+    store.load(str(tmp_path))
+    fresh = store.lookup("ml_308", user["fingerprint"], recommender.model_version)
+
+    online, strategy = recommender.hybrid_recommendations(
+        "ml_308", ratings, top_n=50,
+        diversity_seed=diversity_seed_for("ml_308", user["fingerprint"]), page_size=10,
+    )
+    assert fresh["strategy"] == strategy and fresh["total_ratings"] == 25
+    assert [i["movie_id"] for i in fresh["items"]] == [i["movie_id"] for i in online]
+
+    # New rating, different models, or unknown user -> online scoring
+    assert store.lookup("ml_308", "26:2026-01-02T00:00:00+00:00", recommender.model_version) is None
+    assert store.lookup("ml_308", user["fingerprint"], "other-version") is None
+    assert store.lookup("someone-else", user["fingerprint"], recommender.model_version) is None
+    assert store.lookup_stale("ml_308")["items"] == fresh["items"]
@@ -0,0 +1,37 @@
+"""Detail prefetch queue: dedup, bounding and low-priority fetching."""
+import asyncio
+
+from services.prefetch import DetailPrefetcher
+from services.tmdb import details_cache_key, tmdb_cache
+
+
+class StubTMDBService:
+    def __init__(self):
+        self.calls = []
+
+    async def get_movie_details(self, movie_id, force_refresh=False, low_priority=False):
+        self.calls.append((movie_id, low_priority))
+        await tmdb_cache.set(details_cache_key(movie_id), {"id": movie_id}, ttl=600)
+
+
+def test_prefetch_dedups_bounds_and_fills_cache():
+    async def scenario():
+        tmdb_cache.clear()
+        await tmdb_cache.set(details_cache_key(1), {"id": 1}, ttl=600)
+        stub = StubTMDBService()
+        prefetcher = DetailPrefetcher(stub, max_queue_size=2)
+
+        queued = prefetcher.enqueue([1, 2, 2, 3, 4])
+        assert queued == 2  # 1 cached, second 2 pending, 4 over capacity
+        assert prefetcher.stats["deduplicated"] == 2
+        assert prefetcher.stats["dropped"] == 1
+
+        prefetcher.start()
+        await asyncio.wait_for(prefetcher._queue.join(), timeout=1)
+        await prefetcher.stop()
+        return stub.calls
+
+    calls = asyncio.run(scenario())
+    assert calls == [(2, True), (3, True)]
+    assert details_cache_key(3) in tmdb_cache
+    tmdb_cache.clear()
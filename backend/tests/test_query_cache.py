@@ -0,0 +1,43 @@
+"""Semantic search query cache."""
+import asyncio
+
+import numpy as np
+
+from services.query_cache import EmbeddingLRU, SemanticQueryCache, normalize_query
+
+
+def test_near_identical_queries_share_a_key():
+    assert normalize_query("  Dark THRILLER   like Zodiac?! ") == "dark thriller like zodiac"
+    assert normalize_query("dark thriller like zodiac") == "dark thriller like zodiac"
+
+
+def test_embedding_lru_is_bounded_by_bytes():
+    vector = np.zeros(384, dtype=np.float32)  # 1536 bytes + key
+    lru = EmbeddingLRU(max_bytes=3 * (vector.nbytes + 1))
+
+    for key in "abc":
+        lru.set(key, vector)
+    assert lru.get("a") is not None  # a is now most recently used
+    lru.set("d", vector)
+
+    assert lru.get("b") is None
+    assert all(lru.get(key) is not None for key in "acd")
+    stats = lru.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_results_are_keyed_by_top_n_and_index_version():
+    cache = SemanticQueryCache(embedding_max_bytes=1 << 20, result_max_entries=16, result_ttl=60)
+    results = [{"movie_id": 1}, {"movie_id": 2}]
+
+    async def scenario():
+        await cache.set_results("space opera", 10, "260", results)
+        cached = await cache.get_results("space opera", 10, "260")
+        cached.pop()
+        assert await cache.get_results("space opera", 10, "260") == results
+        assert await cache.get_results("space opera", 5, "260") is None
+        assert await cache.get_results("space opera", 10, "261") is None
+
+    asyncio.run(scenario())
+    assert cache.stats()["results"]["hits"] == 2
@@ -0,0 +1,132 @@
+"""Vectorized CF scoring, home-page rows and long ranked lists on the committed models."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from services.recommender import RecommenderService
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "ml" / "models"
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    service.load_collaborative_model(str(MODEL_DIR))
+    if not (service.is_loaded() and service.is_collaborative_loaded()):
+        pytest.skip("model artifacts not available")
+    return service
+
+
+@pytest.mark.parametrize("user_id", ["ml_308", "unknown-user"])
+def test_cf_vector_matches_svd_predict(recommender, user_id):
+    expected = []
+    for movie_id in recommender.movie_ids:
+        pred = recommender.svd_model.predict(user_id, movie_id)
+        expected.append(3.0 if pred.details["was_impossible"] else pred.est)
+
+    np.testing.assert_allclose(recommender.predict_cf_vector(user_id), expected, atol=1e-9)
+
+
+def test_rows_exclude_rated_and_never_repeat_a_movie(recommender):
+    ratings = [
+        {"movie_id": movie_id, "rating": 5 if i % 2 else 3}
+        for i, movie_id in enumerate(recommender.movie_ids[:25])
+    ]
+    masked_rows = [{"id": "genre:28", "kind": "genre", "genre_ids": [28]}]
+
+    rows, strategy = recommender.compute_rows(
+        "ml_308", ratings, masked_rows, per_row=5, num_seeds=2
+    )
+
+    assert strategy == "hybrid_collaborative_heavy"
+    assert [row["kind"] for row in rows] == [
+        "for_you", "because_you_liked", "because_you_liked", "genre"
+    ]
+    movie_ids = [item["movie_id"] for row in rows for item in row["items"]]
+    assert len(movie_ids) == len(set(movie_ids)) == 20
+    assert not set(movie_ids) & {r["movie_id"] for r in ratings}
+    action = recommender.genre_mask([28])
+    assert all(action[recommender.movie_id_to_index[item["movie_id"]]] for item in rows[-1]["items"])
+
+
+def test_long_ranked_list_keeps_first_page(recommender):
+    ratings = [
+        {"movie_id": movie_id, "rating": 5 if i % 2 else 3}
+        for i, movie_id in enumerate(recommender.movie_ids[:25])
+    ]
+
+    page, _ = recommender.hybrid_recommendations("ml_308", ratings, top_n=10, diversity_seed=7)
+    ranked, _ = recommender.hybrid_recommendations(
+        "ml_308", ratings, top_n=500, diversity_seed=7, page_size=10
+    )
+
+    assert ranked[:10] == page
+    movie_ids = [item["movie_id"] for item in ranked]
+    assert len(movie_ids) == len(set(movie_ids)) == len(recommender.movie_ids) - len(ratings)
+    assert [item["score"] for item in ranked[10:]] == sorted(
+        (item["score"] for item in ranked[10:]), reverse=True
+    )
+
+
+def test_embedding_source_joins_hybrid_fusion():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    service.load_collaborative_model(str(MODEL_DIR))
+    if not (service.is_loaded() and service.is_collaborative_loaded()):
+        pytest.skip("model artifacts not available")
+    version = service.model_version
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(len(service.movie_ids), 16)).astype(np.float32)
+    ratings = [
+        {"movie_id": movie_id, "rating": 5 if i % 2 else 2}
+        for i, movie_id in enumerate(service.movie_ids[:25])
+    ]
+
+    # Weight 1.0 ranks purely by embedding similarity
+    service.load_embeddings(list(service.movie_ids), embeddings, weight=1.0)
+    ranked, _ = service.hybrid_recommendations("ml_308", ratings, top_n=30, page_size=1)
+
+    expected = service.get_embedding_scores(ratings)
+    scores = [item["score"] for item in ranked[1:]]  # first item is the exploration pick
+    assert service.model_version != version
+    assert scores == sorted(scores, reverse=True)
+    np.testing.assert_allclose(
+        scores, [expected[service.movie_id_to_index[item["movie_id"]]] for item in ranked[1:]], atol=1e-6
+    )
+    liked = np.mean([expected[service.movie_id_to_index[r["movie_id"]]] for r in ratings if r["rating"] == 5])
+    disliked = np.mean([expected[service.movie_id_to_index[r["movie_id"]]] for r in ratings if r["rating"] == 2])
+    assert liked > disliked
+
+
+def test_embedding_source_reaches_content_only_users():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    if not service.is_loaded():
+        pytest.skip("model artifacts not available")
+    ratings = [{"movie_id": movie_id, "rating": 5} for movie_id in service.movie_ids[:3]]
+    content_only, strategy = service.hybrid_recommendations("new-user", ratings, top_n=20)
+    assert strategy == "content_based"
+    assert content_only == service.get_recommendations(ratings, top_n=20)
+
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(len(service.movie_ids), 16)).astype(np.float32)
+    service.load_embeddings(list(service.movie_ids), embeddings, weight=1.0)
+
+    # No CF model and alpha == 0: the ranking still follows the embedding source
+    ranked, strategy = service.hybrid_recommendations("new-user", ratings, top_n=20)
+    expected = service.get_embedding_scores(ratings)
+    assert strategy == "content_based"
+    assert ranked != content_only
+    np.testing.assert_allclose(
+        [item["score"] for item in ranked],
+        [expected[service.movie_id_to_index[item["movie_id"]]] for item in ranked],
+        atol=1e-6,
+    )
+    assert [item["score"] for item in ranked] == sorted((item["score"] for item in ranked), reverse=True)
+    assert not {item["movie_id"] for item in ranked} & {r["movie_id"] for r in ratings}
+
+    rows, strategy = service.compute_rows("new-user", ratings, [], per_row=5, num_seeds=0)
+    assert strategy == "content_based"
+    assert rows[0]["items"] == ranked[:5]
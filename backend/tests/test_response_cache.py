@@ -0,0 +1,74 @@
+"""Pre-encoded browse responses, ETags and conditional GET."""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from services.response_cache import PreEncodedJSONResponse, ResponseCache, etag_matches, make_etag
+
+
+class Movie(BaseModel):
+    id: int
+    title: str
+
+
+def request_with(if_none_match: str | None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", W/"abc"', True),
+        ('"other" ,"abc" ', True),
+        ("*", True),
+        ('"other"', False),
+        ('"ab"', False),
+    ],
+)
+def test_if_none_match_parsing(header, matches):
+    assert etag_matches(request_with(header), '"abc"') is matches
+
+
+def test_encoding_is_reused_until_the_upstream_payload_changes():
+    cache = ResponseCache(max_entries=8, ttl=60)
+    source = {"id": 1, "title": "Heat", "extra": "dropped by the model"}
+
+    body, etag = cache.encode("movie:1", source, Movie)
+    assert body == b'{"id":1,"title":"Heat"}'
+    assert etag == make_etag(body) and etag.startswith('"')
+    assert cache.encode("movie:1", source, Movie) == (body, etag)
+    assert cache.stats()["hits"] == 1
+
+    # A refreshed upstream entry is a new object: re-encoded, new ETag
+    refreshed = {"id": 1, "title": "Heat (1995)"}
+    new_body, new_etag = cache.encode("movie:1", refreshed, Movie)
+    assert new_body == b'{"id":1,"title":"Heat (1995)"}' and new_etag != etag
+
+
+def test_respond_serves_pre_encoded_bytes_and_304s():
+    cache = ResponseCache(max_entries=8, ttl=60)
+    source = {"id": 7, "title": "Se7en"}
+    app = FastAPI()
+
+    @app.get("/movie")
+    async def movie(request: Request):
+        return cache.respond(request, "movie:7", source, Movie)
+
+    with TestClient(app) as client:
+        first = client.get("/movie")
+        assert first.status_code == 200
+        assert first.headers["content-type"] == PreEncodedJSONResponse.media_type
+        assert first.json() == {"id": 7, "title": "Se7en"}
+        etag = first.headers["ETag"]
+
+        not_modified = client.get("/movie", headers={"If-None-Match": f'"stale", W/{etag}'})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.content == b""
+
+        assert client.get("/movie", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,45 @@
+"""Metadata-filtered semantic search."""
+import numpy as np
+import pytest
+
+from ml.embeddings.filters import MetadataFilterIndex, SearchFilters
+from ml.embeddings.numpy_store import NumpyEmbeddingStore
+
+
+def test_mask_combines_genres_and_year_range():
+    index = MetadataFilterIndex(
+        ["Crime, Drama", "Comedy", "Drama", "Crime"], ["1995", "2001", "", "2010"]
+    )
+    assert index.mask(None) is None
+    assert index.mask(SearchFilters()) is None
+    assert index.mask(SearchFilters(genres=["crime"])).tolist() == [True, False, False, True]
+    assert index.mask(SearchFilters(genres=["Comedy", "Drama"])).tolist() == [True, True, True, False]
+    # Unknown years never satisfy a year constraint
+    assert index.mask(SearchFilters(year_max=2005)).tolist() == [True, True, False, False]
+    assert index.mask(SearchFilters(year_min=2000, genres=["drama", "crime"])).tolist() == [False, False, False, True]
+    assert not index.mask(SearchFilters(genres=["western"])).any()
+
+
+@pytest.mark.parametrize("share", [0.1, 0.6])  # prefilter and postfilter paths
+@pytest.mark.parametrize("compressed", [False, True])
+def test_filtered_top_k_matches_filtered_brute_force(share, compressed):
+    rng = np.random.default_rng(0)
+    n = 300
+    vectors = rng.normal(size=(n, 32)).astype(np.float32)
+    horror = rng.random(n) < share
+    store = NumpyEmbeddingStore()
+    store.upsert_movies(
+        [str(i) for i in range(n)], vectors, [""] * n,
+        [{"title": str(i), "genres": "Horror" if h else "Comedy", "year": "2000"} for i, h in enumerate(horror)],
+    )
+    if compressed:
+        store.compress()
+    store.rerank_factor = 8
+
+    query = rng.normal(size=32).astype(np.float32)
+    top, scores = store.top_k(query, 10, SearchFilters(genres=["horror"]))
+
+    cosine = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    cosine[~horror] = -np.inf
+    assert top[0].tolist() == np.argsort(-cosine)[:10].tolist()
+    assert np.allclose(scores[0], np.sort(cosine)[::-1][:10], atol=1e-5)
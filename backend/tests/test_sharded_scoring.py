@@ -0,0 +1,105 @@
+"""Sharded scoring must rank the catalog the same way as the single-process path."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from services.recommender import RecommenderService
+from services.sharded_scoring import ShardedScorer
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "ml" / "models"
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    service.load_collaborative_model(str(MODEL_DIR))
+    if not (service.is_loaded() and service.is_collaborative_loaded()):
+        pytest.skip("model artifacts not available")
+    return service
+
+
+@pytest.fixture(scope="module")
+def scorer(recommender):
+    scorer = ShardedScorer(n_shards=3, workers=2)
+    scorer.build_from_recommender(recommender)
+    yield scorer
+    scorer.close()
+
+
+def _ratings(recommender, count):
+    return [
+        {"movie_id": movie_id, "rating": 5 if i % 2 else 3}
+        for i, movie_id in enumerate(recommender.movie_ids[:count])
+    ]
+
+
+def test_content_only_matches_get_recommendations(recommender, scorer):
+    ratings = _ratings(recommender, 3)
+
+    ranked, strategy = scorer.hybrid_recommendations(recommender, "ml_308", ratings, top_n=20)
+
+    expected = recommender.get_recommendations(ratings, top_n=20)
+    assert strategy == "content_based"
+    np.testing.assert_allclose(
+        [item["score"] for item in ranked], [item["score"] for item in expected], atol=1e-5
+    )
+
+
+def test_hybrid_top_k_matches_full_catalog_scores(recommender, scorer):
+    ratings = _ratings(recommender, 25)
+    alpha = recommender.calculate_alpha(len(ratings))
+    rated = [recommender.movie_id_to_index[r["movie_id"]] for r in ratings]
+
+    # Exact single-process hybrid scores over the unrated catalog
+    profile = np.asarray(recommender.build_user_profile(ratings)).ravel()
+    content = recommender.tfidf_matrix @ (profile / np.linalg.norm(profile))
+    estimates = recommender.predict_cf_vector("ml_308")
+    unrated = np.ones(len(content), dtype=bool)
+    unrated[rated] = False
+    low, high = estimates[unrated].min(), estimates[unrated].max()
+    hybrid = (1 - alpha) * content + alpha * (estimates - low) / (high - low)
+    hybrid[~unrated] = -np.inf
+
+    user = recommender.svd_model.trainset.to_inner_uid("ml_308")
+    svd = recommender.svd_model
+    cf = {
+        "global_mean": svd.trainset.global_mean,
+        "user_bias": float(svd.bu[user]),
+        "user_factors": svd.pu[user].astype(np.float32),
+        "biased": svd.biased,
+        "low": svd.trainset.rating_scale[0],
+        "high": svd.trainset.rating_scale[1],
+    }
+    ranked = scorer.top_k(profile, 30, np.array(rated), cf=cf, alpha=alpha)
+
+    np.testing.assert_allclose(
+        [score for _, score in ranked], np.sort(hybrid)[::-1][:30], atol=1e-5
+    )
+    assert not {idx for idx, _ in ranked} & set(rated)
+
+
+def test_content_only_path_fuses_embeddings():
+    service = RecommenderService()
+    service.load_model(str(MODEL_DIR))
+    if not service.is_loaded():
+        pytest.skip("model artifacts not available")
+    rng = np.random.default_rng(2)
+    embeddings = rng.normal(size=(len(service.movie_ids), 16)).astype(np.float32)
+    service.load_embeddings(list(service.movie_ids), embeddings, weight=0.4)
+    ratings = _ratings(service, 3)
+
+    scorer = ShardedScorer(n_shards=3, workers=2)
+    try:
+        scorer.build_from_recommender(service)
+        ranked, strategy = scorer.hybrid_recommendations(service, "new-user", ratings, top_n=20)
+    finally:
+        scorer.close()
+
+    expected, _ = service.hybrid_recommendations("new-user", ratings, top_n=20)
+    assert strategy == "content_based"
+    assert expected != service.get_recommendations(ratings, top_n=20)
+    np.testing.assert_allclose(
+        [item["score"] for item in ranked], [item["score"] for item in expected], atol=1e-5
+    )
@@ -0,0 +1,104 @@
+"""Two-tier shared cache against an in-memory Redis-protocol stand-in."""
+import asyncio
+import time
+
+from services.shared_cache import RedisTier, SharedCache
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakeRedis:
+    """Just the commands RedisTier uses: get/set(px)/pttl/delete/publish/pubsub."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+
+    async def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    async def set(self, key, value, px):
+        self.data[key] = (value.encode(), time.monotonic() + px / 1000)
+
+    async def pttl(self, key):
+        if await self.get(key) is None:
+            return -2
+        return int((self.data[key][1] - time.monotonic()) * 1000)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+def test_workers_share_values_and_invalidate_each_other():
+    async def scenario():
+        server = FakeRedis()
+        tier_a, tier_b = RedisTier(server, prefix="test"), RedisTier(server, prefix="test")
+        worker_a = SharedCache("tmdb", remote=tier_a)
+        worker_b = SharedCache("tmdb", remote=tier_b)
+        tier_a.start()
+        tier_b.start()
+        await asyncio.sleep(0)
+
+        await worker_a.set("movie:1", {"id": 1, "title": "Heat"}, ttl=60)
+        assert "test:tmdb:movie:1" in server.data
+
+        # Worker B misses locally, hits the shared tier and keeps a local copy
+        assert await worker_b.get("movie:1") == {"id": 1, "title": "Heat"}
+        assert worker_b.remote_hits == 1 and "movie:1" in worker_b
+        assert 0 < worker_b.ttl_remaining("movie:1") <= 60
+
+        # An overwrite drops worker B's stale local copy
+        await worker_a.set("movie:1", {"id": 1, "title": "Heat (1995)"}, ttl=60)
+        await asyncio.sleep(0.01)
+        assert "movie:1" not in worker_b
+        assert await worker_b.get("movie:1") == {"id": 1, "title": "Heat (1995)"}
+
+        await worker_a.delete("movie:1")
+        await asyncio.sleep(0.01)
+        assert "movie:1" not in worker_b
+        assert await worker_b.get("movie:1") is None
+
+        await tier_a.stop()
+        await tier_b.stop()
+
+    asyncio.run(scenario())
+
+
+def test_shared_tier_errors_degrade_to_local_cache():
+    class BrokenRedis(FakeRedis):
+        async def get(self, key):
+            raise ConnectionError("redis down")
+
+        async def set(self, key, value, px):
+            raise ConnectionError("redis down")
+
+    async def scenario():
+        cache = SharedCache("recommendations", remote=RedisTier(BrokenRedis()))
+        await cache.set("k", [1, 2, 3])
+        assert await cache.get("k") == [1, 2, 3]
+        cache.clear()
+        assert await cache.get("k") is None
+
+    asyncio.run(scenario())